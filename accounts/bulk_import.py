@@ -0,0 +1,174 @@
+"""
+Bulk student account import (e.g. September freshmen intake).
+
+Rows are validated against Faculty / Program codes through dictionaries
+built once, passwords are hashed in a process pool across all cores and
+the accounts are written with bulk_create. Enrollments are rebuilt in one
+set-based pass afterwards (bulk_create skips accounts.signals).
+"""
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from curriculum.enrollment import rebuild_enrollments
+from curriculum.models import Curriculum
+from jobs.pool import init_worker_process
+from organizations.models import Faculty, Program
+from .models import CustomUser
+
+USER_BATCH_SIZE = 1000
+
+# Bu sayının altında process pool açmak hash'lemekten pahalı
+POOL_THRESHOLD = 50
+
+REQUIRED_COLUMNS = ("username", "program", "grade")
+
+
+class StudentImportError(Exception):
+    """
+    The uploaded file cannot be imported at all (bad format, missing columns).
+    """
+
+
+class StudentImportReport:
+    def __init__(self):
+        self.created = 0
+        self.enrollments_added = 0
+        self.errors = []  # (line number, message)
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+
+def read_student_rows(upload):
+    """
+    Yield (line number, {column: value}) for an uploaded CSV file
+    (or any binary file object).
+    """
+    text = io.TextIOWrapper(getattr(upload, "file", upload), encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+
+    reader = csv.DictReader(text, dialect=dialect)
+    header = [name.strip().lower() for name in (reader.fieldnames or [])]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise StudentImportError(f"Missing column(s): {', '.join(missing)}.")
+    reader.fieldnames = header
+
+    for line, row in enumerate(reader, start=2):
+        yield line, {key: (value or "").strip() for key, value in row.items() if key}
+
+
+def _hash_password(raw_password):
+    return make_password(raw_password or None)
+
+
+def hash_passwords(raw_passwords, workers=None):
+    """
+    make_password for every item, spread over a process pool.
+    Empty passwords become unusable passwords.
+    """
+    raw_passwords = list(raw_passwords)
+    if len(raw_passwords) < POOL_THRESHOLD or workers == 1:
+        return [_hash_password(raw) for raw in raw_passwords]
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(raw_passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_process) as pool:
+        return list(pool.map(_hash_password, raw_passwords, chunksize=chunksize))
+
+
+def import_students(rows, workers=None):
+    """
+    rows: iterable of (line number, {column: value}) as yielded by read_student_rows.
+
+    Columns: username, program (code), grade, and optionally faculty (code),
+    email, first_name, last_name, phone, password. Invalid rows are reported
+    and skipped; valid ones are created in one transaction.
+    """
+    report = StudentImportReport()
+
+    faculty_ids = dict(Faculty.objects.values_list("code", "id"))
+    programs = {
+        code: (program_id, faculty_id)
+        for code, program_id, faculty_id in Program.objects.values_list("code", "id", "faculty_id")
+    }
+    valid_grades = set(Curriculum.Year.values)
+
+    rows = list(rows)
+    usernames = [row.get("username", "") for _line, row in rows]
+    taken = set(
+        CustomUser.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+
+    users, passwords = [], []
+    for line, row in rows:
+        username = row.get("username", "")
+        if not username:
+            report.error(line, "Username is required.")
+            continue
+        if username in taken:
+            report.error(line, f"Username '{username}' already exists.")
+            continue
+
+        program = programs.get(row.get("program", ""))
+        if program is None:
+            report.error(line, f"Unknown program code '{row.get('program', '')}'.")
+            continue
+        program_id, faculty_id = program
+
+        faculty_code = row.get("faculty", "")
+        if faculty_code:
+            if faculty_code not in faculty_ids:
+                report.error(line, f"Unknown faculty code '{faculty_code}'.")
+                continue
+            if faculty_ids[faculty_code] != faculty_id:
+                report.error(line, f"Program '{row['program']}' does not belong to faculty '{faculty_code}'.")
+                continue
+
+        try:
+            grade = int(row.get("grade", ""))
+        except ValueError:
+            grade = None
+        if grade not in valid_grades:
+            report.error(line, f"Grade must be one of {sorted(valid_grades)}.")
+            continue
+
+        taken.add(username)
+        users.append(
+            CustomUser(
+                username=username,
+                email=CustomUser.objects.normalize_email(row.get("email", "")),
+                first_name=row.get("first_name", ""),
+                last_name=row.get("last_name", ""),
+                phone=row.get("phone") or None,
+                role=CustomUser.Role.STUDENT,
+                student_faculty_id=faculty_id,
+                student_program_id=program_id,
+                student_grade=grade,
+            )
+        )
+        passwords.append(row.get("password", ""))
+
+    if not users:
+        return report
+
+    for user, hashed in zip(users, hash_passwords(passwords, workers=workers)):
+        user.password = hashed
+
+    with transaction.atomic():
+        CustomUser.objects.bulk_create(users, batch_size=USER_BATCH_SIZE)
+        _removed, added = rebuild_enrollments({user.student_program_id for user in users})
+
+    report.created = len(users)
+    report.enrollments_added = added
+    return report
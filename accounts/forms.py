@@ -41,6 +41,10 @@ class UserCreateForm(forms.ModelForm):
         self.fields["faculty_member_faculty"].required = False
         self.fields["lecturer_programs"].required = False
         self.fields["lecturer_curricula"].required = False
+        # Curriculum.__str__ program kodunu da yazıyor
+        self.fields["lecturer_curricula"].queryset = (
+            self.fields["lecturer_curricula"].queryset.select_related("program")
+        )
 
     def clean(self):
         cleaned = super().clean()
@@ -87,3 +91,13 @@ class UserCreateForm(forms.ModelForm):
             # M2M'ler
             self.save_m2m()
         return user
+
+
+class UserImportForm(forms.Form):
+    file = forms.FileField(
+        label="Student CSV",
+        help_text=(
+            "Header row: username, program, grade and optionally faculty, email, "
+            "first_name, last_name, phone, password."
+        ),
+    )
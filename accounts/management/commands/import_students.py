@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.bulk_import import StudentImportError, import_students, read_student_rows
+
+
+class Command(BaseCommand):
+    help = "Create student accounts in bulk from a CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header row.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Password hashing processes (default: all cores).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as handle:
+                report = import_students(read_student_rows(handle), workers=options["workers"])
+        except (OSError, StudentImportError) as exc:
+            raise CommandError(str(exc))
+
+        for line, message in report.errors:
+            self.stderr.write(f"line {line}: {message}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.created} students created, "
+                f"{report.enrollments_added} enrollments added, "
+                f"{len(report.errors)} rows rejected."
+            )
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from organizations.models import Program
+from accounts.promotion import FINAL_GRADE, promote_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Year-end promotion: bump student_grade of every student of the given "
+        "programs / faculties and rebuild their curriculum enrollments."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--program",
+            action="append",
+            default=[],
+            metavar="CODE",
+            help="Program code to promote (can be repeated).",
+        )
+        parser.add_argument(
+            "--faculty",
+            action="append",
+            default=[],
+            metavar="CODE",
+            help="Faculty code; promotes all of its programs (can be repeated).",
+        )
+        parser.add_argument(
+            "--final-grade",
+            type=int,
+            default=FINAL_GRADE,
+            help=f"Students in this grade are not promoted (default: {FINAL_GRADE}).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run the promotion and roll it back, only reporting the counts.",
+        )
+
+    def handle(self, *args, **options):
+        program_codes = options["program"]
+        faculty_codes = options["faculty"]
+        if not program_codes and not faculty_codes:
+            raise CommandError("Give at least one --program or --faculty code.")
+
+        programs = Program.objects.filter(
+            Q(code__in=program_codes) | Q(faculty__code__in=faculty_codes)
+        )
+        found = set(programs.values_list("code", flat=True))
+        missing = set(program_codes) - found
+        if missing:
+            raise CommandError(f"Unknown program code(s): {', '.join(sorted(missing))}")
+        if not found:
+            raise CommandError("No programs matched.")
+
+        result = promote_students(
+            programs.values_list("id", flat=True),
+            final_grade=options["final_grade"],
+            dry_run=options["dry_run"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{', '.join(sorted(found))}: {result}"))
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models import DEFERRED
 
 
 class CustomUserManager(BaseUserManager):
@@ -98,9 +99,43 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Student Affairs kullanıcı listesi: filtre + username keyset sayfalama
+            models.Index(fields=["role", "username"], name="user_role_username_idx"),
+            models.Index(fields=["student_program", "username"], name="user_program_username_idx"),
+            models.Index(fields=["student_faculty", "username"], name="user_sfaculty_username_idx"),
+            models.Index(fields=["faculty_member_faculty", "username"], name="user_fmfaculty_username_idx"),
+            # Curriculum enrollment: role + program + grade ile öğrenci arama
+            models.Index(fields=["student_program", "student_grade", "role"], name="user_enrollment_idx"),
+        ]
+
+    # Curriculum enrollment bu alanlara bağlı (bkz. accounts.signals)
+    ENROLLMENT_FIELDS = ("role", "student_program_id", "student_grade")
+
     def __str__(self):
         return f"{self.username} ({self.role})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_enrollment_key = instance._enrollment_key()
+        return instance
+
+    def _enrollment_key(self):
+        # __dict__: deferred alanlar için ekstra query atılmasın
+        return tuple(self.__dict__.get(field, DEFERRED) for field in self.ENROLLMENT_FIELDS)
+
+    def enrollment_changed(self):
+        """
+        True for new users and when role, student_program or student_grade
+        differ from the values loaded from the database.
+        """
+        return getattr(self, "_loaded_enrollment_key", None) != self._enrollment_key()
+
+    def mark_enrollment_synced(self):
+        self._loaded_enrollment_key = self._enrollment_key()
+
     @property
     def is_admin(self):
         return self.role == self.Role.ADMIN and self.is_superuser
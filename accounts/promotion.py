@@ -0,0 +1,59 @@
+"""
+Year-end promotion: bump student_grade of every student of some programs
+with a single UPDATE and rebuild their curriculum enrollments in bulk.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from curriculum.enrollment import rebuild_enrollments
+from curriculum.models import Curriculum
+from .models import CustomUser
+
+FINAL_GRADE = max(Curriculum.Year.values)
+
+
+class PromotionResult:
+    def __init__(self, promoted, final_year, enrollments_removed, enrollments_added, dry_run):
+        self.promoted = promoted
+        self.final_year = final_year
+        self.enrollments_removed = enrollments_removed
+        self.enrollments_added = enrollments_added
+        self.dry_run = dry_run
+
+    def __str__(self):
+        prefix = "[dry-run] " if self.dry_run else ""
+        return (
+            f"{prefix}{self.promoted} students promoted, "
+            f"{self.final_year} already in the final year left as is, "
+            f"enrollments: -{self.enrollments_removed} / +{self.enrollments_added}"
+        )
+
+
+def promote_students(program_ids, final_grade=FINAL_GRADE, dry_run=False):
+    """
+    Promote the students of `program_ids` by one grade (students already in
+    `final_grade` are not touched) and rebuild Curriculum.students.
+
+    queryset.update() bypasses post_save, so accounts.signals does not run
+    once per student. Everything happens in one transaction: any error rolls
+    the whole promotion back, and dry_run rolls it back on purpose after
+    counting what would change.
+    """
+    program_ids = list(program_ids)
+
+    with transaction.atomic():
+        students = CustomUser.objects.filter(
+            role=CustomUser.Role.STUDENT,
+            student_program_id__in=program_ids,
+            student_grade__isnull=False,
+        )
+        final_year = students.filter(student_grade__gte=final_grade).count()
+        promoted = students.filter(student_grade__lt=final_grade).update(
+            student_grade=F("student_grade") + 1,
+        )
+        removed, added = rebuild_enrollments(program_ids)
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    return PromotionResult(promoted, final_year, removed, added, dry_run)
@@ -4,11 +4,17 @@ from django.dispatch import receiver
 from .models import CustomUser
 
 
+ENROLLMENT_UPDATE_FIELDS = {"role", "student_program", "student_program_id", "student_grade"}
+
+
 @receiver(post_save, sender=CustomUser)
-def sync_student_curricula(sender, instance: CustomUser, **kwargs):
+def sync_student_curricula(sender, instance: CustomUser, created=False, update_fields=None, **kwargs):
     """
     When a student user is created or updated, keep their curriculum enrollments
     in sync based on program + grade. Non-students are cleared out.
+
+    Saves that do not touch role / student_program / student_grade (e.g. the
+    last_login update on every login) are skipped.
     """
     user = instance
 
@@ -16,6 +22,14 @@ def sync_student_curricula(sender, instance: CustomUser, **kwargs):
     if not hasattr(user, "enrolled_curricula"):
         return
 
+    if update_fields is not None and not ENROLLMENT_UPDATE_FIELDS.intersection(update_fields):
+        return
+
+    if not created and not user.enrollment_changed():
+        return
+
+    user.mark_enrollment_synced()
+
     # Only students are auto-enrolled.
     if user.role != CustomUser.Role.STUDENT:
         user.enrolled_curricula.clear()
@@ -1,3 +1,149 @@
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from .models import CustomUser
+from .views import _keyset_page
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+class EnrollmentIndexTests(TestCase):
+    def test_student_lookup_uses_enrollment_index(self):
+        # Curriculum.sync_enrollments / accounts.signals sorgusu
+        plan = (
+            CustomUser.objects.filter(
+                role=CustomUser.Role.STUDENT,
+                student_program_id=1,
+                student_grade=2,
+            )
+            .values_list("id", flat=True)
+            .explain()
+        )
+        self.assertIn("user_enrollment_idx", plan)
+
+
+class StudentCurriculaSignalTests(TestCase):
+    """
+    sync_student_curricula skips saves that do not touch role, program or grade.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        cls.program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        cls.other_program = Program.objects.create(name="Software Engineering", code="SE", faculty=faculty)
+        cls.curricula = {
+            (program.code, year): Curriculum.objects.create(
+                program=program, code=f"{program.code}{year}01", name="Course", year=year
+            )
+            for program in (cls.program, cls.other_program)
+            for year in (1, 2)
+        }
+        cls.student = CustomUser.objects.create_user(
+            "s1",
+            password=None,
+            role=CustomUser.Role.STUDENT,
+            student_faculty=faculty,
+            student_program=cls.program,
+            student_grade=1,
+        )
+
+    def save_queries(self, user, **kwargs):
+        table = CustomUser.enrolled_curricula.through._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            user.save(**kwargs)
+        return [query["sql"] for query in queries if table in query["sql"]]
+
+    def enrolled(self):
+        return set(self.student.enrolled_curricula.values_list("code", flat=True))
+
+    def test_last_login_update_runs_no_enrollment_queries(self):
+        user = CustomUser.objects.get(pk=self.student.pk)
+        user.last_login = timezone.now()
+        self.assertEqual(self.save_queries(user, update_fields=["last_login"]), [])
+
+    def test_full_save_without_enrollment_changes_runs_no_enrollment_queries(self):
+        user = CustomUser.objects.get(pk=self.student.pk)
+        user.first_name = "Ada"
+        self.assertEqual(self.save_queries(user), [])
+
+    def test_grade_change_resyncs(self):
+        self.assertEqual(self.enrolled(), {"CE101"})
+        user = CustomUser.objects.get(pk=self.student.pk)
+        user.student_grade = 2
+        self.assertNotEqual(self.save_queries(user, update_fields=["student_grade"]), [])
+        self.assertEqual(self.enrolled(), {"CE201"})
+
+    def test_program_change_resyncs(self):
+        user = CustomUser.objects.get(pk=self.student.pk)
+        user.student_program = self.other_program
+        self.assertNotEqual(self.save_queries(user), [])
+        self.assertEqual(self.enrolled(), {"SE101"})
+
+    def test_role_change_clears_enrollments(self):
+        user = CustomUser.objects.get(pk=self.student.pk)
+        user.role = CustomUser.Role.LECTURER
+        self.assertNotEqual(self.save_queries(user), [])
+        self.assertEqual(self.enrolled(), set())
+
+
+class KeysetPageTests(TestCase):
+    """
+    Pages of 3 over 8 users. Usernames are unique, so the nearest thing to
+    tied sort keys is usernames differing only in case ("ali" / "Ali").
+    """
+
+    USERNAMES = ["Ali", "ali", "b1", "b2", "b3", "c", "d", "e"]
+
+    @classmethod
+    def setUpTestData(cls):
+        for username in cls.USERNAMES:
+            CustomUser.objects.create_user(username, password=None, role=CustomUser.Role.LECTURER)
+        cls.ordered = list(
+            CustomUser.objects.filter(username__in=cls.USERNAMES).order_by("username").values_list("username", flat=True)
+        )
+
+    def page(self, after="", before=""):
+        page, prev_cursor, next_cursor = _keyset_page(
+            CustomUser.objects.filter(username__in=self.USERNAMES), after=after, before=before, size=3
+        )
+        return [user.username for user in page], prev_cursor, next_cursor
+
+    def test_first_page(self):
+        self.assertEqual(self.page(), (self.ordered[:3], None, self.ordered[2]))
+
+    def test_after_walks_every_row_once(self):
+        seen, cursor = [], ""
+        while True:
+            usernames, _prev, cursor = self.page(after=cursor)
+            seen.extend(usernames)
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.ordered)
+
+    def test_last_page_has_no_next_cursor(self):
+        usernames, prev_cursor, next_cursor = self.page(after=self.ordered[5])
+        self.assertEqual((usernames, prev_cursor, next_cursor), (self.ordered[6:], self.ordered[6], None))
+
+    def test_before_walks_back_to_the_first_page(self):
+        seen, cursor = [], self.ordered[-1]
+        seen.insert(0, cursor)
+        while cursor is not None:
+            usernames, cursor, _next = self.page(before=cursor)
+            seen[:0] = usernames
+        self.assertEqual(seen, self.ordered)
+
+    def test_before_the_second_page_returns_the_first(self):
+        usernames, prev_cursor, next_cursor = self.page(before=self.ordered[3])
+        self.assertEqual((usernames, prev_cursor, next_cursor), (self.ordered[:3], None, self.ordered[2]))
 
-# Create your tests here.
+    def test_case_variants_are_separate_rows(self):
+        first, _prev, cursor = self.page()
+        second, _prev, _next = self.page(after=cursor)
+        self.assertEqual(sorted(set(first) & {"Ali", "ali"}), ["Ali", "ali"])
+        self.assertFalse(set(first) & set(second))
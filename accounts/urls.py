@@ -20,6 +20,11 @@ urlpatterns = [
         views.user_create,
         name="user_create",
     ),
+    path(
+        "users/import/",
+        views.user_import,
+        name="user_import",
+    ),
     path(
         "users/<int:pk>/edit/",
         views.user_edit,
@@ -46,3 +51,16 @@ urlpatterns = [
         name="student_course_detail",
     ),
 ]
+
+# Bir request'in en fazla kaç sorgu çalıştırabileceği (config.query_budget)
+QUERY_BUDGETS = {
+    "login": 2,
+    "logout": 4,
+    "user_create": 12,
+    "user_import": 4,
+    "user_edit": 12,
+    "user_delete": 5,
+    "role_redirect": 4,
+    "student_dashboard": 6,
+    "student_course_detail": 12,
+}
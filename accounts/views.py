@@ -1,12 +1,77 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.db.models import Q
 from accounts.decorators import role_required
 from .models import CustomUser
 from curriculum.models import Curriculum
-from .forms import UserCreateForm
+from organizations.models import Faculty, Program
+from .forms import UserCreateForm, UserImportForm
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
 from django.core.exceptions import PermissionDenied
-from assessments.models import Assessment, StudentAssessmentResult, AssessmentLearningOutcome
+from assessments.models import StudentAssessmentResult
+from jobs.registry import enqueue
+from assessments.tree import assessment_tree
+
+USER_PAGE_SIZE = 50
+
+
+def _filtered_users(params):
+    """
+    Role / program / faculty filters of the user list.
+    Returns (queryset, {filter: value}) so the template can keep them in links.
+    """
+    users = CustomUser.objects.select_related(
+        "student_faculty",
+        "student_program",
+        "faculty_member_faculty",
+    )
+    filters = {}
+
+    role = params.get("role", "")
+    if role in CustomUser.Role.values:
+        users = users.filter(role=role)
+        filters["role"] = role
+
+    program = params.get("program", "")
+    if program.isdigit():
+        users = users.filter(student_program_id=program)
+        filters["program"] = program
+
+    faculty = params.get("faculty", "")
+    if faculty.isdigit():
+        users = users.filter(
+            Q(student_faculty_id=faculty) | Q(faculty_member_faculty_id=faculty)
+        )
+        filters["faculty"] = faculty
+
+    return users, filters
+
+
+def _keyset_page(users, after="", before="", size=USER_PAGE_SIZE):
+    """
+    Keyset (seek) pagination on username: every page is
+    WHERE username > cursor ORDER BY username LIMIT size + 1,
+    so its cost does not depend on how deep the page is.
+    Returns (page, prev_cursor, next_cursor).
+    """
+    if before:
+        page = list(users.filter(username__lt=before).order_by("-username")[: size + 1])
+        has_more = len(page) > size
+        page = page[:size][::-1]
+        prev_cursor = page[0].username if has_more and page else None
+        next_cursor = page[-1].username if page else None
+        return page, prev_cursor, next_cursor
+
+    qs = users.order_by("username")
+    if after:
+        qs = qs.filter(username__gt=after)
+    page = list(qs[: size + 1])
+    has_more = len(page) > size
+    page = page[:size]
+    prev_cursor = page[0].username if after and page else None
+    next_cursor = page[-1].username if has_more else None
+    return page, prev_cursor, next_cursor
+
 
 @role_required(CustomUser.Role.STUDENT_AFFAIRS)
 def user_create(request):
@@ -25,23 +90,52 @@ def user_create(request):
     else:
         form = UserCreateForm()
 
-    users = (
-        CustomUser.objects
-        .order_by("username")
-        .select_related(
-            "student_faculty",
-            "student_program",
-            "faculty_member_faculty",
-        )
+    users, filters = _filtered_users(request.GET)
+    page, prev_cursor, next_cursor = _keyset_page(
+        users,
+        after=request.GET.get("after", ""),
+        before=request.GET.get("before", ""),
     )
 
     context = {
         "form": form,
-        "users": users,
+        "users": page,
+        "filters": filters,
+        "prev_cursor": prev_cursor,
+        "next_cursor": next_cursor,
+        "roles": CustomUser.Role.choices,
+        "programs": Program.objects.order_by("code").only("id", "code"),
+        "faculties": Faculty.objects.order_by("code").only("id", "code"),
     }
     return render(request, "accounts/user_create.html", context)
 
 
+@role_required(CustomUser.Role.STUDENT_AFFAIRS)
+def user_import(request):
+    """
+    Student Affairs: CSV ile toplu öğrenci hesabı oluşturma
+    (her Eylül gelen yeni öğrenciler için).
+    Import arka planda (jobs) çalışır; kullanıcı ilerleme sayfasına yönlenir.
+    """
+    if request.method == "POST":
+        form = UserImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                csv_text = form.cleaned_data["file"].read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                form.add_error("file", "The file must be a UTF-8 encoded CSV.")
+            else:
+                job = enqueue("accounts.import_students", {"csv_text": csv_text}, user=request.user)
+                return redirect("jobs:job_detail", pk=job.pk)
+    else:
+        form = UserImportForm()
+
+    context = {
+        "form": form,
+    }
+    return render(request, "accounts/user_import.html", context)
+
+
 @role_required(CustomUser.Role.STUDENT_AFFAIRS)
 def user_edit(request, pk):
     """
@@ -129,6 +223,7 @@ def student_dashboard(request):
                 program=student_program,        
                 year=student_grade,             
             )
+            .with_student_standing(user)
             .order_by("semester", "code")
         )
 
@@ -161,75 +256,32 @@ def student_course_detail(request, curriculum_id):
         year=student_grade,
     )
 
-    # İlgili dersin tüm assessment'ları
-    assessments = (
-        Assessment.objects.filter(curriculum=curriculum)
-        .prefetch_related(
-            "lo_mappings__learning_outcome__lo_po_mappings__program_outcome",
-            "results",
-        )
-        .order_by("date", "name")
-    )
+    # Assessment → LO → PO ağacı tüm öğrenciler için ortak (cache'li)
+    tree = assessment_tree(curriculum)
 
-    # Bu öğrenciye ait notlar
-    results_by_assessment = {
-        r.assessment_id: r
-        for r in StudentAssessmentResult.objects.filter(
-            assessment__curriculum=curriculum,
+    # Bu öğrenciye ait notlar: tek indexli sorgu
+    scores = dict(
+        StudentAssessmentResult.objects.filter(
             student=user,
-        )
-    }
+            assessment_id__in=[node["assessment"]["id"] for node in tree],
+        ).values_list("assessment_id", "raw_score")
+    )
 
     rows = []
-    for a in assessments:
-        result = results_by_assessment.get(a.id)
+    for node in tree:
+        a = node["assessment"]
+        score_value = scores.get(a["id"])
 
         # yaklaşık katkı hesabı (score / max_score * weight_in_course)
         contribution = None
-        if (
-            result is not None
-            and result.raw_score is not None
-            and a.max_score
-        ):
-            try:
-                contribution = (result.raw_score / a.max_score) * a.weight_in_course
-            except ZeroDivisionError:
-                contribution = None
-
-        # Assessment → LO → PO yapısı
-        lo_rows = []
-        for mapping in a.lo_mappings.all():
-            lo = mapping.learning_outcome
-
-            po_rows = []
-            for lo_po in lo.lo_po_mappings.all():
-                po_rows.append(
-                    {
-                        "po": lo_po.program_outcome,
-                        "weight": lo_po.weight,
-                    }
-                )
-
-            lo_rows.append(
-                {
-                    "lo": lo,
-                    "weight_in_assessment": mapping.weight_in_assessment,
-                    "po_rows": po_rows,
-                }
-            )
-
-        score_value = None
-        if result is not None:
-            score_value = getattr(result, "raw_score", None)
-            if score_value is None:
-                score_value = getattr(result, "score", None)
+        if score_value is not None and a["max_score"]:
+            contribution = (score_value / a["max_score"]) * a["weight_in_course"]
 
         rows.append(
             {
                 "assessment": a,
-                "result": result,
                 "contribution": contribution,
-                "lo_rows": lo_rows,
+                "lo_rows": node["lo_rows"],
                 "score_value": score_value,
             }
         )
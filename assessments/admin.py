@@ -1,20 +1,45 @@
 from django.contrib import admin
-from .models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from .models import (
+    Assessment,
+    AssessmentLearningOutcome,
+    StudentAssessmentResult,
+    StudentLOAttainment,
+    StudentPOAttainment,
+)
 
 
 @admin.register(Assessment)
 class AssessmentAdmin(admin.ModelAdmin):
     list_display = ("curriculum", "type", "weight_in_course", "max_score")
     list_filter = ("type", "curriculum__program")
+    list_select_related = ("curriculum__program",)
 
 
 @admin.register(AssessmentLearningOutcome)
 class AssessmentLearningOutcomeAdmin(admin.ModelAdmin):
     list_display = ("assessment", "learning_outcome", "weight_in_assessment")
+    list_select_related = ("assessment__curriculum", "learning_outcome__curriculum")
 
 
 @admin.register(StudentAssessmentResult)
 class StudentAssessmentResultAdmin(admin.ModelAdmin):
     list_display = ("assessment", "student", "raw_score", "created_at")
     list_filter = ("assessment__curriculum",)
+    list_select_related = ("assessment__curriculum", "student")
     search_fields = ("student__username", "student__first_name", "student__last_name")
+
+
+@admin.register(StudentLOAttainment)
+class StudentLOAttainmentAdmin(admin.ModelAdmin):
+    list_display = ("student", "learning_outcome", "attainment", "updated_at")
+    list_filter = ("learning_outcome__curriculum",)
+    list_select_related = ("student", "learning_outcome__curriculum")
+    search_fields = ("student__username",)
+
+
+@admin.register(StudentPOAttainment)
+class StudentPOAttainmentAdmin(admin.ModelAdmin):
+    list_display = ("student", "program_outcome", "attainment", "updated_at")
+    list_filter = ("program_outcome__program",)
+    list_select_related = ("student", "program_outcome__program")
+    search_fields = ("student__username",)
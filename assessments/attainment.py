@@ -0,0 +1,449 @@
+"""
+Learning outcome attainment engine.
+
+Every score of a curriculum is loaded with a single query and turned into a
+students × assessments matrix (normalized by max_score). Multiplying it with
+the assessments × LO weight matrix gives each student's LO attainment in
+percent, without per-student Python loops or Decimal arithmetic.
+
+Program outcomes are rolled up from LO attainment through the sparse LO × PO
+weights (LearningOutcomeProgramOutcome.weight) of the program.
+
+The results are also materialized into StudentLOAttainment /
+StudentPOAttainment; assessments.signals refreshes only the affected rows.
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+
+from curriculum.models import Curriculum
+from outcomes.models import (
+    LearningOutcome,
+    LearningOutcomeProgramOutcome,
+    ProgramOutcome,
+)
+from .models import (
+    Assessment,
+    AssessmentLearningOutcome,
+    StudentAssessmentResult,
+    StudentLOAttainment,
+    StudentPOAttainment,
+)
+from .singleflight import bump_generation
+
+BULK_BATCH_SIZE = 1000
+
+
+def _index_of(ids, values):
+    """
+    Position of every value inside the sorted `ids` array.
+    """
+    return np.searchsorted(ids, values)
+
+
+def _contained_in(ids, values):
+    """
+    Boolean mask of the `values` present in the sorted `ids` array.
+    """
+    if not len(ids):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(ids, values), len(ids) - 1)
+    return ids[positions] == values
+
+
+def build_score_matrix(result_rows, assessment_ids, max_scores):
+    """
+    result_rows: iterable of (student_id, assessment_id, raw_score).
+
+    Returns (student_ids, scores, graded):
+    - scores: students × assessments, raw_score / max_score (0 where not graded)
+    - graded: same shape, 1.0 where a raw_score exists
+    """
+    rows = np.array(
+        [
+            (student_id, assessment_id, raw_score)
+            for student_id, assessment_id, raw_score in result_rows
+            if raw_score is not None
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+
+    student_ids, student_idx = np.unique(rows[:, 0].astype(np.int64), return_inverse=True)
+    assessment_idx = _index_of(assessment_ids, rows[:, 1].astype(np.int64))
+
+    shape = (len(student_ids), len(assessment_ids))
+    scores = np.zeros(shape, dtype=np.float64)
+    graded = np.zeros(shape, dtype=np.float64)
+
+    # max_score=0 olan assessment'lar hesaba katılmaz
+    max_scores = np.asarray(max_scores, dtype=np.float64)
+    valid = max_scores[assessment_idx] > 0
+
+    scores[student_idx[valid], assessment_idx[valid]] = (
+        rows[valid, 2] / max_scores[assessment_idx[valid]]
+    )
+    graded[student_idx[valid], assessment_idx[valid]] = 1.0
+    return student_ids, scores, graded
+
+
+def build_weight_matrix(mapping_rows, assessment_ids, lo_ids, course_weights):
+    """
+    mapping_rows: iterable of (assessment_id, learning_outcome_id, weight_in_assessment).
+
+    Returns an assessments × LOs matrix. Each cell is the share of the course
+    grade that assessment spends on that LO (weight_in_course × weight_in_assessment),
+    so a 40% midterm counts more towards an LO than a 5% quiz.
+    """
+    rows = np.array(list(mapping_rows), dtype=np.float64).reshape(-1, 3)
+    weights = np.zeros((len(assessment_ids), len(lo_ids)), dtype=np.float64)
+
+    # Başka bir dersin LO'suna bağlanmış mapping'ler yanlış hücreye yazılmasın
+    rows = rows[
+        _contained_in(assessment_ids, rows[:, 0].astype(np.int64))
+        & _contained_in(lo_ids, rows[:, 1].astype(np.int64))
+    ]
+    assessment_idx = _index_of(assessment_ids, rows[:, 0].astype(np.int64))
+    lo_idx = _index_of(lo_ids, rows[:, 1].astype(np.int64))
+    course_weights = np.asarray(course_weights, dtype=np.float64)
+
+    weights[assessment_idx, lo_idx] = rows[:, 2] * course_weights[assessment_idx]
+    return weights
+
+
+def weighted_attainment(values, present, weights):
+    """
+    (values @ weights) / (present @ weights), in percent.
+
+    Only the inputs a student actually has (present == 1) count in the
+    denominator, so an ungraded assessment does not pull the LO down.
+    Cells without any contributing input are NaN.
+    """
+    numerator = values @ weights
+    denominator = present @ weights
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(denominator > 0, numerator / denominator * 100, np.nan)
+    return result
+
+
+class AttainmentMatrix:
+    """
+    Students × outcomes attainment matrix (percent, NaN = no data).
+    """
+
+    def __init__(self, student_ids, outcome_ids, matrix):
+        self.student_ids = student_ids
+        self.outcome_ids = outcome_ids
+        self.matrix = matrix
+
+    def for_student(self, student_id):
+        """
+        {outcome_id: percent or None} for a single student.
+        """
+        pos = _index_of(self.student_ids, student_id)
+        if pos >= len(self.student_ids) or self.student_ids[pos] != student_id:
+            return {outcome_id: None for outcome_id in self.outcome_ids.tolist()}
+
+        return {
+            outcome_id: (None if np.isnan(value) else float(value))
+            for outcome_id, value in zip(self.outcome_ids.tolist(), self.matrix[pos])
+        }
+
+    def averages(self):
+        """
+        {outcome_id: average percent over graded students or None}.
+        """
+        present = ~np.isnan(self.matrix)
+        sums = np.where(present, self.matrix, 0).sum(axis=0)
+        counts = present.sum(axis=0)
+        return {
+            outcome_id: (float(total / count) if count else None)
+            for outcome_id, total, count in zip(self.outcome_ids.tolist(), sums, counts)
+        }
+
+
+class CurriculumAttainment(AttainmentMatrix):
+    """
+    Students × LOs attainment of one curriculum.
+    """
+
+    def __init__(self, curriculum, student_ids, learning_outcome_ids, matrix):
+        super().__init__(student_ids, learning_outcome_ids, matrix)
+        self.curriculum = curriculum
+        self.learning_outcome_ids = learning_outcome_ids
+
+
+def _lo_attainment(assessments_qs, learning_outcomes_qs, mappings_qs, results_qs):
+    """
+    Shared loader: (student_ids, learning_outcome_ids, students × LOs matrix).
+    One query per queryset.
+    """
+    assessments = np.array(
+        list(
+            assessments_qs.order_by("id").values_list("id", "max_score", "weight_in_course")
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    assessment_ids = assessments[:, 0]
+
+    lo_ids = np.array(
+        list(learning_outcomes_qs.order_by("id").values_list("id", flat=True)),
+        dtype=np.int64,
+    )
+
+    # Sadece assessment'ın kendi dersindeki LO'lar sayılır (admin başka dersin LO'sunu seçebiliyor)
+    mappings_qs = mappings_qs.filter(learning_outcome__curriculum_id=F("assessment__curriculum_id"))
+    weights = build_weight_matrix(
+        mappings_qs.values_list("assessment_id", "learning_outcome_id", "weight_in_assessment"),
+        assessment_ids,
+        lo_ids,
+        assessments[:, 2],
+    )
+
+    student_ids, scores, graded = build_score_matrix(
+        results_qs.values_list("student_id", "assessment_id", "raw_score"),
+        assessment_ids,
+        assessments[:, 1],
+    )
+
+    return student_ids, lo_ids, weighted_attainment(scores, graded, weights)
+
+
+def curriculum_lo_attainment(curriculum):
+    """
+    LO attainment of every graded student of a curriculum.
+
+    Four queries in total (assessments, LOs, mappings, results), regardless of
+    the number of students.
+    """
+    student_ids, lo_ids, matrix = _lo_attainment(
+        Assessment.objects.filter(curriculum=curriculum),
+        LearningOutcome.objects.filter(curriculum=curriculum),
+        AssessmentLearningOutcome.objects.filter(assessment__curriculum=curriculum),
+        StudentAssessmentResult.objects.filter(assessment__curriculum=curriculum),
+    )
+    return CurriculumAttainment(curriculum, student_ids, lo_ids, matrix)
+
+
+class SparseWeights:
+    """
+    Minimal COO matrix (rows, cols, data) for the LO × PO weights of a program.
+
+    A program has ~600 LOs but every LO only feeds a couple of POs, so only the
+    non-zero cells are kept. `rmatmul` computes `dense @ self` without ever
+    building the dense LO × PO matrix.
+    """
+
+    def __init__(self, rows, cols, data, shape):
+        self.rows = rows
+        self.cols = cols
+        self.data = data
+        self.shape = shape
+
+    def rmatmul(self, dense):
+        out = np.zeros((dense.shape[0], self.shape[1]), dtype=np.float64)
+        np.add.at(out, (slice(None), self.cols), dense[:, self.rows] * self.data)
+        return out
+
+    def toarray(self):
+        out = np.zeros(self.shape, dtype=np.float64)
+        np.add.at(out, (self.rows, self.cols), self.data)
+        return out
+
+
+def program_lo_po_weights(program, lo_ids, program_outcome_ids=None):
+    """
+    (program_outcome_ids, SparseWeights) for the LO × PO mapping of a program,
+    optionally restricted to some POs. Two queries (POs, mappings).
+    """
+    pos = ProgramOutcome.objects.filter(program=program)
+    mappings = LearningOutcomeProgramOutcome.objects.filter(
+        program_outcome__program=program,
+        learning_outcome__curriculum__program=program,
+        weight__gt=0,
+    )
+    if program_outcome_ids is not None:
+        pos = pos.filter(id__in=program_outcome_ids)
+        mappings = mappings.filter(program_outcome_id__in=program_outcome_ids)
+
+    po_ids = np.array(
+        list(pos.order_by("id").values_list("id", flat=True)),
+        dtype=np.int64,
+    )
+
+    rows = np.array(
+        list(mappings.values_list("learning_outcome_id", "program_outcome_id", "weight")),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+
+    weights = SparseWeights(
+        _index_of(lo_ids, rows[:, 0]),
+        _index_of(po_ids, rows[:, 1]),
+        rows[:, 2].astype(np.float64),
+        (len(lo_ids), len(po_ids)),
+    )
+    return po_ids, weights
+
+
+class ProgramAttainment(AttainmentMatrix):
+    """
+    Students × POs attainment of one program.
+    """
+
+    def __init__(self, program, student_ids, program_outcome_ids, matrix):
+        super().__init__(student_ids, program_outcome_ids, matrix)
+        self.program = program
+        self.program_outcome_ids = program_outcome_ids
+
+
+def rollup_program_outcomes(lo_matrix, weights):
+    """
+    students × LOs attainment → students × POs attainment through the sparse
+    LO × PO weights. An LO the student has no attainment for (NaN) does not
+    contribute to, or count against, its POs.
+    """
+    present = ~np.isnan(lo_matrix)
+    values = np.where(present, lo_matrix, 0) / 100
+    numerator = weights.rmatmul(values)
+    denominator = weights.rmatmul(present.astype(np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator * 100, np.nan)
+
+
+def program_po_attainment(program):
+    """
+    PO attainment of every graded student of a program, in one batched pass.
+
+    All curricula of the program are loaded together: one students ×
+    assessments matrix, one assessments × LOs weight matrix and the sparse
+    LO × PO weights. Six queries in total, independent of the number of
+    curricula or students.
+    """
+    student_ids, lo_ids, lo_matrix = _lo_attainment(
+        Assessment.objects.filter(curriculum__program=program),
+        LearningOutcome.objects.filter(curriculum__program=program),
+        AssessmentLearningOutcome.objects.filter(assessment__curriculum__program=program),
+        StudentAssessmentResult.objects.filter(assessment__curriculum__program=program),
+    )
+    po_ids, weights = program_lo_po_weights(program, lo_ids)
+
+    matrix = rollup_program_outcomes(lo_matrix, weights)
+    return ProgramAttainment(program, student_ids, po_ids, matrix)
+
+
+# ---------------------------------------------------------------------------
+# Materialized StudentLOAttainment / StudentPOAttainment rows
+# ---------------------------------------------------------------------------
+
+def _replace_rows(model, outcome_field, scope, student_ids, outcome_ids, matrix):
+    """
+    Replace the materialized rows matching `scope` with the non-NaN cells of
+    `matrix` (students × outcomes).
+    """
+    student_idx, outcome_idx = np.nonzero(~np.isnan(matrix))
+    objs = [
+        model(
+            student_id=int(student_ids[s]),
+            attainment=float(matrix[s, o]),
+            **{f"{outcome_field}_id": int(outcome_ids[o])},
+        )
+        for s, o in zip(student_idx.tolist(), outcome_idx.tolist())
+    ]
+    with transaction.atomic():
+        model.objects.filter(**scope).delete()
+        # ON CONFLICT DO UPDATE: a concurrent refresh of the same students may
+        # have inserted between our DELETE and INSERT (READ COMMITTED on PostgreSQL)
+        model.objects.bulk_create(
+            objs,
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["student", outcome_field],
+            update_fields=["attainment", "updated_at"],
+        )
+
+
+def attainment_generation_name(program_id):
+    return f"attainment:{program_id}"
+
+
+def refresh_program_outcome_attainment(program_id, student_ids=None, program_outcome_ids=None):
+    """
+    Recompute StudentPOAttainment of a program from the materialized LO rows.
+    Limited to the given students and/or POs when they are passed.
+    """
+    lo_ids = np.array(
+        list(
+            LearningOutcome.objects.filter(curriculum__program_id=program_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+        ),
+        dtype=np.int64,
+    )
+
+    lo_rows = StudentLOAttainment.objects.filter(
+        learning_outcome__curriculum__program_id=program_id,
+    )
+    scope = {"program_outcome__program_id": program_id}
+    if student_ids is not None:
+        lo_rows = lo_rows.filter(student_id__in=student_ids)
+        scope["student_id__in"] = student_ids
+    if program_outcome_ids is not None:
+        scope["program_outcome_id__in"] = program_outcome_ids
+
+    rows = np.array(
+        list(lo_rows.values_list("student_id", "learning_outcome_id", "attainment")),
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    row_students, student_idx = np.unique(rows[:, 0].astype(np.int64), return_inverse=True)
+    lo_matrix = np.full((len(row_students), len(lo_ids)), np.nan)
+    lo_matrix[student_idx, _index_of(lo_ids, rows[:, 1].astype(np.int64))] = rows[:, 2]
+
+    po_ids, weights = program_lo_po_weights(program_id, lo_ids, program_outcome_ids)
+    matrix = rollup_program_outcomes(lo_matrix, weights)
+    _replace_rows(StudentPOAttainment, "program_outcome", scope, row_students, po_ids, matrix)
+    # Cache'lenmiş raporlar (assessments.reports) artık eski
+    bump_generation(attainment_generation_name(program_id))
+
+
+def _refresh_learning_outcome_rows(curriculum_id, student_ids=None):
+    """
+    Recompute StudentLOAttainment of a curriculum (or only some of its
+    students). Returns the IDs of the students whose rows changed.
+    """
+    results = StudentAssessmentResult.objects.filter(assessment__curriculum_id=curriculum_id)
+    scope = {"learning_outcome__curriculum_id": curriculum_id}
+    if student_ids is not None:
+        results = results.filter(student_id__in=student_ids)
+        scope["student_id__in"] = student_ids
+    else:
+        # Artık notu olmayan öğrencilerin PO satırları da yenilenmeli
+        student_ids = set(
+            StudentLOAttainment.objects.filter(**scope).values_list("student_id", flat=True)
+        )
+
+    row_students, lo_ids, matrix = _lo_attainment(
+        Assessment.objects.filter(curriculum_id=curriculum_id),
+        LearningOutcome.objects.filter(curriculum_id=curriculum_id),
+        AssessmentLearningOutcome.objects.filter(assessment__curriculum_id=curriculum_id),
+        results,
+    )
+    _replace_rows(StudentLOAttainment, "learning_outcome", scope, row_students, lo_ids, matrix)
+    return set(student_ids) | set(row_students.tolist())
+
+
+def refresh_curriculum_attainment(curriculum_id, program_id, student_ids=None):
+    """
+    Recompute StudentLOAttainment of a curriculum (or only some of its
+    students), then the PO rows of the affected students.
+    """
+    affected = _refresh_learning_outcome_rows(curriculum_id, student_ids)
+    refresh_program_outcome_attainment(program_id, student_ids=sorted(affected))
+
+
+def refresh_program_attainment(program_id):
+    """
+    Recompute every LO row of a program curriculum by curriculum, then all
+    of its PO rows in one pass (instead of once per curriculum).
+    """
+    for curriculum_id in Curriculum.objects.filter(program_id=program_id).values_list("id", flat=True):
+        _refresh_learning_outcome_rows(curriculum_id)
+    refresh_program_outcome_attainment(program_id)
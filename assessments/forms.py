@@ -0,0 +1,8 @@
+from django import forms
+
+
+class GradeImportForm(forms.Form):
+    file = forms.FileField(
+        label="Grade file",
+        help_text="CSV or XLSX with a header row: username (or student_number) and score.",
+    )
@@ -0,0 +1,222 @@
+"""
+Writing StudentAssessmentResult rows in bulk: the grade grid and the
+CSV / XLSX grade import both go through `upsert_results`.
+"""
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+
+from .attainment import refresh_curriculum_attainment
+from .models import StudentAssessmentResult
+
+IMPORT_CHUNK_SIZE = 500
+
+STUDENT_COLUMNS = ("username", "student_number", "student_no", "student")
+SCORE_COLUMNS = ("score", "raw_score", "grade")
+
+
+class GradeImportError(Exception):
+    """
+    The uploaded file cannot be imported at all (bad format, missing columns).
+    """
+
+
+def clean_score(raw_value, max_score):
+    """
+    Parse a submitted score into the Decimal stored in raw_score.
+
+    Raises ValueError with a user-facing message for values that are not
+    numbers, not finite, outside 0..max_score or too wide for the column
+    (a single bad value would otherwise fail the whole bulk upsert).
+    """
+    field = StudentAssessmentResult._meta.get_field("raw_score")
+    try:
+        score = Decimal(raw_value.strip().replace(",", "."))
+    except InvalidOperation:
+        raise ValueError(f"'{raw_value}' is not a number.")
+
+    if not score.is_finite() or score < 0 or score > max_score:
+        raise ValueError(f"Score {raw_value} is outside 0–{max_score}.")
+
+    score = score.quantize(Decimal(1).scaleb(-field.decimal_places))
+    if score >= Decimal(10) ** (field.max_digits - field.decimal_places):
+        raise ValueError(f"Score {raw_value} is too large to store.")
+    return score
+
+
+def upsert_results(curriculum, results):
+    """
+    Write StudentAssessmentResult rows with a single INSERT ... ON CONFLICT
+    on (assessment, student), in one transaction. bulk_create skips post_save,
+    so the attainment rows of the touched students are refreshed here.
+    """
+    if not results:
+        return
+
+    student_ids = sorted({r.student_id for r in results})
+    with transaction.atomic():
+        StudentAssessmentResult.objects.bulk_create(
+            results,
+            update_conflicts=True,
+            unique_fields=["assessment", "student"],
+            update_fields=["raw_score", "updated_at"],
+        )
+        transaction.on_commit(
+            lambda: refresh_curriculum_attainment(
+                curriculum.id, curriculum.program_id, student_ids=student_ids
+            )
+        )
+
+
+def _csv_rows(upload):
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        # Excel'in TR locale'i ';' ile export ediyor
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    yield from csv.reader(text, dialect)
+
+
+def _xlsx_rows(upload):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise GradeImportError("Excel import requires the openpyxl package; upload a CSV instead.")
+
+    # read_only: satırlar diskten akıtılır, tüm sayfa belleğe alınmaz
+    workbook = load_workbook(upload, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield [_xlsx_text(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def _xlsx_text(value):
+    if value is None:
+        return ""
+    # Excel sayıları float saklar: öğrenci no 2021001 → "2021001.0" olmasın
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_grade_rows(upload):
+    """
+    Yield the rows of an uploaded CSV / XLSX file as lists of strings,
+    one at a time.
+    """
+    name = (upload.name or "").lower()
+    if name.endswith(".xlsx"):
+        return _xlsx_rows(upload)
+    if name.endswith(".csv") or name.endswith(".txt"):
+        return _csv_rows(upload)
+    raise GradeImportError("Unsupported file type; upload a .csv or .xlsx file.")
+
+
+def _find_column(header, candidates):
+    for candidate in candidates:
+        if candidate in header:
+            return header.index(candidate)
+    return None
+
+
+class GradeImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.errors = []  # (line number, message)
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+
+def import_grades(assessment, rows):
+    """
+    Import (student, score) rows for an assessment.
+
+    Students are matched against curriculum.students through a single
+    {username: id} dictionary, scores are validated against max_score and
+    written in chunks of IMPORT_CHUNK_SIZE upserts inside one transaction.
+    Invalid rows are reported per line and do not stop the import.
+    """
+    curriculum = assessment.curriculum
+    report = GradeImportReport()
+    rows = iter(rows)
+
+    header = [cell.strip().lower() for cell in next(rows, [])]
+    student_col = _find_column(header, STUDENT_COLUMNS)
+    score_col = _find_column(header, SCORE_COLUMNS)
+    if student_col is None or score_col is None:
+        raise GradeImportError(
+            "The first row must contain a student column "
+            f"({', '.join(STUDENT_COLUMNS)}) and a score column ({', '.join(SCORE_COLUMNS)})."
+        )
+
+    student_ids = {
+        username.lower(): student_id
+        for student_id, username in curriculum.students.values_list("id", "username")
+    }
+    existing_scores = dict(
+        StudentAssessmentResult.objects.filter(assessment=assessment)
+        .values_list("student_id", "raw_score")
+    )
+    seen = set()
+
+    numbered = enumerate(rows, start=2)
+    with transaction.atomic():
+        while True:
+            chunk = list(islice(numbered, IMPORT_CHUNK_SIZE))
+            if not chunk:
+                break
+
+            results = []
+            for line, row in chunk:
+                if not any(cell.strip() for cell in row):
+                    continue
+
+                key = row[student_col].strip().lower() if student_col < len(row) else ""
+                raw_value = row[score_col].strip() if score_col < len(row) else ""
+
+                student_id = student_ids.get(key)
+                if student_id is None:
+                    report.error(line, f"'{key}' is not enrolled in {curriculum.code}.")
+                    continue
+                if student_id in seen:
+                    report.error(line, f"Duplicate row for '{key}'.")
+                    continue
+                seen.add(student_id)
+
+                if raw_value == "":
+                    report.skipped += 1
+                    continue
+
+                try:
+                    score_val = clean_score(raw_value, assessment.max_score)
+                except ValueError as exc:
+                    report.error(line, str(exc))
+                    continue
+
+                if existing_scores.get(student_id) == score_val:
+                    report.unchanged += 1
+                    continue
+
+                results.append(
+                    StudentAssessmentResult(
+                        assessment=assessment,
+                        student_id=student_id,
+                        raw_score=score_val,
+                    )
+                )
+
+            upsert_results(curriculum, results)
+            report.imported += len(results)
+
+    return report
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from curriculum.models import Curriculum
+from assessments.attainment import refresh_curriculum_attainment
+from jobs.registry import enqueue
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized StudentLOAttainment / StudentPOAttainment tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--program",
+            type=int,
+            help="Only rebuild the curricula of this program id.",
+        )
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Queue a job for run_worker instead of refreshing now.",
+        )
+
+    def handle(self, *args, **options):
+        if options["background"]:
+            program_ids = [options["program"]] if options["program"] else None
+            job = enqueue("assessments.refresh_attainment", {"program_ids": program_ids})
+            self.stdout.write(self.style.SUCCESS(f"Queued job #{job.pk}."))
+            return
+
+        curricula = Curriculum.objects.only("id", "program_id").order_by("id")
+        if options["program"]:
+            curricula = curricula.filter(program_id=options["program"])
+
+        count = 0
+        for curriculum in curricula.iterator():
+            refresh_curriculum_attainment(curriculum.id, curriculum.program_id)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed attainment for {count} curricula."))
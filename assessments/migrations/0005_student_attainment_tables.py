@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+# Tekrar eden (curriculum, type) satırları önce bu sırayla boş bir type'a taşınır
+SPARE_TYPES = ("OTHER", "PROJECT", "QUIZ", "MIDTERM", "FINAL")
+
+
+def resolve_duplicate_assessment_types(apps, schema_editor):
+    """
+    Assessment.name is dropped and (curriculum, type) becomes unique. Older
+    rows may repeat a type within a curriculum: the oldest one keeps it,
+    the others move to a type the curriculum does not use yet.
+    """
+    Assessment = apps.get_model("assessments", "Assessment")
+    duplicates = (
+        Assessment.objects.values("curriculum_id", "type")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in list(duplicates):
+        extra = Assessment.objects.filter(curriculum_id=row["curriculum_id"], type=row["type"]).order_by("id")[1:]
+        for assessment in list(extra):
+            used = set(
+                Assessment.objects.filter(curriculum_id=assessment.curriculum_id).values_list("type", flat=True)
+            )
+            spare = [type_ for type_ in SPARE_TYPES if type_ not in used]
+            if not spare:
+                raise RuntimeError(
+                    f"Curriculum {assessment.curriculum_id} has more assessments than assessment types; "
+                    f"merge or delete assessment {assessment.id} ({assessment.name}) before migrating."
+                )
+            assessment.type = spare[0]
+            assessment.save(update_fields=["type"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0004_cleanup_legacy_assesments_tables'),
+        ('outcomes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(resolve_duplicate_assessment_types, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='assessment',
+            options={'ordering': ['curriculum', 'type'], 'verbose_name': 'Assessment', 'verbose_name_plural': 'Assessments'},
+        ),
+        migrations.AlterUniqueTogether(
+            name='assessment',
+            unique_together={('curriculum', 'type')},
+        ),
+        migrations.RemoveField(
+            model_name='assessment',
+            name='name',
+        ),
+        migrations.CreateModel(
+            name='StudentLOAttainment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attainment', models.FloatField(help_text='Attainment of this LO in percent (0-100).')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('learning_outcome', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_attainments', to='outcomes.learningoutcome')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lo_attainments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student LO Attainment',
+                'verbose_name_plural': 'Student LO Attainments',
+                'unique_together': {('student', 'learning_outcome')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentPOAttainment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attainment', models.FloatField(help_text='Attainment of this PO in percent (0-100).')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('program_outcome', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_attainments', to='outcomes.programoutcome')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='po_attainments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student PO Attainment',
+                'verbose_name_plural': 'Student PO Attainments',
+                'unique_together': {('student', 'program_outcome')},
+            },
+        ),
+    ]
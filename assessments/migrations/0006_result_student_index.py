@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0005_student_attainment_tables'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentassessmentresult',
+            index=models.Index(fields=['student', 'assessment', 'raw_score'], name='result_student_idx'),
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 from django.conf import settings
 
 from curriculum.models import Curriculum
-from outcomes.models import LearningOutcome
+from outcomes.models import LearningOutcome, ProgramOutcome
 
 
 class Assessment(models.Model):
@@ -103,6 +103,10 @@ class StudentAssessmentResult(models.Model):
 
     class Meta:
         unique_together = ("assessment", "student")
+        indexes = [
+            # Öğrenci bazlı sorgular; raw_score da index'te → tabloya gitmeden okunur
+            models.Index(fields=["student", "assessment", "raw_score"], name="result_student_idx"),
+        ]
         verbose_name = "Student Assessment Result"
         verbose_name_plural = "Student Assessment Results"
 
@@ -118,3 +122,61 @@ class StudentAssessmentResult(models.Model):
         if self.raw_score is None or not self.assessment or not self.assessment.max_score:
             return None
         return (self.raw_score / self.assessment.max_score) * 100
+
+
+class StudentLOAttainment(models.Model):
+    """
+    Materialized LO attainment of a student (percent).
+    Kept up to date by assessments.signals, read by dashboards and reports.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="lo_attainments",
+    )
+    learning_outcome = models.ForeignKey(
+        LearningOutcome,
+        on_delete=models.CASCADE,
+        related_name="student_attainments",
+    )
+    attainment = models.FloatField(
+        help_text="Attainment of this LO in percent (0-100).",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("student", "learning_outcome")
+        verbose_name = "Student LO Attainment"
+        verbose_name_plural = "Student LO Attainments"
+
+    def __str__(self):
+        return f"{self.student_id} → LO {self.learning_outcome_id} ({self.attainment:.1f}%)"
+
+
+class StudentPOAttainment(models.Model):
+    """
+    Materialized PO attainment of a student (percent), rolled up from
+    StudentLOAttainment through the LO → PO weights.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="po_attainments",
+    )
+    program_outcome = models.ForeignKey(
+        ProgramOutcome,
+        on_delete=models.CASCADE,
+        related_name="student_attainments",
+    )
+    attainment = models.FloatField(
+        help_text="Attainment of this PO in percent (0-100).",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("student", "program_outcome")
+        verbose_name = "Student PO Attainment"
+        verbose_name_plural = "Student PO Attainments"
+
+    def __str__(self):
+        return f"{self.student_id} → PO {self.program_outcome_id} ({self.attainment:.1f}%)"
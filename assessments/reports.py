@@ -0,0 +1,90 @@
+"""
+Program / curriculum attainment reports.
+
+Reports are recomputed from the raw results with the attainment engine and
+served through assessments.singleflight: when results are published and
+many users open the same report, it is computed once and the others get
+the previous version (flagged stale) or wait for the fresh one.
+"""
+import numpy as np
+
+from outcomes.cache import program_tree, program_version
+from .attainment import attainment_generation_name, curriculum_lo_attainment, program_po_attainment
+from .singleflight import generation, single_flight
+
+# Bir outcome'u "sağlamış" sayılmak için gereken yüzde
+ACHIEVEMENT_THRESHOLD = 50
+
+
+def _generation(program_id):
+    # Yapı (outcome / mapping) veya notlar değişince rapor eskir
+    return (program_version(program_id), generation(attainment_generation_name(program_id)))
+
+
+def _outcome_rows(attainment, outcomes):
+    """
+    Per-outcome summary of a students × outcomes attainment matrix.
+    """
+    matrix = attainment.matrix
+    present = ~np.isnan(matrix)
+    achieved = present & (np.where(present, matrix, 0) >= ACHIEVEMENT_THRESHOLD)
+    averages = attainment.averages()
+
+    rows = []
+    for column, outcome_id in enumerate(attainment.outcome_ids.tolist()):
+        graded = int(present[:, column].sum())
+        rows.append(
+            {
+                "outcome": outcomes.get(outcome_id),
+                "average": averages[outcome_id],
+                "students": graded,
+                "achieved_percent": (
+                    float(achieved[:, column].sum()) * 100 / graded if graded else None
+                ),
+            }
+        )
+    return rows
+
+
+def _build_program_report(program):
+    outcomes = {po["id"]: po for po in program_tree(program.id)["program_outcomes"]}
+    attainment = program_po_attainment(program)
+    return {
+        "students": len(attainment.student_ids),
+        "rows": _outcome_rows(attainment, outcomes),
+    }
+
+
+def _build_curriculum_report(curriculum):
+    outcomes = {
+        lo["id"]: lo for lo in program_tree(curriculum.program_id)["curricula"].get(curriculum.id, [])
+    }
+    attainment = curriculum_lo_attainment(curriculum)
+    return {
+        "students": len(attainment.student_ids),
+        "rows": _outcome_rows(attainment, outcomes),
+    }
+
+
+def program_attainment_report(program):
+    """
+    singleflight.Result whose value is
+    {"students": n, "rows": [{"outcome", "average", "students", "achieved_percent"}]}
+    with one row per program outcome.
+    """
+    return single_flight(
+        f"report:program:{program.id}",
+        lambda: _build_program_report(program),
+        _generation(program.id),
+    )
+
+
+def curriculum_attainment_report(curriculum):
+    """
+    Same as program_attainment_report, with one row per learning outcome.
+    """
+    return single_flight(
+        f"report:curriculum:{curriculum.id}",
+        lambda: _build_curriculum_report(curriculum),
+        _generation(curriculum.program_id),
+    )
@@ -0,0 +1,124 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.transactions import on_commit_once
+from curriculum.models import Curriculum
+from outcomes.cache import bump_program_version
+from outcomes.models import LearningOutcomeProgramOutcome, ProgramOutcome
+from .attainment import (
+    refresh_curriculum_attainment,
+    refresh_program_outcome_attainment,
+)
+from .models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+
+
+def _curriculum_of_assessment(assessment_id):
+    return (
+        Curriculum.objects.filter(assessments__id=assessment_id)
+        .only("id", "program_id")
+        .first()
+    )
+
+
+@receiver(post_save, sender=StudentAssessmentResult)
+@receiver(post_delete, sender=StudentAssessmentResult)
+def refresh_student_attainment(sender, instance: StudentAssessmentResult, **kwargs):
+    """
+    A single grade changed → only this student's LO/PO rows are recomputed.
+    """
+    student_id = instance.student_id
+    assessment_id = instance.assessment_id
+
+    def refresh():
+        curriculum = _curriculum_of_assessment(assessment_id)
+        if curriculum is None:
+            # Assessment de silindi; curriculum refresh'i onun sinyali yapar
+            return
+        refresh_curriculum_attainment(
+            curriculum.id, curriculum.program_id, student_ids=[student_id]
+        )
+
+    on_commit_once(("student", student_id, assessment_id), refresh)
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def refresh_attainment_for_assessment(sender, instance: Assessment, **kwargs):
+    """
+    max_score / weight_in_course changes or deletions affect the whole curriculum.
+    """
+    curriculum_id = instance.curriculum_id
+
+    def refresh():
+        curriculum = Curriculum.objects.filter(id=curriculum_id).only("id", "program_id").first()
+        if curriculum is None:
+            return
+        refresh_curriculum_attainment(curriculum.id, curriculum.program_id)
+
+    on_commit_once(("curriculum", curriculum_id), refresh)
+
+
+@receiver(post_save, sender=AssessmentLearningOutcome)
+@receiver(post_delete, sender=AssessmentLearningOutcome)
+def refresh_attainment_for_lo_mapping(sender, instance: AssessmentLearningOutcome, **kwargs):
+    assessment_id = instance.assessment_id
+
+    def refresh():
+        curriculum = _curriculum_of_assessment(assessment_id)
+        if curriculum is None:
+            return
+        refresh_curriculum_attainment(curriculum.id, curriculum.program_id)
+
+    on_commit_once(("assessment", assessment_id), refresh)
+
+
+@receiver(post_save, sender=LearningOutcomeProgramOutcome)
+@receiver(post_delete, sender=LearningOutcomeProgramOutcome)
+def refresh_attainment_for_po_mapping(sender, instance: LearningOutcomeProgramOutcome, **kwargs):
+    """
+    An LO → PO weight only affects that PO; LO rows stay as they are.
+    """
+    program_outcome_id = instance.program_outcome_id
+
+    def refresh():
+        program_id = (
+            ProgramOutcome.objects.filter(id=program_outcome_id)
+            .values_list("program_id", flat=True)
+            .first()
+        )
+        if program_id is None:
+            return
+        refresh_program_outcome_attainment(
+            program_id, program_outcome_ids=[program_outcome_id]
+        )
+
+    on_commit_once(("program_outcome", program_outcome_id), refresh)
+
+
+
+# Cached assessment → LO → PO trees (assessments.tree) use the program version
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def assessment_changed(sender, instance: Assessment, **kwargs):
+    curriculum_id = instance.curriculum_id
+
+    def bump():
+        for program_id in Curriculum.objects.filter(id=curriculum_id).values_list("program_id", flat=True):
+            bump_program_version(program_id)
+
+    on_commit_once(("program_version_curriculum", curriculum_id), bump)
+
+
+@receiver(post_save, sender=AssessmentLearningOutcome)
+@receiver(post_delete, sender=AssessmentLearningOutcome)
+def lo_mapping_changed(sender, instance: AssessmentLearningOutcome, **kwargs):
+    assessment_id = instance.assessment_id
+
+    def bump():
+        # Assessment silindiyse kendi sinyali version'ı zaten artırdı
+        curriculum = _curriculum_of_assessment(assessment_id)
+        if curriculum is not None:
+            bump_program_version(curriculum.program_id)
+
+    on_commit_once(("program_version_assessment", assessment_id), bump)
@@ -0,0 +1,136 @@
+"""
+Single-flight computation of expensive, cached values (attainment reports).
+
+A cached entry remembers the generation of the data it was computed from.
+When the generation moves on, the first request to notice takes an
+exclusive lock for the key and recomputes; every other request meanwhile
+gets the last good value flagged as stale instead of recomputing it too.
+Requests that find no value at all wait for the lock holder.
+
+The lock is a flock() on a file under settings.LOCK_DIR, so it covers all
+gunicorn workers of a host; the cache (CACHE_URL) must be shared between
+them as well for the entries to be. Platforms without fcntl (Windows) fall
+back to a lock that only covers the threads of one process.
+"""
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+CACHE_TIMEOUT = 24 * 60 * 60
+WAIT_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+
+
+def _generation_key(name):
+    return f"generation:{name}"
+
+
+def generation(name):
+    """
+    Current generation of a named piece of data (e.g. "attainment:7").
+    """
+    return cache.get_or_set(_generation_key(name), lambda: int(time.time() * 1000), None)
+
+
+def bump_generation(name):
+    try:
+        cache.incr(_generation_key(name))
+    except ValueError:
+        cache.set(_generation_key(name), int(time.time() * 1000), None)
+
+
+# fcntl yokken kullanılan process içi lock'lar
+_process_locks = {}
+
+
+def _try_lock(handle, key):
+    if fcntl is None:
+        return _process_locks.setdefault(key, threading.Lock()).acquire(blocking=False)
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _unlock(handle, key):
+    if fcntl is None:
+        _process_locks[key].release()
+    else:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(key, blocking=True, timeout=None):
+    """
+    Exclusive inter-process lock for `key`. Yields True when acquired,
+    False when not blocking (or timed out after `timeout`, default
+    WAIT_TIMEOUT seconds) and someone else holds it.
+    """
+    os.makedirs(settings.LOCK_DIR, exist_ok=True)
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    path = os.path.join(settings.LOCK_DIR, f"{digest}.lock")
+
+    with open(path, "a") as handle:
+        deadline = time.monotonic() + (WAIT_TIMEOUT if timeout is None else timeout)
+        while True:
+            acquired = _try_lock(handle, key)
+            if acquired or not blocking or time.monotonic() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                _unlock(handle, key)
+
+
+class Result:
+    def __init__(self, value, computed_at, stale):
+        self.value = value
+        self.computed_at = computed_at
+        self.stale = stale
+
+
+def _compute_and_store(key, compute, current):
+    value = compute()
+    entry = {"value": value, "generation": current, "computed_at": timezone.now()}
+    cache.set(key, entry, CACHE_TIMEOUT)
+    return Result(value, entry["computed_at"], stale=False)
+
+
+def single_flight(key, compute, current):
+    """
+    Cached compute() for `key`, recomputed by one process at a time once the
+    cached entry's generation differs from `current`.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry["generation"] == current:
+        return Result(entry["value"], entry["computed_at"], stale=False)
+
+    # Eski bir değer varsa beklemeye gerek yok: biri hesaplıyorsa onu döndür
+    with file_lock(key, blocking=entry is None) as acquired:
+        fresh = cache.get(key)
+        if fresh is not None and fresh["generation"] == current:
+            # Biz beklerken başka bir worker hesapladı
+            return Result(fresh["value"], fresh["computed_at"], stale=False)
+        if acquired:
+            return _compute_and_store(key, compute, current)
+
+    if entry is not None:
+        return Result(entry["value"], entry["computed_at"], stale=True)
+    if fresh is not None:
+        return Result(fresh["value"], fresh["computed_at"], stale=True)
+    # Lock sahibi WAIT_TIMEOUT içinde bitiremedi; kendimiz hesaplayalım
+    return _compute_and_store(key, compute, current)
@@ -1,3 +1,580 @@
-from django.test import TestCase
+import io
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from outcomes.models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+from .attainment import (
+    SparseWeights,
+    build_weight_matrix,
+    curriculum_lo_attainment,
+    program_po_attainment,
+    refresh_curriculum_attainment,
+    rollup_program_outcomes,
+    weighted_attainment,
+)
+from . import grading, singleflight
+from .grading import GradeImportError, import_grades, read_grade_rows
+from .tree import assessment_tree
+from .models import (
+    Assessment,
+    AssessmentLearningOutcome,
+    StudentAssessmentResult,
+    StudentLOAttainment,
+    StudentPOAttainment,
+)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+class ResultIndexTests(TestCase):
+    def test_student_results_use_covering_index(self):
+        # student_course_detail: öğrencinin kendi notları
+        plan = (
+            StudentAssessmentResult.objects.filter(student_id=1, assessment_id__in=[1, 2, 3])
+            .values_list("assessment_id", "raw_score")
+            .explain()
+        )
+        self.assertIn("COVERING INDEX result_student_idx", plan)
+
+
+class AttainmentFixture:
+    """
+    One curriculum, two students, hand-worked numbers:
+
+    MIDTERM (40% of the course, max 100) → LO1 50%, LO2 50%
+    FINAL   (60% of the course, max 50)  → LO2 100%
+    LO1 → PO1 100, LO2 → PO1 50, LO2 → PO2 100
+
+    s1: midterm 80, final 25  → LO1 80, LO2 (0.8·2000 + 0.5·6000) / 8000 = 57.5
+    s2: midterm 60, no final  → LO1 60, LO2 60 (the ungraded final does not count)
+    PO1 = (LO1·100 + LO2·50) / 150 → s1 72.5, s2 60; PO2 = LO2
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Sinyallerin on_commit refresh'leri çalışsın: materialized satırlar hazır olsun
+        with cls.captureOnCommitCallbacks(execute=True):
+            faculty = Faculty.objects.create(name="Engineering", code="ENG")
+            cls.program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+            cls.curriculum = Curriculum.objects.create(program=cls.program, code="CE101", name="Intro", year=1)
+            cls.other_curriculum = Curriculum.objects.create(program=cls.program, code="CE102", name="Other", year=1)
+
+            cls.lo1 = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO1", short_title="LO1", order=1)
+            cls.lo2 = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO2", short_title="LO2", order=2)
+            cls.other_lo = LearningOutcome.objects.create(
+                curriculum=cls.other_curriculum, code="LO1", short_title="LO1", order=1
+            )
+            cls.po1 = ProgramOutcome.objects.create(program=cls.program, code="PO1", short_title="PO1", order=1)
+            cls.po2 = ProgramOutcome.objects.create(program=cls.program, code="PO2", short_title="PO2", order=2)
+            LearningOutcomeProgramOutcome.objects.create(learning_outcome=cls.lo1, program_outcome=cls.po1, weight=100)
+            cls.lo2_po1 = LearningOutcomeProgramOutcome.objects.create(
+                learning_outcome=cls.lo2, program_outcome=cls.po1, weight=50
+            )
+            LearningOutcomeProgramOutcome.objects.create(learning_outcome=cls.lo2, program_outcome=cls.po2, weight=100)
+
+            cls.midterm = Assessment.objects.create(
+                curriculum=cls.curriculum, type=Assessment.AssessmentType.MIDTERM, weight_in_course=40, max_score=100
+            )
+            cls.final = Assessment.objects.create(
+                curriculum=cls.curriculum, type=Assessment.AssessmentType.FINAL, weight_in_course=60, max_score=50
+            )
+            AssessmentLearningOutcome.objects.create(assessment=cls.midterm, learning_outcome=cls.lo1, weight_in_assessment=50)
+            AssessmentLearningOutcome.objects.create(assessment=cls.midterm, learning_outcome=cls.lo2, weight_in_assessment=50)
+            AssessmentLearningOutcome.objects.create(assessment=cls.final, learning_outcome=cls.lo2, weight_in_assessment=100)
+
+            cls.s1, cls.s2 = (
+                CustomUser.objects.create_user(
+                    username,
+                    password="x",
+                    role=CustomUser.Role.STUDENT,
+                    student_faculty=faculty,
+                    student_program=cls.program,
+                    student_grade=1,
+                )
+                for username in ("s1", "s2")
+            )
+            StudentAssessmentResult.objects.create(assessment=cls.midterm, student=cls.s1, raw_score=80)
+            StudentAssessmentResult.objects.create(assessment=cls.final, student=cls.s1, raw_score=25)
+            StudentAssessmentResult.objects.create(assessment=cls.midterm, student=cls.s2, raw_score=60)
+
+    def setUp(self):
+        super().setUp()
+        # Program ID'leri testler arasında tekrar kullanılıyor; önceki testin cache'i okunmasın
+        cache.clear()
+
+    def refresh(self):
+        refresh_curriculum_attainment(self.curriculum.id, self.program.id)
+
+    def lo_rows(self):
+        return {
+            (row.student_id, row.learning_outcome_id): row.attainment
+            for row in StudentLOAttainment.objects.all()
+        }
+
+    def po_rows(self):
+        return {
+            (row.student_id, row.program_outcome_id): row.attainment
+            for row in StudentPOAttainment.objects.all()
+        }
+
+    def assertRows(self, rows, expected):
+        self.assertEqual(set(rows), set(expected))
+        for key, value in expected.items():
+            self.assertAlmostEqual(rows[key], value, msg=key)
+
+
+class CrossCurriculumMappingTests(AttainmentFixture, TestCase):
+    def test_mapping_to_another_curriculums_lo_is_ignored(self):
+        # Admin'den başka dersin LO'su seçilebiliyor
+        AssessmentLearningOutcome.objects.create(
+            assessment=self.final, learning_outcome=self.other_lo, weight_in_assessment=50
+        )
+        self.refresh()
+
+        rows = self.lo_rows()
+        self.assertAlmostEqual(rows[(self.s1.id, self.lo2.id)], 57.5)
+        self.assertNotIn((self.s1.id, self.other_lo.id), rows)
+        self.assertIsNotNone(curriculum_lo_attainment(self.curriculum).for_student(self.s1.id)[self.lo1.id])
+        self.assertIn(self.po1.id, program_po_attainment(self.program).for_student(self.s1.id))
+
+
+class AssessmentTreeTests(AttainmentFixture, TestCase):
+    def test_mapping_to_another_curriculums_lo_is_skipped(self):
+        AssessmentLearningOutcome.objects.create(
+            assessment=self.final, learning_outcome=self.other_lo, weight_in_assessment=50
+        )
+        tree = {node["assessment"]["id"]: node for node in assessment_tree(self.curriculum)}
+        self.assertEqual([row["lo"]["id"] for row in tree[self.final.id]["lo_rows"]], [self.lo2.id])
+
+
+class AttainmentEngineTests(TestCase):
+    def test_weight_matrix_scales_by_course_weight(self):
+        weights = build_weight_matrix(
+            [(10, 100, 50), (10, 101, 50), (11, 101, 100)],
+            np.array([10, 11]),
+            np.array([100, 101]),
+            [40, 60],
+        )
+        np.testing.assert_array_equal(weights, [[2000, 2000], [0, 6000]])
+
+    def test_ungraded_inputs_leave_the_denominator(self):
+        weights = np.array([[2000.0, 2000.0], [0.0, 6000.0]])
+        values = np.array([[0.8, 0.5], [0.6, 0.0], [0.0, 0.0]])
+        present = np.array([[1.0, 1.0], [1.0, 0.0], [0.0, 0.0]])
+        result = weighted_attainment(values, present, weights)
+        np.testing.assert_allclose(result[:2], [[80, 57.5], [60, 60]])
+        # Hiç notu olmayan öğrenci: NaN, 0 değil
+        self.assertTrue(np.isnan(result[2]).all())
+
+    def test_sparse_rollup_skips_missing_learning_outcomes(self):
+        # LO0 → PO0 100, LO1 → PO0 50, LO1 → PO1 100
+        weights = SparseWeights(np.array([0, 1, 1]), np.array([0, 0, 1]), np.array([100.0, 50.0, 100.0]), (2, 2))
+        np.testing.assert_array_equal(weights.rmatmul(np.eye(2)), weights.toarray())
+
+        lo_matrix = np.array([[80, 57.5], [np.nan, 60], [70, np.nan]])
+        result = rollup_program_outcomes(lo_matrix, weights)
+        np.testing.assert_allclose(result[:2], [[72.5, 57.5], [60, 60]])
+        self.assertAlmostEqual(result[2, 0], 70)
+        self.assertTrue(np.isnan(result[2, 1]))
+
+
+class MaterializedAttainmentTests(AttainmentFixture, TestCase):
+    def test_rows_match_hand_worked_example(self):
+        s1, s2 = self.s1.id, self.s2.id
+        self.assertRows(
+            self.lo_rows(),
+            {(s1, self.lo1.id): 80, (s1, self.lo2.id): 57.5, (s2, self.lo1.id): 60, (s2, self.lo2.id): 60},
+        )
+        self.assertRows(
+            self.po_rows(),
+            {(s1, self.po1.id): 72.5, (s1, self.po2.id): 57.5, (s2, self.po1.id): 60, (s2, self.po2.id): 60},
+        )
+        # Tek seferlik hesaplama da aynı sonucu vermeli
+        self.assertAlmostEqual(curriculum_lo_attainment(self.curriculum).for_student(s1)[self.lo2.id], 57.5)
+        self.assertAlmostEqual(program_po_attainment(self.program).for_student(s1)[self.po1.id], 72.5)
+
+    def row_ids(self, model, **filters):
+        return set(model.objects.filter(**filters).values_list("id", flat=True))
+
+    def test_result_save_rewrites_only_that_student(self):
+        s2_lo = self.row_ids(StudentLOAttainment, student=self.s2)
+        s2_po = self.row_ids(StudentPOAttainment, student=self.s2)
+        s1_lo = self.row_ids(StudentLOAttainment, student=self.s1)
+
+        result = StudentAssessmentResult.objects.get(assessment=self.final, student=self.s1)
+        result.raw_score = 50
+        with self.captureOnCommitCallbacks(execute=True):
+            result.save()
+
+        self.assertEqual(self.row_ids(StudentLOAttainment, student=self.s2), s2_lo)
+        self.assertEqual(self.row_ids(StudentPOAttainment, student=self.s2), s2_po)
+        self.assertNotEqual(self.row_ids(StudentLOAttainment, student=self.s1), s1_lo)
+        # LO2 = (0.8·2000 + 1.0·6000) / 8000 = 95, PO1 = (80·100 + 95·50) / 150 = 85
+        lo_rows, po_rows = self.lo_rows(), self.po_rows()
+        self.assertAlmostEqual(lo_rows[(self.s1.id, self.lo2.id)], 95)
+        self.assertAlmostEqual(po_rows[(self.s1.id, self.po1.id)], 85)
+        self.assertAlmostEqual(po_rows[(self.s2.id, self.po1.id)], 60)
+
+    def test_repeated_saves_queue_one_refresh(self):
+        result = StudentAssessmentResult.objects.get(assessment=self.midterm, student=self.s1)
+        with self.captureOnCommitCallbacks() as callbacks:
+            result.save()
+            result.save()
+        keys = [getattr(callback, "on_commit_key", None) for callback in callbacks]
+        self.assertEqual(keys.count(("student", self.s1.id, self.midterm.id)), 1)
+
+    def test_cascade_delete_refreshes_the_curriculum_once(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.final.delete()
+
+        keys = [getattr(callback, "on_commit_key", None) for callback in callbacks]
+        self.assertEqual(keys.count(("curriculum", self.curriculum.id)), 1)
+        # Sadece midterm kaldı: LO2 = midterm puanı
+        lo_rows, po_rows = self.lo_rows(), self.po_rows()
+        self.assertAlmostEqual(lo_rows[(self.s1.id, self.lo2.id)], 80)
+        self.assertAlmostEqual(po_rows[(self.s1.id, self.po1.id)], 80)
+
+    def test_po_weight_edit_touches_only_that_po(self):
+        lo_ids = self.row_ids(StudentLOAttainment)
+        po2_ids = self.row_ids(StudentPOAttainment, program_outcome=self.po2)
+
+        self.lo2_po1.weight = 100
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lo2_po1.save()
+
+        self.assertEqual(self.row_ids(StudentLOAttainment), lo_ids)
+        self.assertEqual(self.row_ids(StudentPOAttainment, program_outcome=self.po2), po2_ids)
+        # PO1 = (80·100 + 57.5·100) / 200
+        self.assertAlmostEqual(self.po_rows()[(self.s1.id, self.po1.id)], 68.75)
+
+
+class GradeEntryQueryTests(TestCase):
+    """
+    Saving a whole class through assessment_grade_manage costs the same
+    number of queries whatever the class size, refreshes included.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = CustomUser.objects.create_user("lect", password=None, role=CustomUser.Role.LECTURER)
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        po = ProgramOutcome.objects.create(program=program, code="PO1", short_title="PO1")
+
+        cls.assessments = {}
+        for year, class_size in [(1, 3), (2, 40)]:
+            curriculum = Curriculum.objects.create(
+                program=program, code=f"CE{year}01", name="Course", year=year, lecturer=cls.lecturer
+            )
+            lo = LearningOutcome.objects.create(curriculum=curriculum, code="LO1", short_title="LO1")
+            LearningOutcomeProgramOutcome.objects.create(learning_outcome=lo, program_outcome=po, weight=100)
+            assessment = Assessment.objects.create(
+                curriculum=curriculum, type=Assessment.AssessmentType.MIDTERM, weight_in_course=100
+            )
+            AssessmentLearningOutcome.objects.create(assessment=assessment, learning_outcome=lo, weight_in_assessment=100)
+            for n in range(class_size):
+                CustomUser.objects.create_user(
+                    f"y{year}s{n}",
+                    password=None,
+                    role=CustomUser.Role.STUDENT,
+                    student_faculty=faculty,
+                    student_program=program,
+                    student_grade=year,
+                )
+            cls.assessments[class_size] = assessment
+
+    def post_grades(self, assessment, score):
+        # Cache'lenmiş yetki / ağaç sorguları iki sınıf arasında fark yaratmasın
+        cache.clear()
+        students = assessment.curriculum.students.all()
+        data = {f"student_{student.id}": score for student in students}
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("assessments:assessment_grade_manage", args=[assessment.id]), data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            StudentAssessmentResult.objects.filter(assessment=assessment, raw_score=score).count(),
+            len(students),
+        )
+        self.assertEqual(
+            StudentLOAttainment.objects.filter(learning_outcome__curriculum=assessment.curriculum).count(),
+            len(students),
+        )
+        return len(queries)
+
+    def test_query_count_does_not_depend_on_class_size(self):
+        self.client.force_login(self.lecturer)
+        for score in ("70", "85"):  # ilk kayıt (insert) ve güncelleme
+            with self.subTest(score=score):
+                small = self.post_grades(self.assessments[3], score)
+                large = self.post_grades(self.assessments[40], score)
+                self.assertEqual(small, large)
+
+    def test_invalid_scores_are_reported_and_the_rest_saved(self):
+        self.client.force_login(self.lecturer)
+        assessment = self.assessments[40]
+        students = list(assessment.curriculum.students.order_by("id"))
+        bad_values = ["NaN", "-1", "101", "abc", "1e10"]
+        data = {f"student_{student.id}": value for student, value in zip(students, bad_values)}
+        data.update({f"student_{student.id}": "55,5" for student in students[len(bad_values):]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("assessments:assessment_grade_manage", args=[assessment.id]), data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["errors"]), len(bad_values))
+        self.assertContains(response, "is outside 0–100", count=4)
+        self.assertIn("'abc' is not a number.", response.context["errors"].values())
+        saved = StudentAssessmentResult.objects.filter(assessment=assessment)
+        self.assertEqual(saved.count(), len(students) - len(bad_values))
+        self.assertEqual(set(saved.values_list("raw_score", flat=True)), {Decimal("55.50")})
+
+
+class GradeImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = CustomUser.objects.create_user("lect", password=None, role=CustomUser.Role.LECTURER)
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(
+            program=program, code="CE101", name="Course", year=1, lecturer=cls.lecturer
+        )
+        cls.assessment = Assessment.objects.create(
+            curriculum=cls.curriculum, type=Assessment.AssessmentType.MIDTERM, weight_in_course=100
+        )
+        # Öğrenci numarası = username
+        cls.students = {
+            username: CustomUser.objects.create_user(
+                username,
+                password=None,
+                role=CustomUser.Role.STUDENT,
+                student_faculty=faculty,
+                student_program=program,
+                student_grade=1,
+            )
+            for username in ("2021001", "2021002", "2021003", "2021004", "2021005")
+        }
+        CustomUser.objects.create_user("outsider", password=None, role=CustomUser.Role.STUDENT)
+
+    def csv_upload(self, text, name="grades.csv"):
+        return SimpleUploadedFile(name, text.encode("utf-8"))
+
+    def xlsx_upload(self, rows):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        for row in rows:
+            workbook.active.append(row)
+        content = io.BytesIO()
+        workbook.save(content)
+        return SimpleUploadedFile("grades.xlsx", content.getvalue())
+
+    def import_file(self, upload, assessment=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return import_grades(assessment or self.assessment, read_grade_rows(upload))
+
+    def scores(self, assessment=None):
+        return dict(
+            StudentAssessmentResult.objects.filter(assessment=assessment or self.assessment)
+            .values_list("student__username", "raw_score")
+        )
+
+    def test_csv_semicolon_and_decimal_comma(self):
+        report = self.import_file(self.csv_upload("Student_Number;Score\n2021001;85,5\n2021002;70\n"))
+        self.assertEqual((report.imported, report.errors), (2, []))
+        self.assertEqual(self.scores(), {"2021001": Decimal("85.50"), "2021002": Decimal("70.00")})
+
+    def test_xlsx_numeric_student_numbers_match(self):
+        report = self.import_file(self.xlsx_upload([["student_number", "score"], [2021001, 77.5], [2021002, 90]]))
+        self.assertEqual((report.imported, report.errors), (2, []))
+        self.assertEqual(self.scores(), {"2021001": Decimal("77.50"), "2021002": Decimal("90.00")})
+
+    def test_bad_rows_are_reported_per_line(self):
+        report = self.import_file(
+            self.csv_upload(
+                "username,score\n"
+                "2021001,50\n"
+                "outsider,50\n"
+                "2021001,60\n"
+                "2021002,abc\n"
+                "2021003,101\n"
+                "2021004,\n"
+                ",\n"
+                "2021005,NaN\n"
+            )
+        )
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.skipped, 1)
+        self.assertEqual([line for line, message in report.errors], [3, 4, 5, 6, 9])
+        self.assertIn("not enrolled", report.errors[0][1])
+        self.assertIn("Duplicate", report.errors[1][1])
+        self.assertEqual(self.scores(), {"2021001": Decimal("50.00")})
+
+    def test_unchanged_scores_are_not_rewritten(self):
+        upload = "username,score\n2021001,50\n2021002,60\n"
+        self.import_file(self.csv_upload(upload))
+        report = self.import_file(self.csv_upload(upload.replace("60", "65")))
+        self.assertEqual((report.imported, report.unchanged), (1, 1))
+
+    def test_scores_too_wide_for_the_column_are_rejected(self):
+        assessment = Assessment.objects.create(
+            curriculum=self.curriculum, type=Assessment.AssessmentType.FINAL, weight_in_course=0, max_score=5000
+        )
+        report = self.import_file(
+            self.csv_upload("username,score\n2021001,999.99\n2021002,1500\n"), assessment=assessment
+        )
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.errors, [(3, "Score 1500 is too large to store.")])
+        self.assertEqual(self.scores(assessment), {"2021001": Decimal("999.99")})
+
+    def test_rows_are_upserted_in_chunks(self):
+        text = "username,score\n" + "".join(f"{username},{n}\n" for n, username in enumerate(self.students, 40))
+        with mock.patch.object(grading, "IMPORT_CHUNK_SIZE", 2), mock.patch.object(
+            grading, "upsert_results", wraps=grading.upsert_results
+        ) as upsert:
+            report = self.import_file(self.csv_upload(text))
+        self.assertEqual(report.imported, 5)
+        self.assertEqual([len(call.args[1]) for call in upsert.call_args_list], [2, 2, 1])
+        self.assertEqual(len(self.scores()), 5)
+
+    def test_missing_columns_and_unknown_types_are_refused(self):
+        with self.assertRaisesMessage(GradeImportError, "student column"):
+            self.import_file(self.csv_upload("name,points\n2021001,50\n"))
+        with self.assertRaisesMessage(GradeImportError, "Unsupported file type"):
+            read_grade_rows(self.csv_upload("", name="grades.ods"))
+
+    def test_import_view_shows_the_report(self):
+        self.client.force_login(self.lecturer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("assessments:assessment_grade_import", args=[self.assessment.id]),
+                {"file": self.csv_upload("username,score\n2021001,50\noutsider,10\n")},
+            )
+        self.assertEqual(response.context["report"].imported, 1)
+        self.assertContains(response, "not enrolled")
+
+
+class AssessmentLOMappingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = CustomUser.objects.create_user("lect", password=None, role=CustomUser.Role.LECTURER)
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        curriculum = Curriculum.objects.create(
+            program=program, code="CE101", name="Course", year=1, lecturer=cls.lecturer
+        )
+        cls.los = [
+            LearningOutcome.objects.create(curriculum=curriculum, code=f"LO{i}", short_title="LO") for i in range(3)
+        ]
+        cls.assessment = Assessment.objects.create(
+            curriculum=curriculum, type=Assessment.AssessmentType.MIDTERM, weight_in_course=100
+        )
+
+    def post(self, weights):
+        self.client.force_login(self.lecturer)
+        table = AssessmentLearningOutcome._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse("assessments:assessment_lo_mapping", args=[self.assessment.id]),
+                {f"lo_{lo.id}": weight for lo, weight in zip(self.los, weights)},
+            )
+        return sorted(
+            query["sql"].split()[0]
+            for query in queries
+            if table in query["sql"] and not query["sql"].startswith("SELECT")
+        )
+
+    def weights(self):
+        return dict(self.assessment.lo_mappings.values_list("learning_outcome__code", "weight_in_assessment"))
+
+    def test_only_changed_rows_are_written(self):
+        self.assertEqual(self.post(["50", "50", ""]), ["INSERT"])
+        self.assertEqual(self.post(["50", "50", ""]), [])
+        self.assertEqual(self.post(["", "30", "70"]), ["DELETE", "INSERT", "UPDATE"])
+        self.assertEqual(self.weights(), {"LO1": 30, "LO2": 70})
+
+
+class SingleFlightTests(SimpleTestCase):
+    KEY = "report:test"
+
+    def setUp(self):
+        cache.clear()
+        lock_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(lock_dir.cleanup)
+        settings = override_settings(LOCK_DIR=lock_dir.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.calls = 0
+
+    def compute(self, value="fresh"):
+        def compute():
+            self.calls += 1
+            return value
+        return compute
+
+    def test_fresh_entry_is_served_without_computing(self):
+        singleflight.single_flight(self.KEY, self.compute(), current=1)
+        result = singleflight.single_flight(self.KEY, self.compute("other"), current=1)
+        self.assertEqual((result.value, result.stale, self.calls), ("fresh", False, 1))
+
+    def test_concurrent_callers_compute_once(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            self.calls += 1
+            started.set()
+            release.wait(5)
+            return "fresh"
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(singleflight.single_flight(self.KEY, slow, 1)))
+        second = threading.Thread(target=lambda: results.append(singleflight.single_flight(self.KEY, slow, 1)))
+        first.start()
+        started.wait(5)
+        # İkinci çağrı değer bulamaz ve lock sahibini bekler
+        second.start()
+        time.sleep(0.2)
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([(result.value, result.stale) for result in results], [("fresh", False)] * 2)
+
+    def test_stale_entry_is_served_while_the_lock_is_held(self):
+        singleflight.single_flight(self.KEY, self.compute("old"), current=1)
+        with singleflight.file_lock(self.KEY) as acquired:
+            self.assertTrue(acquired)
+            result = singleflight.single_flight(self.KEY, self.compute("new"), current=2)
+        self.assertEqual((result.value, result.stale, self.calls), ("old", True, 1))
+
+        # Lock bırakılınca ilk istek yeniden hesaplar
+        result = singleflight.single_flight(self.KEY, self.compute("new"), current=2)
+        self.assertEqual((result.value, result.stale, self.calls), ("new", False, 2))
+
+    def test_waiter_recomputes_after_the_lock_timeout(self):
+        with mock.patch.object(singleflight, "WAIT_TIMEOUT", 0.1):
+            with singleflight.file_lock(self.KEY):
+                result = singleflight.single_flight(self.KEY, self.compute(), current=1)
+        self.assertEqual((result.value, result.stale, self.calls), ("fresh", False, 1))
+
+    def test_process_lock_fallback_without_fcntl(self):
+        with mock.patch.object(singleflight, "fcntl", None):
+            with singleflight.file_lock(self.KEY) as held:
+                with singleflight.file_lock(self.KEY, blocking=False) as second:
+                    self.assertEqual((held, second), (True, False))
+            with singleflight.file_lock(self.KEY, blocking=False) as again:
+                self.assertTrue(again)
@@ -0,0 +1,70 @@
+"""
+The assessment → LO → PO tree of a curriculum.
+
+The tree is the same for every student of the course, so it is built once
+and cached as plain dicts under the program's cache version (outcomes.cache):
+any assessment, outcome or mapping edit of the program bumps the version.
+The LO / PO part comes from the cached program tree, so a rebuild only
+reads the assessments and their LO weights. The only per-student work left
+is reading their own result rows.
+"""
+from outcomes.cache import cached_for_program, program_tree
+from .models import Assessment, AssessmentLearningOutcome
+
+
+def _build_tree(curriculum):
+    outcomes = program_tree(curriculum.program_id)
+    po_descriptions = {po["id"]: po["description"] for po in outcomes["program_outcomes"]}
+    los = {lo["id"]: lo for lo in outcomes["curricula"].get(curriculum.id, [])}
+    lo_order = {lo_id: position for position, lo_id in enumerate(los)}
+
+    lo_rows_by_assessment = {}
+    for assessment_id, lo_id, weight in AssessmentLearningOutcome.objects.filter(
+        assessment__curriculum_id=curriculum.id
+    ).values_list("assessment_id", "learning_outcome_id", "weight_in_assessment"):
+        lo = los.get(lo_id)
+        if lo is None:
+            # Başka bir dersin LO'suna bağlanmış mapping (admin'den seçilebiliyor); attainment de saymıyor
+            continue
+        lo_rows_by_assessment.setdefault(assessment_id, []).append(
+            {
+                "lo": {"id": lo["id"], "code": lo["code"], "description": lo["description"]},
+                "weight_in_assessment": weight,
+                "po_rows": [
+                    {
+                        "po": {"id": po["id"], "code": po["code"], "description": po_descriptions[po["id"]]},
+                        "weight": po["weight"],
+                    }
+                    for po in lo["program_outcomes"]
+                ],
+            }
+        )
+    for lo_rows in lo_rows_by_assessment.values():
+        lo_rows.sort(key=lambda row: lo_order[row["lo"]["id"]])
+
+    return [
+        {
+            "assessment": {
+                "id": a.id,
+                "type": a.type,
+                "type_display": a.get_type_display(),
+                "date": a.date,
+                "weight_in_course": a.weight_in_course,
+                "max_score": a.max_score,
+            },
+            "lo_rows": lo_rows_by_assessment.get(a.id, []),
+        }
+        for a in Assessment.objects.filter(curriculum_id=curriculum.id).order_by("date", "type")
+    ]
+
+
+def assessment_tree(curriculum):
+    """
+    [{"assessment": {...}, "lo_rows": [{"lo", "weight_in_assessment", "po_rows"}]}]
+    ordered by assessment date; read from the cache when possible.
+    """
+    return cached_for_program(
+        curriculum.program_id,
+        f"assessment_tree:{curriculum.id}",
+        lambda: _build_tree(curriculum),
+    )
@@ -29,5 +29,32 @@ urlpatterns = [
 		views.assessment_grade_manage,
 		name="assessment_grade_manage",
 	),
+	path(
+		"<int:pk>/grades/import/",
+		views.assessment_grade_import,
+		name="assessment_grade_import",
+	),
+    path(
+        "program/<int:program_id>/report/",
+        views.program_attainment_report,
+        name="program_attainment_report",
+    ),
+    path(
+        "curriculum/<int:curriculum_id>/report/",
+        views.curriculum_attainment_report,
+        name="curriculum_attainment_report",
+    ),
 
 ]
+
+# Bir request'in en fazla kaç sorgu çalıştırabileceği (config.query_budget)
+QUERY_BUDGETS = {
+    "assessment_manage": 7,
+    "assessment_edit": 6,
+    "assessment_delete": 6,
+    "assessment_lo_mapping": 8,
+    "assessment_grade_manage": 8,
+    "assessment_grade_import": 6,
+    "program_attainment_report": 14,
+    "curriculum_attainment_report": 13,
+}
@@ -1,13 +1,22 @@
-from decimal import Decimal, InvalidOperation
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.core.exceptions import PermissionDenied
+from django.db import transaction
 from django.forms import modelform_factory
 
 from accounts.decorators import role_required
 from accounts.models import CustomUser
+from config.transactions import on_commit_once
+from jobs.registry import enqueue
 from curriculum.models import Curriculum
+from curriculum.permissions import check_curriculum_permission_for_lecturer
+from organizations.models import Program
+from organizations.permissions import check_program_permission_for_faculty_member
+from outcomes.cache import bump_program_version
 from outcomes.models import LearningOutcome
+from .attainment import refresh_curriculum_attainment
+from .forms import GradeImportForm
+from . import reports
+from .grading import GradeImportError, clean_score, import_grades, read_grade_rows, upsert_results
 from .models import (
     Assessment,
     AssessmentLearningOutcome,
@@ -15,26 +24,6 @@ from .models import (
 )
 
 
-def _check_curriculum_permission_for_lecturer(user: CustomUser, curriculum: Curriculum):
-    """
-    Lecturers should only be able to manage assessments for the curricula assigned to them. 
-    Administrators can manage everything.
-
-    """
-    if user.is_admin:
-        return
-
-    # Ana lecturer FK kontrolü
-    if getattr(curriculum, "lecturer_id", None) == user.id:
-        return
-
-    # Eğer M2M 'lecturers' alanı varsa, onu da kontrol et
-    if hasattr(curriculum, "lecturers") and curriculum.lecturers.filter(id=user.id).exists():
-        return
-
-    raise PermissionDenied("You are not allowed to manage assessments for this curriculum.")
-
-
 @role_required(CustomUser.Role.LECTURER)
 def assessment_manage(request, curriculum_id):
     """
@@ -45,9 +34,9 @@ def assessment_manage(request, curriculum_id):
         Curriculum.objects.select_related("program"),
         id=curriculum_id,
     )
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
-    assessments = curriculum.assessments.all().order_by("date", "name")
+    assessments = curriculum.assessments.all().order_by("date", "type")
 
     AssessmentForm = modelform_factory(
         Assessment,
@@ -79,7 +68,7 @@ def assessment_edit(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     AssessmentForm = modelform_factory(
         Assessment,
@@ -109,7 +98,7 @@ def assessment_delete(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     if request.method == "POST":
         assessment.delete()
@@ -134,7 +123,7 @@ def assessment_lo_mapping(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     los = LearningOutcome.objects.filter(
         curriculum=curriculum
@@ -146,15 +135,16 @@ def assessment_lo_mapping(request, pk):
     }
 
     if request.method == "POST":
+        to_create, to_update, to_delete = [], [], []
         for lo in los:
             field_name = f"lo_{lo.id}"
             raw_value = request.POST.get(field_name, "").strip()
+            mapping = existing.get(lo.id)
 
             # Boş ise → mapping sil
             if raw_value == "":
-                mapping = existing.get(lo.id)
                 if mapping:
-                    mapping.delete()
+                    to_delete.append(mapping.id)
                 continue
 
             try:
@@ -163,24 +153,40 @@ def assessment_lo_mapping(request, pk):
                 continue  # invalid input'u ignore
 
             if weight <= 0:
-                mapping = existing.get(lo.id)
                 if mapping:
-                    mapping.delete()
+                    to_delete.append(mapping.id)
                 continue
 
             if weight > 100:
                 weight = 100
 
-            mapping = existing.get(lo.id)
-            if mapping:
+            if mapping is None:
+                to_create.append(
+                    AssessmentLearningOutcome(
+                        assessment=assessment,
+                        learning_outcome=lo,
+                        weight_in_assessment=weight,
+                    )
+                )
+            elif mapping.weight_in_assessment != weight:
                 mapping.weight_in_assessment = weight
-                mapping.save()
-            else:
-                AssessmentLearningOutcome.objects.create(
-                    assessment=assessment,
-                    learning_outcome=lo,
-                    weight_in_assessment=weight,
+                to_update.append(mapping)
+
+        # Tüm fark tek transaction'da: 1 delete + 1 bulk_create + 1 bulk_update
+        with transaction.atomic():
+            if to_delete:
+                AssessmentLearningOutcome.objects.filter(id__in=to_delete).delete()
+            if to_create:
+                AssessmentLearningOutcome.objects.bulk_create(to_create)
+            if to_update:
+                AssessmentLearningOutcome.objects.bulk_update(to_update, ["weight_in_assessment"])
+            if to_create or to_update:
+                # bulk işlemler sinyal tetiklemez; silmeler aynı key ile zaten kuyrukta
+                on_commit_once(
+                    ("assessment", assessment.id),
+                    lambda: refresh_curriculum_attainment(curriculum.id, curriculum.program_id),
                 )
+                bump_program_version(curriculum.program_id)
 
         return redirect("assessments:assessment_manage", curriculum_id=curriculum.id)
 
@@ -214,49 +220,58 @@ def assessment_grade_manage(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     # Bu dersin öğrencileri
-    students = curriculum.students.all().order_by("last_name", "first_name", "username")
+    students = list(
+        curriculum.students.all().order_by("last_name", "first_name", "username")
+    )
 
     # Mevcut sonuçları çek
     existing_results = StudentAssessmentResult.objects.filter(
         assessment=assessment,
-        student__in=students,
+        student__in=[s.id for s in students],
     )
     results_by_student = {r.student_id: r for r in existing_results}
 
+    submitted = {}
+    errors = {}
     if request.method == "POST":
+        changed = []
         for student in students:
             field_name = f"student_{student.id}"
             raw_value = request.POST.get(field_name, "").strip()
 
-            # Boş bırakıldıysa → kaydı sil veya dokunma
+            # Boş bırakıldıysa → dokunma
             if raw_value == "":
-                # İstersen burada var olan kaydı silebilirsin:
-                # existing = results_by_student.get(student.id)
-                # if existing:
-                #     existing.delete()
                 continue
 
+            submitted[student.id] = raw_value
             try:
-                score_val = Decimal(raw_value)
-            except (InvalidOperation, ValueError):
-                # Geçersiz giriş → ignore
+                score_val = clean_score(raw_value, assessment.max_score)
+            except ValueError as exc:
+                # Hatalı hücre yazılmaz, formda gösterilir; diğerleri kaydedilir
+                errors[student.id] = str(exc)
+                continue
+
+            # Değişmeyen notu tekrar yazmaya gerek yok
+            existing = results_by_student.get(student.id)
+            if existing is not None and existing.raw_score == score_val:
                 continue
 
-            # update_or_create: aynı öğrenci+assessment için tek kayıt
-            StudentAssessmentResult.objects.update_or_create(
-                student=student,
-                assessment=assessment,
-                defaults={
-                    "raw_score": score_val,      # 🟩 asıl not
-                },
+            changed.append(
+                StudentAssessmentResult(
+                    student=student,
+                    assessment=assessment,
+                    raw_score=score_val,
+                )
             )
 
-        return redirect("assessments:assessment_grade_manage", pk=assessment.id)
+        upsert_results(curriculum, changed)
+        if not errors:
+            return redirect("assessments:assessment_grade_manage", pk=assessment.id)
 
-    # GET: tablo için satırları hazırla
+    # GET (veya hatalı POST): tablo için satırları hazırla
     rows = []
     for student in students:
         result = results_by_student.get(student.id)
@@ -272,7 +287,8 @@ def assessment_grade_manage(request, pk):
             {
                 "student": student,
                 "result": result,
-                "score": score_value,
+                "score": submitted.get(student.id, score_value),
+                "error": errors.get(student.id),
             }
         )
 
@@ -280,5 +296,80 @@ def assessment_grade_manage(request, pk):
         "curriculum": curriculum,
         "assessment": assessment,
         "rows": rows,
+        "errors": errors,
     }
     return render(request, "assessments/assessment_grade_manage.html", context)
+
+
+@role_required(CustomUser.Role.LECTURER)
+def assessment_grade_import(request, pk):
+    """
+    Upload a CSV / XLSX file (student + score columns) for a single assessment.
+    Rows are streamed, matched to the curriculum's students and upserted in
+    batches; invalid rows are listed in the report.
+    """
+    assessment = get_object_or_404(
+        Assessment.objects.select_related("curriculum", "curriculum__program"),
+        pk=pk,
+    )
+    curriculum = assessment.curriculum
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
+
+    report = None
+    if request.method == "POST":
+        form = GradeImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                report = import_grades(assessment, read_grade_rows(form.cleaned_data["file"]))
+            except GradeImportError as exc:
+                form.add_error("file", str(exc))
+    else:
+        form = GradeImportForm()
+
+    context = {
+        "curriculum": curriculum,
+        "assessment": assessment,
+        "form": form,
+        "report": report,
+    }
+    return render(request, "assessments/assessment_grade_import.html", context)
+
+
+@role_required(CustomUser.Role.FACULTY_MEMBER)
+def program_attainment_report(request, program_id):
+    """
+    PO attainment summary of a program (average, graded students, % achieved).
+    """
+    program = get_object_or_404(Program.objects.select_related("faculty"), id=program_id)
+    check_program_permission_for_faculty_member(request.user, program)
+
+    if request.method == "POST":
+        # Materialized tabloları baştan kur; uzun sürer → arka plan job'u
+        job = enqueue("assessments.refresh_attainment", {"program_ids": [program.id]}, user=request.user)
+        return redirect("jobs:job_detail", pk=job.pk)
+
+    context = {
+        "program": program,
+        "report": reports.program_attainment_report(program),
+        "threshold": reports.ACHIEVEMENT_THRESHOLD,
+    }
+    return render(request, "assessments/program_attainment_report.html", context)
+
+
+@role_required(CustomUser.Role.LECTURER)
+def curriculum_attainment_report(request, curriculum_id):
+    """
+    LO attainment summary of a curriculum.
+    """
+    curriculum = get_object_or_404(
+        Curriculum.objects.select_related("program"),
+        id=curriculum_id,
+    )
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
+
+    context = {
+        "curriculum": curriculum,
+        "report": reports.curriculum_attainment_report(curriculum),
+        "threshold": reports.ACHIEVEMENT_THRESHOLD,
+    }
+    return render(request, "assessments/curriculum_attainment_report.html", context)
@@ -0,0 +1,149 @@
+"""
+Concurrent read/write throughput of SQLite, default vs. tuned settings.
+
+Writers mimic the grade grid (one transaction that reads the existing
+scores, then upserts a course's worth of StudentAssessmentResult-like rows);
+readers mimic dashboards (an aggregate over the same table). Both use
+Django's default SQLite connection settings ("before") and the ones from
+config.settings.SQLITE_PRAGMAS + IMMEDIATE transactions ("after").
+
+    python benchmarks/sqlite_concurrency.py [--writers 8] [--readers 8] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+from config.settings import SQLITE_PRAGMAS  # noqa: E402
+
+STUDENTS = 2000
+ASSESSMENTS = 200
+CLASS_SIZE = 60
+
+PROFILES = {
+    # Django varsayılanları: rollback journal, DEFERRED BEGIN, 5 sn timeout
+    "before": {"pragmas": "", "begin": "BEGIN", "timeout": 5},
+    "after": {"pragmas": SQLITE_PRAGMAS, "begin": "BEGIN IMMEDIATE", "timeout": 20},
+}
+
+
+def connect(path, profile):
+    conn = sqlite3.connect(path, timeout=profile["timeout"], isolation_level=None, check_same_thread=False)
+    if profile["pragmas"]:
+        conn.executescript(profile["pragmas"])
+    return conn
+
+
+def setup(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(
+        """
+        CREATE TABLE result (
+            id INTEGER PRIMARY KEY,
+            assessment_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL,
+            raw_score REAL,
+            UNIQUE (assessment_id, student_id)
+        );
+        CREATE INDEX result_student ON result (student_id, assessment_id);
+        """
+    )
+    rows = [
+        (a, s, random.uniform(0, 100))
+        for a in range(ASSESSMENTS)
+        for s in random.sample(range(STUDENTS), CLASS_SIZE)
+    ]
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT OR IGNORE INTO result (assessment_id, student_id, raw_score) VALUES (?, ?, ?)", rows
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def writer(conn, profile, stop, stats):
+    while not stop.is_set():
+        assessment_id = random.randrange(ASSESSMENTS)
+        students = random.sample(range(STUDENTS), CLASS_SIZE)
+        try:
+            conn.execute(profile["begin"])
+            # önce mevcut notlar okunur (diff), sonra yazılır: DEFERRED'da lock yükseltmesi
+            conn.execute("SELECT student_id, raw_score FROM result WHERE assessment_id = ?", (assessment_id,)).fetchall()
+            conn.executemany(
+                "INSERT INTO result (assessment_id, student_id, raw_score) VALUES (?, ?, ?) "
+                "ON CONFLICT (assessment_id, student_id) DO UPDATE SET raw_score = excluded.raw_score",
+                [(assessment_id, s, random.uniform(0, 100)) for s in students],
+            )
+            conn.execute("COMMIT")
+            stats["writes"] += 1
+        except sqlite3.OperationalError:
+            stats["errors"] += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+
+def reader(conn, profile, stop, stats):
+    while not stop.is_set():
+        student_id = random.randrange(STUDENTS)
+        try:
+            conn.execute(
+                "SELECT assessment_id, SUM(raw_score) FROM result "
+                "WHERE student_id = ? GROUP BY assessment_id",
+                (student_id,),
+            ).fetchall()
+            conn.execute("SELECT AVG(raw_score), COUNT(*) FROM result").fetchone()
+            stats["reads"] += 1
+        except sqlite3.OperationalError:
+            stats["errors"] += 1
+
+
+def run(name, writers, readers, seconds):
+    profile = PROFILES[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        setup(path)
+
+        stop = threading.Event()
+        stats = {"writes": 0, "reads": 0, "errors": 0}
+        threads = [
+            threading.Thread(target=target, args=(connect(path, profile), profile, stop, stats))
+            for target in [writer] * writers + [reader] * readers
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:>6}: {stats['writes'] / elapsed:8.1f} writes/s"
+        f"  {stats['reads'] / elapsed:9.1f} reads/s"
+        f"  {stats['errors']:5d} 'database is locked' errors"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:g}s each")
+    for name in PROFILES:
+        run(name, args.writers, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
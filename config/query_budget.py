@@ -0,0 +1,70 @@
+"""
+Per-URL query budgets.
+
+Every app's urls.py declares QUERY_BUDGETS = {url_name: max_queries} for
+its named URLs. QueryBudgetMixin requests a URL through the test client and
+fails when QueryStatsMiddleware counted more queries than the budget, so an
+N+1 regression fails the test suite instead of showing up in production.
+The budgets are for a cold cache and include the session / user lookups.
+"""
+from types import ModuleType
+
+from django.core.cache import cache
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+
+def _app_urlconfs():
+    # admin.site.urls bir modül değil (pattern listesi), atlanır
+    for pattern in get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver) and isinstance(pattern.urlconf_module, ModuleType):
+            yield pattern.namespace, pattern.urlconf_module
+
+
+def url_names():
+    """
+    Set of "namespace:name" of every named URL of the project's apps.
+    """
+    return {
+        f"{namespace}:{pattern.name}"
+        for namespace, module in _app_urlconfs()
+        for pattern in module.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name
+    }
+
+
+def query_budgets():
+    """
+    {"namespace:name": max_queries} collected from the apps' QUERY_BUDGETS.
+    """
+    return {
+        f"{namespace}:{name}": budget
+        for namespace, module in _app_urlconfs()
+        for name, budget in getattr(module, "QUERY_BUDGETS", {}).items()
+    }
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin; assertWithinBudget("app:name", pk) → response.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Bütçeler soğuk cache için; önceki testlerin cache'i sayıları düşürmesin
+        cache.clear()
+
+    def assertWithinBudget(self, url_name, *args, method="get", data=None, **kwargs):
+        budget = query_budgets().get(url_name)
+        if budget is None:
+            self.fail(f"{url_name} has no entry in its app's QUERY_BUDGETS.")
+
+        url = reverse(url_name, args=args, kwargs=kwargs)
+        response = getattr(self.client, method)(url, data or {})
+        stats = response.wsgi_request.query_stats
+        if stats.count > budget:
+            duplicates = "\n".join(f"  {times}x {sql}" for sql, times in stats.duplicates())
+            self.fail(
+                f"{method.upper()} {url} ran {stats.count} queries, budget is {budget}."
+                + (f"\nRepeated queries:\n{duplicates}" if duplicates else "")
+            )
+        return response
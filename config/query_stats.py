@@ -0,0 +1,106 @@
+"""
+Per-request database query instrumentation.
+
+QueryStatsMiddleware wraps every query of a request (connection.execute_wrapper)
+and records the query count, total DB time and repeated query fingerprints,
+the usual sign of an N+1 loop. The numbers are:
+- logged as one JSON line per request on the "loms.queries" logger
+  (WARNING when over QUERY_COUNT_WARNING or when a query shape repeats
+  QUERY_DUPLICATE_WARNING times, DEBUG otherwise)
+- returned in X-Query-* response headers for staff / admin users.
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("loms.queries")
+
+# IN (%s, %s, ...) listeleri uzunluğundan bağımsız aynı sorgu sayılsın
+IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(sql):
+    """
+    Query shape without literals, so repeated lookups differing only in
+    their parameters share a fingerprint.
+    """
+    sql = IN_LIST_RE.sub("IN (...)", sql)
+    return LITERAL_RE.sub("?", sql)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self, minimum=2):
+        """
+        [(fingerprint, times)] of the query shapes run at least `minimum` times.
+        """
+        return [(sql, times) for sql, times in self.fingerprints.most_common() if times >= minimum]
+
+    @property
+    def duration_ms(self):
+        return round(self.duration * 1000, 2)
+
+
+def _is_staff(user):
+    return bool(user and user.is_authenticated and (user.is_staff or getattr(user, "is_admin", False)))
+
+
+class QueryStatsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.count_warning = getattr(settings, "QUERY_COUNT_WARNING", 50)
+        self.duplicate_warning = getattr(settings, "QUERY_DUPLICATE_WARNING", 5)
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        request.query_stats = stats
+
+        duplicates = stats.duplicates()
+        worst = duplicates[0][1] if duplicates else 0
+
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": stats.count,
+            "db_ms": stats.duration_ms,
+            "duplicates": [{"sql": sql[:200], "times": times} for sql, times in duplicates[:5]],
+        }
+        level = (
+            logging.WARNING
+            if stats.count > self.count_warning or worst >= self.duplicate_warning
+            else logging.DEBUG
+        )
+        logger.log(level, json.dumps(record), extra={"query_stats": record})
+
+        if _is_staff(getattr(request, "user", None)):
+            response["X-Query-Count"] = str(stats.count)
+            response["X-Query-Time-Ms"] = str(stats.duration_ms)
+            response["X-Query-Duplicates"] = str(sum(times - 1 for _sql, times in duplicates))
+        return response
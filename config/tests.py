@@ -0,0 +1,186 @@
+from django.test import TestCase, override_settings
+
+from accounts.models import CustomUser
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from curriculum.models import Curriculum
+from jobs.models import Job
+from organizations.models import Faculty, Program
+from outcomes.models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+from .query_budget import QueryBudgetMixin, query_budgets, url_names
+from .query_stats import fingerprint
+
+
+class QueryBudgetCoverageTests(TestCase):
+    def test_every_url_name_has_a_budget(self):
+        self.assertEqual(url_names() - set(query_budgets()), set())
+
+    def test_no_budget_for_unknown_url_names(self):
+        self.assertEqual(set(query_budgets()) - url_names(), set())
+
+
+class FingerprintTests(TestCase):
+    def test_parameters_and_in_lists_are_collapsed(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE a = 1 AND b IN (%s, %s, %s) AND c = \'x\''),
+            fingerprint('SELECT * FROM t WHERE a = 22 AND b IN (%s) AND c = \'y\''),
+        )
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Every GET page against a small institution: a few rows per relation is
+    enough for an N+1 loop to blow the budget.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty_member = CustomUser.objects.create_user("fm", password="x", role=CustomUser.Role.FACULTY_MEMBER)
+        cls.student_affairs = CustomUser.objects.create_user("sa", password="x", role=CustomUser.Role.STUDENT_AFFAIRS)
+        cls.lecturer = CustomUser.objects.create_user("lect", password="x", role=CustomUser.Role.LECTURER)
+
+        cls.faculty = Faculty.objects.create(name="Engineering", code="ENG", responsible=cls.faculty_member)
+        cls.program = Program.objects.create(name="Computer Engineering", code="CE", faculty=cls.faculty)
+        cls.students = [
+            CustomUser.objects.create_user(
+                f"s{i}",
+                password="x",
+                role=CustomUser.Role.STUDENT,
+                student_faculty=cls.faculty,
+                student_program=cls.program,
+                student_grade=1,
+            )
+            for i in range(5)
+        ]
+        program_outcomes = [
+            ProgramOutcome.objects.create(program=cls.program, code=f"PO{i}", short_title="PO", order=i)
+            for i in range(3)
+        ]
+
+        cls.curricula = []
+        for c in range(3):
+            curriculum = Curriculum.objects.create(
+                program=cls.program, code=f"CE10{c}", name=f"Course {c}", year=1, lecturer=cls.lecturer
+            )
+            cls.curricula.append(curriculum)
+            outcomes = [
+                LearningOutcome.objects.create(curriculum=curriculum, code=f"LO{i}", short_title="LO", order=i)
+                for i in range(3)
+            ]
+            for lo in outcomes:
+                for po in program_outcomes[:2]:
+                    LearningOutcomeProgramOutcome.objects.create(learning_outcome=lo, program_outcome=po, weight=50)
+            for type_, weight in [(Assessment.AssessmentType.MIDTERM, 40), (Assessment.AssessmentType.FINAL, 60)]:
+                assessment = Assessment.objects.create(curriculum=curriculum, type=type_, weight_in_course=weight)
+                for lo in outcomes[:2]:
+                    AssessmentLearningOutcome.objects.create(
+                        assessment=assessment, learning_outcome=lo, weight_in_assessment=50
+                    )
+                for student in cls.students:
+                    StudentAssessmentResult.objects.create(assessment=assessment, student=student, raw_score=70)
+
+        cls.curriculum = cls.curricula[0]
+        cls.assessment = cls.curriculum.assessments.first()
+        cls.learning_outcome = cls.curriculum.learning_outcomes.first()
+        cls.program_outcome = program_outcomes[0]
+        cls.job = Job.objects.create(kind="accounts.import_students", created_by=cls.student_affairs)
+
+    def assertPagesWithinBudget(self, user, pages):
+        self.client.force_login(user)
+        for url_name, *args in pages:
+            with self.subTest(url_name):
+                self.assertWithinBudget(url_name, *args)
+
+    def test_student_affairs_pages(self):
+        self.assertPagesWithinBudget(
+            self.student_affairs,
+            [
+                ("accounts:user_create",),
+                ("accounts:user_import",),
+                ("accounts:user_edit", self.students[0].id),
+                ("accounts:user_delete", self.students[0].id),
+                ("curriculum:curriculum_list",),
+                ("curriculum:curriculum_create",),
+                ("curriculum:curriculum_edit", self.curriculum.id),
+                ("curriculum:curriculum_delete", self.curriculum.id),
+                ("organizations:faculty_program_list",),
+                ("organizations:program_create",),
+                ("organizations:program_edit", self.program.id),
+                ("organizations:program_delete", self.program.id),
+                ("organizations:faculty_edit", self.faculty.id),
+                ("organizations:faculty_delete", self.faculty.id),
+                ("search:search",),
+                ("jobs:job_detail", self.job.id),
+                ("jobs:job_status", self.job.id),
+            ],
+        )
+
+    def test_faculty_member_pages(self):
+        self.assertPagesWithinBudget(
+            self.faculty_member,
+            [
+                ("organizations:faculty_member_dashboard",),
+                ("outcomes:program_outcome_manage", self.program.id),
+                ("outcomes:program_outcome_edit", self.program_outcome.id),
+                ("outcomes:program_outcome_delete", self.program_outcome.id),
+                ("assessments:program_attainment_report", self.program.id),
+            ],
+        )
+
+    def test_lecturer_pages(self):
+        self.assertPagesWithinBudget(
+            self.lecturer,
+            [
+                ("curriculum:lecturer_dashboard",),
+                ("assessments:assessment_manage", self.curriculum.id),
+                ("assessments:assessment_edit", self.assessment.id),
+                ("assessments:assessment_lo_mapping", self.assessment.id),
+                ("assessments:assessment_grade_manage", self.assessment.id),
+                ("assessments:assessment_grade_import", self.assessment.id),
+                ("assessments:curriculum_attainment_report", self.curriculum.id),
+                ("outcomes:learning_outcome_manage", self.curriculum.id),
+                ("outcomes:learning_outcome_edit", self.learning_outcome.id),
+                ("outcomes:learning_outcome_delete", self.learning_outcome.id),
+                ("outcomes:learning_outcome_mapping", self.learning_outcome.id),
+                ("outcomes:learning_outcome_matrix", self.curriculum.id),
+            ],
+        )
+
+    def test_student_pages(self):
+        self.assertPagesWithinBudget(
+            self.students[0],
+            [
+                ("accounts:role_redirect",),
+                ("accounts:student_dashboard",),
+                ("accounts:student_course_detail", self.curriculum.id),
+            ],
+        )
+
+    def test_anonymous_pages(self):
+        self.assertWithinBudget("accounts:login")
+
+
+class QueryStatsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = CustomUser.objects.create_user("lect", password="x", role=CustomUser.Role.LECTURER)
+        cls.staff = CustomUser.objects.create_user(
+            "staff", password="x", role=CustomUser.Role.LECTURER, is_staff=True
+        )
+
+    def test_headers_only_for_staff(self):
+        self.client.force_login(self.lecturer)
+        response = self.client.get("/curriculum/lecturer/")
+        self.assertNotIn("X-Query-Count", response)
+
+        self.client.force_login(self.staff)
+        response = self.client.get("/curriculum/lecturer/")
+        self.assertEqual(response["X-Query-Count"], str(response.wsgi_request.query_stats.count))
+        self.assertIn("X-Query-Time-Ms", response)
+        self.assertIn("X-Query-Duplicates", response)
+
+    @override_settings(QUERY_COUNT_WARNING=0)
+    def test_warning_log_over_count(self):
+        self.client.force_login(self.lecturer)
+        with self.assertLogs("loms.queries", "WARNING") as logs:
+            self.client.get("/curriculum/lecturer/")
+        self.assertIn('"view": "curriculum:lecturer_dashboard"', logs.output[0])
@@ -0,0 +1,29 @@
+"""
+Transaction helpers shared by the apps.
+"""
+from django.db import transaction
+
+
+def on_commit_once(key, func):
+    """
+    Run `func` after the current transaction commits, at most once per key.
+
+    Signals fire once per row: a cascade delete (e.g. removing an assessment)
+    fires post_delete for every result row, and they all collapse into a
+    single callback here. Views doing bulk writes use the same keys as the
+    signals, so the same work is not queued twice.
+    """
+    connection = transaction.get_connection()
+    for _sids, queued, _robust in connection.run_on_commit:
+        if getattr(queued, "on_commit_key", None) == key and not queued.ran:
+            return
+
+    def run():
+        # Çalışmış bir callback listede kalabilir (testlerde captureOnCommitCallbacks);
+        # aynı key için yeni değişiklikleri engellemesin
+        run.ran = True
+        func()
+
+    run.on_commit_key = key
+    run.ran = False
+    transaction.on_commit(run)
@@ -9,6 +9,8 @@ urlpatterns = [
 	path("curriculum/", include("curriculum.urls", namespace="curriculum")),
 	path("outcomes/", include("outcomes.urls", namespace="outcomes")),
 	path("assessments/", include("assessments.urls")),
+	path("search/", include("search.urls", namespace="search")),
+	path("jobs/", include("jobs.urls", namespace="jobs")),
 
     path("", RedirectView.as_view(url="/accounts/login/", permanent=False)),
 ]
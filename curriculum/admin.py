@@ -6,5 +6,6 @@ from .models import Curriculum
 class CurriculumAdmin(admin.ModelAdmin):
     list_display = ("code", "name", "program", "year", "semester", "ects", "credit", "lecturer")
     list_filter = ("program", "year", "semester")
+    list_select_related = ("program", "lecturer")
     search_fields = ("code", "name")
 
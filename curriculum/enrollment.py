@@ -0,0 +1,66 @@
+"""
+Set-based rebuild of the Curriculum.students through table.
+
+Used by bulk operations (year-end promotion, student import) that update
+many students at once with queryset.update()/bulk_create() and therefore
+bypass the per-instance enrollment sync in accounts.signals.
+"""
+from itertools import islice
+
+from django.db.models import F
+
+from accounts.models import CustomUser
+from .models import Curriculum
+
+ENROLLMENT_BATCH_SIZE = 1000
+
+
+def rebuild_enrollments(program_ids):
+    """
+    Make Curriculum.students of every curriculum in `program_ids` match
+    role=STUDENT + student_program + student_grade == year.
+
+    One DELETE for the rows that no longer match, then the expected
+    (curriculum, student) pairs come from a single join and are inserted
+    in batches with ON CONFLICT DO NOTHING. Returns (removed, added).
+    """
+    program_ids = list(program_ids)
+    Enrollment = Curriculum.students.through
+
+    removed, _ = (
+        Enrollment.objects.filter(curriculum__program_id__in=program_ids)
+        .exclude(
+            curriculum__year__isnull=False,
+            customuser__role=CustomUser.Role.STUDENT,
+            customuser__student_program_id=F("curriculum__program_id"),
+            customuser__student_grade=F("curriculum__year"),
+        )
+        .delete()
+    )
+
+    existing = Enrollment.objects.filter(curriculum__program_id__in=program_ids).count()
+
+    pairs = (
+        Curriculum.objects.filter(
+            program_id__in=program_ids,
+            year__isnull=False,
+            program__students__role=CustomUser.Role.STUDENT,
+            program__students__student_grade=F("year"),
+        )
+        .values_list("id", "program__students__id")
+        .iterator(chunk_size=ENROLLMENT_BATCH_SIZE)
+    )
+    while True:
+        batch = list(islice(pairs, ENROLLMENT_BATCH_SIZE))
+        if not batch:
+            break
+        Enrollment.objects.bulk_create(
+            [
+                Enrollment(curriculum_id=curriculum_id, customuser_id=student_id)
+                for curriculum_id, student_id in batch
+            ],
+            ignore_conflicts=True,
+        )
+
+    added = Enrollment.objects.filter(curriculum__program_id__in=program_ids).count() - existing
+    return removed, added
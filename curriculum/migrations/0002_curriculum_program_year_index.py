@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0001_initial'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='curriculum',
+            index=models.Index(fields=['program', 'year', 'semester', 'code'], name='curriculum_program_year_idx'),
+        ),
+    ]
@@ -1,8 +1,100 @@
 from django.db import models
+from django.db.models import DEFERRED, Avg, Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
 from django.conf import settings
 from organizations.models import Program
 
 
+def _scalar_subquery(queryset, aggregate, output_field=None, default=0):
+    """
+    Single aggregated value of a correlated queryset, for use in annotate().
+    """
+    # GROUP BY'sız tek satır: order_by() varsayılan ordering'i kaldırır
+    subquery = Subquery(
+        queryset.order_by()
+        .annotate(group=Value(1))
+        .values("group")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+    if default is None:
+        return subquery
+    return Coalesce(subquery, default, output_field=output_field or models.IntegerField())
+
+
+class CurriculumQuerySet(models.QuerySet):
+    def for_lecturer(self, user):
+        """
+        Curricula the user may manage as a lecturer (everything for admins).
+        Uses the cached ID set from curriculum.permissions.
+        """
+        if user.is_admin:
+            return self
+        from .permissions import lecturer_curriculum_ids  # local import, circular'ı önler
+
+        return self.filter(id__in=lecturer_curriculum_ids(user))
+
+    def with_student_count(self):
+        """
+        Annotate each curriculum with student_count, its enrolled students.
+        """
+        enrollments = Curriculum.students.through.objects.filter(curriculum_id=OuterRef("pk"))
+        return self.annotate(student_count=_scalar_subquery(enrollments, Count("*")))
+
+    def with_grading_stats(self):
+        """
+        Annotate each curriculum with its grading progress, as correlated
+        subqueries of a single SELECT:
+        - student_count: enrolled students
+        - assessment_count, weight_total: assessments and sum of weight_in_course
+        - graded_count: filled result cells of enrolled students
+        """
+        from assessments.models import Assessment, StudentAssessmentResult
+
+        assessments = Assessment.objects.filter(curriculum_id=OuterRef("pk"))
+        results = StudentAssessmentResult.objects.filter(
+            assessment__curriculum_id=OuterRef("pk"),
+            student__enrolled_curricula=OuterRef("pk"),
+            raw_score__isnull=False,
+        )
+        return self.with_student_count().annotate(
+            assessment_count=_scalar_subquery(assessments, Count("*")),
+            weight_total=_scalar_subquery(assessments, Sum("weight_in_course")),
+            graded_count=_scalar_subquery(results, Count("*")),
+        )
+
+    def with_student_standing(self, student):
+        """
+        Annotate each curriculum with the student's standing, in the same SELECT:
+        - weighted_score: running sum of raw_score / max_score * weight_in_course
+        - graded_weight: weight_in_course of the assessments graded so far
+        - lo_average, lo_count: from the materialized StudentLOAttainment rows
+        """
+        from assessments.models import StudentAssessmentResult, StudentLOAttainment
+
+        results = StudentAssessmentResult.objects.filter(
+            assessment__curriculum_id=OuterRef("pk"),
+            student=student,
+            raw_score__isnull=False,
+            assessment__max_score__gt=0,
+        )
+        attainments = StudentLOAttainment.objects.filter(
+            learning_outcome__curriculum_id=OuterRef("pk"),
+            student=student,
+        )
+        contribution = (
+            Cast("raw_score", models.FloatField())
+            * F("assessment__weight_in_course")
+            / F("assessment__max_score")
+        )
+        return self.annotate(
+            weighted_score=_scalar_subquery(results, Sum(contribution), default=None),
+            graded_weight=_scalar_subquery(results, Sum("assessment__weight_in_course")),
+            lo_average=_scalar_subquery(attainments, Avg("attainment"), default=None),
+            lo_count=_scalar_subquery(attainments, Count("*")),
+        )
+
+
 class Curriculum(models.Model):
     class Year(models.IntegerChoices):
         YEAR_1 = 1, "1st Year"
@@ -74,28 +166,103 @@ class Curriculum(models.Model):
         help_text="Students enrolled in this course (automatically assigned).",
     )
 
+    objects = CurriculumQuerySet.as_manager()
+
     class Meta:
         unique_together = ("program", "code")
         ordering = ["program", "year", "semester", "code"]
+        indexes = [
+            # Öğrenci dashboard'u: program + year filtresi, semester/code sıralaması index'ten gelir
+            models.Index(fields=["program", "year", "semester", "code"], name="curriculum_program_year_idx"),
+        ]
 
     def __str__(self):
         return f"{self.code} - {self.name} ({self.program.code})"
 
+    # with_grading_stats() annotation'larını kullanır
+    @property
+    def graded_percent(self):
+        cells = self.student_count * self.assessment_count
+        if not cells:
+            return None
+        return self.graded_count * 100 / cells
+
+    @property
+    def weights_valid(self):
+        return self.weight_total == 100
+
+    # Enrollment bu alanlara bağlı; değişmedikçe tekrar senkronlanmaz
+    ENROLLMENT_FIELDS = ("program_id", "year")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_enrollment_key = instance._enrollment_key()
+        instance._loaded_lecturer_id = instance.__dict__.get("lecturer_id", DEFERRED)
+        return instance
+
+    def _enrollment_key(self):
+        # __dict__: deferred alanlar için ekstra query atılmasın
+        return tuple(self.__dict__.get(field, DEFERRED) for field in self.ENROLLMENT_FIELDS)
+
+    def enrollment_changed(self):
+        """
+        True for new curricula and when program or year differ from the
+        values loaded from the database.
+        """
+        return getattr(self, "_loaded_enrollment_key", None) != self._enrollment_key()
+
+    def lecturer_changed(self):
+        """
+        True for new curricula and when the main lecturer may differ from the
+        one loaded from the database (deferred values count as changed).
+        """
+        loaded = getattr(self, "_loaded_lecturer_id", DEFERRED)
+        return loaded is DEFERRED or loaded != self.__dict__.get("lecturer_id", DEFERRED)
+
     def save(self, *args, **kwargs):
         """
         When the course program and year are determined:
         - all students enrolled in that program 
         - all students in that grade are automatically added to that course.
+        Enrollment is only re-synced when program or year actually changed.
         """
+        sync_needed = self.enrollment_changed()
         super().save(*args, **kwargs)
+        # post_save sinyalleri eski değerleri gördü; artık kaydedilen değerler esas
+        self._loaded_lecturer_id = self.__dict__.get("lecturer_id", DEFERRED)
+
+        if sync_needed:
+            self.sync_enrollments()
+            self._loaded_enrollment_key = self._enrollment_key()
+
+    def sync_enrollments(self):
+        """
+        Bring the students through table in line with program + year using
+        set-based statements: one DELETE for students who no longer match
+        and one INSERT for the missing ones. Existing rows are never loaded.
+        """
+        from accounts.models import CustomUser  # local import, circular'ı önler
+
+        Enrollment = Curriculum.students.through
+
+        if not (self.year and self.program_id):
+            Enrollment.objects.filter(curriculum_id=self.id).delete()
+            return
+
+        expected = CustomUser.objects.filter(
+            role=CustomUser.Role.STUDENT,
+            student_grade=self.year,
+            student_program_id=self.program_id,
+        )
 
-        # year ve program tanımlıysa → auto-enroll
-        if self.year and self.program_id:
-            from accounts.models import CustomUser  # local import, circular'ı önler
+        Enrollment.objects.filter(curriculum_id=self.id).exclude(
+            customuser_id__in=expected.values("id"),
+        ).delete()
 
-            qs = CustomUser.objects.filter(
-                role=CustomUser.Role.STUDENT,
-                student_grade=self.year,
-                student_program=self.program,
-            )
-            self.students.set(qs)
+        missing = expected.exclude(enrolled_curricula=self).values_list("id", flat=True)
+        Enrollment.objects.bulk_create(
+            [Enrollment(curriculum_id=self.id, customuser_id=user_id) for user_id in missing],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
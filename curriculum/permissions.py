@@ -0,0 +1,79 @@
+"""
+Which curricula may a lecturer manage?
+
+A lecturer is authorized for a curriculum when they are its main `lecturer`
+or it is in their `lecturer_curricula`. The authorized ID set is computed
+with one query, memoized on the user object for the rest of the request and
+cached across requests; assignment changes bump a version key
+(see curriculum.signals) so stale sets are never served.
+"""
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Q
+
+VERSION_KEY = "lecturer_curricula:version"
+CACHE_TIMEOUT = 60 * 60
+
+
+def _new_version():
+    # 1 yerine zaman: version key cache'ten düşerse eski set'ler geri dönmesin
+    return int(time.time() * 1000)
+
+
+def _cache_key(user_id):
+    version = cache.get_or_set(VERSION_KEY, _new_version, None)
+    return f"lecturer_curricula:{version}:{user_id}"
+
+
+def invalidate_lecturer_curricula():
+    """
+    Forget every cached lecturer → curricula set once the current
+    transaction commits, so a concurrent request cannot re-cache the
+    pre-commit assignments under the new version.
+    """
+
+    def bump():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, _new_version(), None)
+
+    transaction.on_commit(bump)
+
+
+def lecturer_curriculum_ids(user):
+    """
+    frozenset of curriculum IDs the user may manage as a lecturer.
+    """
+    memo = getattr(user, "_lecturer_curriculum_ids", None)
+    if memo is not None:
+        return memo
+
+    from .models import Curriculum  # local import, circular'ı önler
+
+    key = _cache_key(user.id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(
+            Curriculum.objects.filter(Q(lecturer_id=user.id) | Q(lecturers__id=user.id))
+            .values_list("id", flat=True)
+            .distinct()
+        )
+        cache.set(key, ids, CACHE_TIMEOUT)
+
+    user._lecturer_curriculum_ids = ids
+    return ids
+
+
+def check_curriculum_permission_for_lecturer(user, curriculum):
+    """
+    Lecturers may only manage the curricula assigned to them.
+    Administrators can manage everything.
+    """
+    if user.is_admin:
+        return
+    if curriculum.id not in lecturer_curriculum_ids(user):
+        raise PermissionDenied("You are not allowed to manage this curriculum.")
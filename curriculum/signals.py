@@ -0,0 +1,39 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import CustomUser
+from outcomes.cache import bump_program_version
+from .models import Curriculum
+from .permissions import invalidate_lecturer_curricula
+
+
+@receiver(post_save, sender=Curriculum)
+@receiver(post_delete, sender=Curriculum)
+def curriculum_lecturer_changed(sender, instance: Curriculum, signal, **kwargs):
+    """
+    A curriculum was created, deleted or got another main lecturer → cached
+    permission sets are stale. Other edits (e.g. the description) keep them.
+    """
+    if signal is post_delete or instance.lecturer_changed():
+        invalidate_lecturer_curricula()
+
+
+@receiver(post_save, sender=Curriculum)
+@receiver(post_delete, sender=Curriculum)
+def curriculum_changed(sender, instance: Curriculum, **kwargs):
+    """
+    A curriculum moved to another program leaves the old program's cached
+    tree stale as well; post_save runs before save() refreshes
+    _loaded_enrollment_key, so it still holds the loaded program_id.
+    """
+    bump_program_version(instance.program_id)
+
+    loaded_program_id = getattr(instance, "_loaded_enrollment_key", (None,))[0]
+    if isinstance(loaded_program_id, int) and loaded_program_id != instance.program_id:
+        bump_program_version(loaded_program_id)
+
+
+@receiver(m2m_changed, sender=CustomUser.lecturer_curricula.through)
+def lecturer_curricula_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_lecturer_curricula()
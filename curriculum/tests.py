@@ -1,3 +1,296 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import CustomUser
+from organizations.models import Faculty, Program
+from outcomes.cache import program_version
+from .models import Curriculum
+from .permissions import lecturer_curriculum_ids
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+class CurriculumIndexTests(TestCase):
+    def test_student_dashboard_uses_program_year_index(self):
+        plan = (
+            Curriculum.objects.filter(program_id=1, year=2)
+            .order_by("semester", "code")
+            .explain()
+        )
+        self.assertIn("curriculum_program_year_idx", plan)
+        # sıralama da index'ten gelmeli
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_lecturer_lookup_uses_lecturer_index(self):
+        plan = Curriculum.objects.filter(lecturer_id=1).values_list("id", flat=True).explain()
+        self.assertRegex(plan, r"USING (COVERING )?INDEX \S*lecturer_id")
+
+
+class LecturerCurriculaCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = CustomUser.objects.create_user("lect", password=None, role=CustomUser.Role.LECTURER)
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        cls.program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+
+    def setUp(self):
+        cache.clear()
+
+    def cached_ids(self):
+        # Her seferinde yeni user nesnesi: request memo'su değil cache ölçülsün
+        return lecturer_curriculum_ids(CustomUser.objects.get(pk=self.lecturer.pk))
+
+    def test_assignment_invalidates_on_commit(self):
+        self.assertEqual(self.cached_ids(), frozenset())
+        with self.captureOnCommitCallbacks() as callbacks:
+            curriculum = Curriculum.objects.create(
+                program=self.program, code="CE101", name="Course", year=1, lecturer=self.lecturer
+            )
+            # Commit'ten önce eski set servis edilmeye devam eder
+            self.assertEqual(self.cached_ids(), frozenset())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.cached_ids(), frozenset({curriculum.id}))
+
+    def test_version_survives_eviction(self):
+        self.cached_ids()
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            Curriculum.objects.create(program=self.program, code="CE101", name="Course", year=1)
+        self.assertGreater(cache.get("lecturer_curricula:version"), 1)
+
+    def saved_version(self, save):
+        self.cached_ids()
+        before = cache.get("lecturer_curricula:version")
+        with self.captureOnCommitCallbacks(execute=True):
+            save()
+        return before, cache.get("lecturer_curricula:version")
+
+    def test_only_lecturer_changes_invalidate(self):
+        curriculum = Curriculum.objects.create(
+            program=self.program, code="CE101", name="Course", year=1, lecturer=self.lecturer
+        )
+        curriculum = Curriculum.objects.get(pk=curriculum.pk)
+
+        curriculum.description = "Updated"
+        before, after = self.saved_version(curriculum.save)
+        self.assertEqual(before, after)
+
+        curriculum.lecturer = None
+        before, after = self.saved_version(curriculum.save)
+        self.assertNotEqual(before, after)
+        self.assertEqual(self.cached_ids(), frozenset())
+
+        before, after = self.saved_version(curriculum.delete)
+        self.assertNotEqual(before, after)
+
+
+class ProgramVersionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        cls.old_program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        cls.new_program = Program.objects.create(name="Software Engineering", code="SE", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(program=cls.old_program, code="CE101", name="Course", year=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_moving_a_curriculum_bumps_both_programs(self):
+        before = {p.id: program_version(p.id) for p in (self.old_program, self.new_program)}
+        curriculum = Curriculum.objects.get(pk=self.curriculum.pk)
+        curriculum.program = self.new_program
+        with self.captureOnCommitCallbacks(execute=True):
+            curriculum.save()
+        for program_id, version in before.items():
+            self.assertNotEqual(program_version(program_id), version)
+
+
+class EnrollmentSyncTests(TestCase):
+    """
+    Curriculum.save() re-syncs enrollments only when program or year changed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        cls.program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        cls.other_program = Program.objects.create(name="Software Engineering", code="SE", faculty=faculty)
+        cls.students = {
+            (program.code, grade): CustomUser.objects.create_user(
+                f"{program.code}{grade}",
+                password=None,
+                role=CustomUser.Role.STUDENT,
+                student_faculty=faculty,
+                student_program=program,
+                student_grade=grade,
+            )
+            for program in (cls.program, cls.other_program)
+            for grade in (1, 2)
+        }
+        cls.curriculum = Curriculum.objects.create(program=cls.program, code="CE101", name="Course", year=1)
+
+    def enrollment_queries(self, curriculum):
+        table = Curriculum.students.through._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            curriculum.save()
+        return [query["sql"] for query in queries if table in query["sql"]]
+
+    def enrolled(self):
+        return set(self.curriculum.students.values_list("username", flat=True))
+
+    def test_description_only_save_runs_no_enrollment_queries(self):
+        curriculum = Curriculum.objects.get(pk=self.curriculum.pk)
+        curriculum.description = "Updated"
+        self.assertEqual(self.enrollment_queries(curriculum), [])
+
+    def test_deferred_fields_are_not_treated_as_changed(self):
+        curriculum = Curriculum.objects.only("id", "name").get(pk=self.curriculum.pk)
+        curriculum.name = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            curriculum.save(update_fields=["name"])
+        table = Curriculum.students.through._meta.db_table
+        self.assertFalse([query for query in queries if table in query["sql"]])
+
+    def test_year_change_resyncs(self):
+        self.assertEqual(self.enrolled(), {"CE1"})
+        curriculum = Curriculum.objects.get(pk=self.curriculum.pk)
+        curriculum.year = 2
+        self.assertNotEqual(self.enrollment_queries(curriculum), [])
+        self.assertEqual(self.enrolled(), {"CE2"})
+
+    def test_program_change_resyncs(self):
+        curriculum = Curriculum.objects.get(pk=self.curriculum.pk)
+        curriculum.program = self.other_program
+        self.assertNotEqual(self.enrollment_queries(curriculum), [])
+        self.assertEqual(self.enrolled(), {"SE1"})
+
+
+class CurriculumStatsFixture:
+    """
+    CE101: three enrolled students, a midterm (40%, out of 50) and a final
+    (60%, out of 100). CE102: no students, no assessments, no results.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        from assessments.models import Assessment, StudentAssessmentResult
+
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        cls.course = Curriculum.objects.create(program=program, code="CE101", name="Course", year=1)
+        cls.empty = Curriculum.objects.create(program=program, code="CE102", name="Empty", year=3)
+        cls.students = [
+            CustomUser.objects.create_user(
+                f"s{i}",
+                password=None,
+                role=CustomUser.Role.STUDENT,
+                student_faculty=faculty,
+                student_program=program,
+                student_grade=1,
+            )
+            for i in range(1, 4)
+        ]
+        # 2. sınıf: CE101'e kayıtlı değil, notu sayılmamalı
+        outsider = CustomUser.objects.create_user(
+            "outsider",
+            password=None,
+            role=CustomUser.Role.STUDENT,
+            student_faculty=faculty,
+            student_program=program,
+            student_grade=2,
+        )
+        midterm = Assessment.objects.create(
+            curriculum=cls.course, type=Assessment.AssessmentType.MIDTERM, weight_in_course=40, max_score=50
+        )
+        final = Assessment.objects.create(
+            curriculum=cls.course, type=Assessment.AssessmentType.FINAL, weight_in_course=60, max_score=100
+        )
+        s1, s2, s3 = cls.students
+        for student, assessment, raw_score in [
+            (s1, midterm, 40),
+            (s1, final, 80),
+            (s2, midterm, 25),
+            (s3, midterm, None),
+            (outsider, final, 90),
+        ]:
+            StudentAssessmentResult.objects.create(student=student, assessment=assessment, raw_score=raw_score)
+
+
+class GradingStatsTests(CurriculumStatsFixture, TestCase):
+    def stats(self):
+        return {
+            curriculum.code: curriculum
+            for curriculum in Curriculum.objects.with_grading_stats().filter(id__in=[self.course.id, self.empty.id])
+        }
+
+    def test_course_with_students_and_results(self):
+        course = self.stats()["CE101"]
+        self.assertEqual(
+            (course.student_count, course.assessment_count, course.weight_total, course.graded_count),
+            (3, 2, 100, 3),
+        )
+        self.assertEqual(course.graded_percent, 50.0)
+        self.assertTrue(course.weights_valid)
+
+    def test_empty_course_counts_are_zero(self):
+        empty = self.stats()["CE102"]
+        self.assertEqual(
+            (empty.student_count, empty.assessment_count, empty.weight_total, empty.graded_count),
+            (0, 0, 0, 0),
+        )
+        self.assertIsNone(empty.graded_percent)
+        self.assertFalse(empty.weights_valid)
+
+    def test_student_count_alone(self):
+        counts = dict(
+            Curriculum.objects.with_student_count()
+            .filter(id__in=[self.course.id, self.empty.id])
+            .values_list("code", "student_count")
+        )
+        self.assertEqual(counts, {"CE101": 3, "CE102": 0})
+
+
+class StudentStandingTests(CurriculumStatsFixture, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        from assessments.models import StudentLOAttainment
+        from outcomes.models import LearningOutcome
+
+        # Materialized satırlar doğrudan yazılır: burada sadece okuma test ediliyor
+        s1 = cls.students[0]
+        for code, attainment in [("LO1", 70.0), ("LO2", 90.0)]:
+            lo = LearningOutcome.objects.create(curriculum=cls.course, code=code, short_title=code)
+            StudentLOAttainment.objects.create(student=s1, learning_outcome=lo, attainment=attainment)
+
+    def standing(self, student):
+        return {
+            curriculum.code: (
+                curriculum.weighted_score,
+                curriculum.graded_weight,
+                curriculum.lo_average,
+                curriculum.lo_count,
+            )
+            for curriculum in Curriculum.objects.with_student_standing(student).filter(
+                id__in=[self.course.id, self.empty.id]
+            )
+        }
+
+    def test_fully_graded_student(self):
+        # 40/50 × 40 + 80/100 × 60 = 32 + 48
+        standing = self.standing(self.students[0])
+        self.assertEqual(standing["CE101"], (80.0, 100, 80.0, 2))
+
+    def test_partly_graded_student(self):
+        # 25/50 × 40
+        self.assertEqual(self.standing(self.students[1])["CE101"], (20.0, 40, None, 0))
 
-# Create your tests here.
+    def test_empty_scores_and_courses(self):
+        standing = self.standing(self.students[2])
+        # Boş raw_score sayılmaz; ortalamalar None, toplamlar 0
+        self.assertEqual(standing["CE101"], (None, 0, None, 0))
+        self.assertEqual(standing["CE102"], (None, 0, None, 0))
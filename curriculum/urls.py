@@ -16,3 +16,12 @@ urlpatterns = [
 	path("<int:pk>/delete/", curriculum_delete, name="curriculum_delete"),
 	path("lecturer/", lecturer_dashboard, name="lecturer_dashboard"),
 ]
+
+# Bir request'in en fazla kaç sorgu çalıştırabileceği (config.query_budget)
+QUERY_BUDGETS = {
+    "curriculum_list": 5,
+    "curriculum_create": 6,
+    "curriculum_edit": 7,
+    "curriculum_delete": 6,
+    "lecturer_dashboard": 6,
+}
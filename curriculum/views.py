@@ -1,5 +1,4 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q
 from accounts.decorators import role_required
 from accounts.models import CustomUser
 from organizations.models import Program
@@ -12,10 +11,11 @@ def curriculum_list(request):
     program_id = request.GET.get("program")
     if program_id:
         program = get_object_or_404(Program, id=program_id)
-        curricula = Curriculum.objects.filter(program=program).select_related("program")
+        curricula = Curriculum.objects.filter(program=program)
     else:
         program = None
-        curricula = Curriculum.objects.select_related("program").all()
+        curricula = Curriculum.objects.all()
+    curricula = curricula.select_related("program", "lecturer").with_student_count()
 
     context = {
         "curricula": curricula,
@@ -83,16 +83,13 @@ def curriculum_delete(request, pk):
 @role_required(CustomUser.Role.LECTURER)
 def lecturer_dashboard(request):
     """
-    The lecturer should review the curricula for which they are responsible.
-
+    The lecturer should review the curricula for which they are responsible,
+    with the grading progress of each one (single query).
     """
-    user = request.user
     curricula = (
-        Curriculum.objects.filter(
-            Q(lecturer=user) | Q(id__in=user.lecturer_curricula.values("id"))
-        )
+        Curriculum.objects.for_lecturer(request.user)
         .select_related("program")
-        .distinct()
+        .with_grading_stats()
     )
 
     context = {
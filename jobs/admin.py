@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import Job
+from .registry import PRIVATE_PAYLOAD_KINDS
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "progress", "created_by", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    exclude = ("payload",)
+    readonly_fields = ("payload_display", "started_at", "finished_at", "worker")
+
+    @admin.display(description="Payload")
+    def payload_display(self, obj):
+        # Şifre içerebilecek payload'lar admin'de de gösterilmez
+        if obj.kind in PRIVATE_PAYLOAD_KINDS:
+            return "(hidden)"
+        return obj.payload
@@ -0,0 +1,131 @@
+import signal
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+
+from jobs.pool import init_worker_process
+from jobs.registry import claim_next, fail_job, fail_stale, run_job, worker_name
+
+# Ölü worker'lardan kalan RUNNING job'lar bu aralıkla kontrol edilir (saniye)
+STALE_CHECK_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (no broker: jobs are claimed from the database)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=2,
+            help="Jobs run at the same time (default: 2).",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=("thread", "process"),
+            default="thread",
+            help="thread: I/O / DB-bound jobs; process: CPU-bound jobs (default: thread).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the queue is empty (default: 1).",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=settings.JOB_STALE_AFTER,
+            help=(
+                "Fail RUNNING jobs started more than this many seconds ago, "
+                f"their worker died (default: JOB_STALE_AFTER, {settings.JOB_STALE_AFTER})."
+            ),
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when the queue is empty instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        name = worker_name()
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+            self.stdout.write("Stopping after the running jobs finish...")
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f"Worker {name}: {concurrency} {options['pool']}(s)")
+        executor = self.new_executor(options["pool"], concurrency)
+        running = {}  # future → job id
+        last_stale_check = None
+        try:
+            while not stopping:
+                broken = False
+                for future in [future for future in running if future.done()]:
+                    job_id = running.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        # run_job sonucu yazamadan process öldü (ör. OOM kill)
+                        fail_job(job_id, f"The worker running the job failed: {exc!r}")
+                        broken = broken or isinstance(exc, BrokenExecutor)
+                if broken:
+                    executor = self.replace_executor(executor, options["pool"], concurrency)
+
+                if last_stale_check is None or time.monotonic() - last_stale_check >= STALE_CHECK_INTERVAL:
+                    last_stale_check = time.monotonic()
+                    try:
+                        stale = fail_stale(options["stale_after"])
+                    except DatabaseError as exc:
+                        self.stderr.write(f"Could not fail stale jobs: {exc}")
+                    else:
+                        if stale:
+                            self.stderr.write(f"Failed {stale} stale RUNNING job(s).")
+
+                if len(running) >= concurrency:
+                    time.sleep(0.1)
+                    continue
+
+                try:
+                    job = claim_next(name)
+                except DatabaseError as exc:
+                    # ör. SQLite'ta uzun bir yazma işlemi busy timeout'u aştı
+                    self.stderr.write(f"Could not claim a job: {exc}")
+                    time.sleep(options["poll_interval"])
+                    continue
+                if job is None:
+                    if options["once"] and not running:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                self.stdout.write(f"Running {job}")
+                if options["pool"] == "process":
+                    connections.close_all()
+                try:
+                    running[executor.submit(run_job, job.id)] = job.id
+                except BrokenExecutor as exc:
+                    fail_job(job.id, f"The worker pool is broken: {exc!r}")
+                    executor = self.replace_executor(executor, options["pool"], concurrency)
+        finally:
+            executor.shutdown(wait=True)
+
+    def new_executor(self, pool, concurrency):
+        if pool == "process":
+            # Fork edilen process'ler açık bağlantıyı paylaşmasın
+            connections.close_all()
+            return ProcessPoolExecutor(max_workers=concurrency, initializer=init_worker_process)
+        return ThreadPoolExecutor(max_workers=concurrency)
+
+    def replace_executor(self, executor, pool, concurrency):
+        self.stderr.write("Worker pool broke; starting a new one.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        return self.new_executor(pool, concurrency)
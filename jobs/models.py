@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work, claimed and run by `manage.py run_worker`.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        RUNNING = "RUNNING", "Running"
+        SUCCEEDED = "SUCCEEDED", "Succeeded"
+        FAILED = "FAILED", "Failed"
+
+    kind = models.CharField(
+        max_length=100,
+        help_text="Registered task name (see jobs.registry).",
+    )
+    payload = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.QUEUED,
+    )
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Percent (0-100).",
+    )
+    message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    worker = models.CharField(max_length=100, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # Worker'ın kuyruktan sıradaki işi alması
+            models.Index(fields=["status", "created_at"], name="job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
+
+    def set_progress(self, progress, message=""):
+        """
+        Update progress with a single UPDATE, without touching other fields.
+        """
+        self.progress = max(0, min(100, int(progress)))
+        self.message = message[:255]
+        Job.objects.filter(pk=self.pk).update(progress=self.progress, message=self.message)
+
+    def mark_finished(self, status, result=None, error=""):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = timezone.now()
+        if status == self.Status.SUCCEEDED:
+            self.progress = 100
+        self.save(update_fields=["status", "result", "error", "finished_at", "progress"])
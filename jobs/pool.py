@@ -0,0 +1,17 @@
+"""
+Process pool helpers.
+
+This module must not import models: a process started with "spawn" (macOS,
+Windows) unpickles the initializer before Django is set up.
+"""
+
+
+def init_worker_process():
+    """
+    ProcessPoolExecutor initializer that sets Django up in the new process.
+    """
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
@@ -0,0 +1,154 @@
+"""
+Background job registry and runner.
+
+Tasks are plain functions registered under a name:
+
+    @task("curriculum.rebuild_enrollments")
+    def rebuild(job, program_ids):
+        ...
+        job.set_progress(50, "Half way")
+        return {"added": 10}   # JSON-serializable → Job.result
+
+`enqueue()` stores a Job row; `manage.py run_worker` claims queued rows and
+calls `run_job()` in a thread or process pool. No broker: the database is
+the queue. A job whose worker died stays RUNNING; `fail_stale()` fails it
+once it has been running longer than JOB_STALE_AFTER seconds.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger("loms.jobs")
+
+TASKS = {}
+# Payload'ı job bitince silinen türler (ör. düz metin şifreli CSV)
+PRIVATE_PAYLOAD_KINDS = set()
+
+
+def task(name, private_payload=False):
+    """
+    private_payload=True: the payload holds data that must not outlive the
+    job (e.g. plaintext passwords). It is cleared as soon as the job
+    finishes, however it finishes, and JobAdmin never shows it.
+    """
+    def decorator(func):
+        TASKS[name] = func
+        if private_payload:
+            PRIVATE_PAYLOAD_KINDS.add(name)
+        return func
+    return decorator
+
+
+def _clear_private_payloads(jobs):
+    return (
+        jobs.filter(kind__in=PRIVATE_PAYLOAD_KINDS, status__in=(Job.Status.SUCCEEDED, Job.Status.FAILED))
+        .exclude(payload={})
+        .update(payload={})
+    )
+
+
+def enqueue(kind, payload=None, user=None):
+    if kind not in TASKS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return Job.objects.create(kind=kind, payload=payload or {}, created_by=user)
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next(worker):
+    """
+    Atomically move the oldest queued job to RUNNING and return it (or None).
+
+    PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers
+    never block on each other's rows. SQLite has no row locks; there the
+    IMMEDIATE transaction serializes claimers and the conditional UPDATE
+    below is what guarantees a job is claimed once.
+    """
+    with transaction.atomic():
+        queued = Job.objects.filter(status=Job.Status.QUEUED).order_by("created_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        job = queued.first()
+        if job is None:
+            return None
+
+        claimed = Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING,
+            started_at=timezone.now(),
+            worker=worker,
+        )
+        if not claimed:
+            return None
+
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job_id):
+    """
+    Run a claimed job and record its outcome. Called in worker threads /
+    processes, so it opens (and closes) its own database connection.
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.get(pk=job_id)
+        func = TASKS.get(job.kind)
+        if func is None:
+            job.mark_finished(Job.Status.FAILED, error=f"Unknown job kind: {job.kind}")
+            return
+
+        try:
+            result = func(job, **job.payload)
+        except Exception:
+            # Traceback job sayfasında sadece admin'lere gösterilir
+            logger.exception("Job %s (%s) failed", job.pk, job.kind)
+            job.mark_finished(Job.Status.FAILED, error=traceback.format_exc())
+        else:
+            job.mark_finished(Job.Status.SUCCEEDED, result=result)
+        _clear_private_payloads(Job.objects.filter(pk=job.pk))
+    finally:
+        connection.close()
+
+
+def fail_job(job_id, error):
+    """
+    Fail a job that is still RUNNING, e.g. because its worker process died
+    and run_job() never recorded an outcome.
+    """
+    failed = Job.objects.filter(pk=job_id, status=Job.Status.RUNNING).update(
+        status=Job.Status.FAILED,
+        error=error,
+        finished_at=timezone.now(),
+    )
+    _clear_private_payloads(Job.objects.filter(pk=job_id))
+    return failed
+
+
+def fail_stale(stale_after=None):
+    """
+    Fail the RUNNING jobs started more than `stale_after` seconds ago
+    (default: settings.JOB_STALE_AFTER) and return how many there were.
+    """
+    stale_after = settings.JOB_STALE_AFTER if stale_after is None else stale_after
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=stale_after),
+    )
+    stale_ids = list(stale.values_list("id", flat=True))
+    failed = stale.filter(id__in=stale_ids).update(
+        status=Job.Status.FAILED,
+        error=f"No outcome recorded within {stale_after} seconds; the worker probably died.",
+        finished_at=timezone.now(),
+    )
+    _clear_private_payloads(Job.objects.filter(id__in=stale_ids))
+    return failed
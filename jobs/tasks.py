@@ -0,0 +1,65 @@
+"""
+Heavy operations that can run in the background (see jobs.registry).
+"""
+import io
+
+from accounts.bulk_import import StudentImportError, import_students, read_student_rows
+from assessments.attainment import refresh_curriculum_attainment
+from curriculum.enrollment import rebuild_enrollments
+from curriculum.models import Curriculum
+from organizations.models import Program
+from .registry import task
+
+
+@task("assessments.refresh_attainment")
+def refresh_attainment(job, program_ids=None):
+    """
+    Rebuild the materialized attainment rows, one curriculum at a time.
+    """
+    curricula = Curriculum.objects.only("id", "program_id").order_by("id")
+    if program_ids is not None:
+        curricula = curricula.filter(program_id__in=program_ids)
+    curricula = list(curricula)
+
+    for done, curriculum in enumerate(curricula, start=1):
+        refresh_curriculum_attainment(curriculum.id, curriculum.program_id)
+        job.set_progress(done * 100 / len(curricula), f"{done}/{len(curricula)} curricula")
+    return {"curricula": len(curricula)}
+
+
+@task("assessments.program_report")
+def program_report(job, program_id):
+    """
+    Compute the program attainment report ahead of the users opening it.
+    """
+    from assessments.reports import program_attainment_report
+
+    report = program_attainment_report(Program.objects.get(id=program_id))
+    return {"students": report.value["students"]}
+
+
+@task("curriculum.rebuild_enrollments")
+def enrollments(job, program_ids):
+    job.set_progress(0, "Rebuilding enrollments")
+    removed, added = rebuild_enrollments(program_ids)
+    return {"removed": removed, "added": added}
+
+
+@task("accounts.import_students", private_payload=True)
+def student_import(job, csv_text, workers=None):
+    """
+    Import the uploaded CSV. Its password column is plaintext, so the
+    payload is cleared once the job finishes (see registry.task).
+    """
+    job.set_progress(0, "Validating rows and hashing passwords")
+    try:
+        report = import_students(
+            read_student_rows(io.BytesIO(csv_text.encode("utf-8"))), workers=workers
+        )
+    except StudentImportError as exc:
+        return {"created": 0, "enrollments_added": 0, "errors": [[1, str(exc)]]}
+    return {
+        "created": report.created,
+        "enrollments_added": report.enrollments_added,
+        "errors": report.errors,
+    }
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from organizations.models import Faculty, Program
+from .admin import JobAdmin
+from .models import Job
+from .registry import enqueue, fail_job, fail_stale, run_job
+
+
+class StaleJobTests(TestCase):
+    def running_job(self, started_ago):
+        job = enqueue("assessments.refresh_attainment", {"program_ids": []})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING, started_at=timezone.now() - timedelta(seconds=started_ago)
+        )
+        return job
+
+    def test_only_old_running_jobs_fail(self):
+        stale = self.running_job(started_ago=120)
+        fresh = self.running_job(started_ago=10)
+
+        self.assertEqual(fail_stale(60), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, Job.Status.FAILED)
+        self.assertIsNotNone(stale.finished_at)
+        self.assertEqual(fresh.status, Job.Status.RUNNING)
+
+    def test_worker_fails_stale_jobs_on_start(self):
+        stale = self.running_job(started_ago=120)
+
+        # Kuyruk boş: --once hemen çıkar, pool thread'leri test DB'sine dokunmaz
+        call_command("run_worker", once=True, stale_after=60, poll_interval=0, stdout=StringIO(), stderr=StringIO())
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, Job.Status.FAILED)
+
+
+class JobDetailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student_affairs = CustomUser.objects.create_user(
+            "sa", password=None, role=CustomUser.Role.STUDENT_AFFAIRS
+        )
+        cls.admin = CustomUser.objects.create_superuser("admin", password=None)
+        cls.job = Job.objects.create(
+            kind="accounts.import_students",
+            created_by=cls.student_affairs,
+            status=Job.Status.FAILED,
+            error='Traceback (most recent call last):\n  File "/srv/loms/jobs/tasks.py"',
+        )
+
+    def get_detail(self, user):
+        self.client.force_login(user)
+        return self.client.get(reverse("jobs:job_detail", args=[self.job.id]))
+
+    def test_traceback_hidden_from_the_owner(self):
+        response = self.get_detail(self.student_affairs)
+        self.assertContains(response, "could not be completed")
+        self.assertNotContains(response, "Traceback")
+
+    def test_traceback_shown_to_admins(self):
+        self.assertContains(self.get_detail(self.admin), "Traceback")
+
+
+class PrivatePayloadTests(TestCase):
+    CSV = "username,program,grade,password\nnew1,CE,1,Secret-Pass-1\n"
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+
+    def test_payload_cleared_when_the_job_finishes(self):
+        job = enqueue("accounts.import_students", {"csv_text": self.CSV})
+        run_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result["created"], 1)
+        self.assertEqual(job.payload, {})
+
+    def test_payload_cleared_when_the_worker_dies(self):
+        job = enqueue("accounts.import_students", {"csv_text": self.CSV})
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.RUNNING)
+        fail_job(job.id, "worker died")
+        job.refresh_from_db()
+        self.assertEqual(job.payload, {})
+
+    def test_other_payloads_are_kept(self):
+        job = enqueue("assessments.refresh_attainment", {"program_ids": []})
+        run_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.payload, {"program_ids": []})
+
+    def test_admin_does_not_show_private_payloads(self):
+        job = enqueue("accounts.import_students", {"csv_text": self.CSV})
+        self.assertEqual(JobAdmin(Job, None).payload_display(job), "(hidden)")
+        self.assertIn("payload", JobAdmin.exclude)
@@ -0,0 +1,15 @@
+from django.urls import path
+from .views import job_detail, job_status
+
+app_name = "jobs"
+
+urlpatterns = [
+    path("<int:pk>/", job_detail, name="job_detail"),
+    path("<int:pk>/status/", job_status, name="job_status"),
+]
+
+# Bir request'in en fazla kaç sorgu çalıştırabileceği (config.query_budget)
+QUERY_BUDGETS = {
+    "job_detail": 5,
+    "job_status": 5,
+}
@@ -0,0 +1,39 @@
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
+
+from .models import Job
+
+
+def _get_job_for_user(user, pk):
+    """
+    Users only see the jobs they started. Administrators see everything.
+    """
+    job = get_object_or_404(Job.objects.select_related("created_by"), pk=pk)
+    if not (user.is_admin or user.is_superuser or job.created_by_id == user.id):
+        raise PermissionDenied("You are not allowed to view this job.")
+    return job
+
+
+@login_required
+def job_detail(request, pk):
+    """
+    Progress page; polls job_status until the job finishes.
+    """
+    job = _get_job_for_user(request.user, pk)
+    return render(request, "jobs/job_detail.html", {"job": job})
+
+
+@login_required
+def job_status(request, pk):
+    job = _get_job_for_user(request.user, pk)
+    return JsonResponse(
+        {
+            "status": job.status,
+            "status_display": job.get_status_display(),
+            "progress": job.progress,
+            "message": job.message,
+            "finished": job.is_finished,
+        }
+    )
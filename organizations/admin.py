@@ -1,15 +1,69 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+
+from accounts.promotion import promote_students
+from jobs.registry import enqueue
 from .models import Faculty, Program
 
 
+def promote_with_confirmation(modeladmin, request, queryset, program_ids, action):
+    """
+    Year-end promotion cannot be undone, so the action first shows the
+    dry-run counts on a confirmation page and only promotes once that page
+    is submitted (same flow as the admin's delete_selected).
+    """
+    program_ids = list(program_ids)
+    if request.POST.get("confirm"):
+        result = promote_students(program_ids)
+        modeladmin.message_user(request, str(result), messages.SUCCESS)
+        return None
+
+    context = {
+        **modeladmin.admin_site.each_context(request),
+        "title": "Promote students?",
+        "opts": modeladmin.model._meta,
+        "objects": list(queryset),
+        "programs": list(Program.objects.filter(id__in=program_ids).order_by("code")),
+        "dry_run": promote_students(program_ids, dry_run=True),
+        "action": action,
+        "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+    }
+    return TemplateResponse(request, "admin/organizations/promote_students_confirmation.html", context)
+
+
 @admin.register(Faculty)
 class FacultyAdmin(admin.ModelAdmin):
     list_display = ("code", "name", "responsible")
+    list_select_related = ("responsible",)
     search_fields = ("code", "name")
+    actions = ["promote_faculty_students"]
+
+    @admin.action(description="Promote students of selected faculties (year-end)")
+    def promote_faculty_students(self, request, queryset):
+        program_ids = Program.objects.filter(faculty__in=queryset).values_list("id", flat=True)
+        return promote_with_confirmation(self, request, queryset, program_ids, "promote_faculty_students")
 
 
 @admin.register(Program)
 class ProgramAdmin(admin.ModelAdmin):
     list_display = ("code", "name", "faculty", "coordinator")
     list_filter = ("faculty",)
+    list_select_related = ("faculty", "coordinator")
     search_fields = ("code", "name")
+    actions = ["promote_program_students", "rebuild_program_enrollments"]
+
+    @admin.action(description="Promote students of selected programs (year-end)")
+    def promote_program_students(self, request, queryset):
+        return promote_with_confirmation(
+            self, request, queryset, queryset.values_list("id", flat=True), "promote_program_students"
+        )
+
+    @admin.action(description="Rebuild curriculum enrollments of selected programs (background)")
+    def rebuild_program_enrollments(self, request, queryset):
+        job = enqueue(
+            "curriculum.rebuild_enrollments",
+            {"program_ids": list(queryset.values_list("id", flat=True))},
+            user=request.user,
+        )
+        self.message_user(request, f"Queued background job #{job.pk}.", messages.INFO)
@@ -0,0 +1,104 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from assessments.attainment import refresh_program_attainment
+from curriculum.permissions import invalidate_lecturer_curricula
+from organizations.models import Faculty, Program
+from organizations.seed import BATCH_SIZE, InstitutionSeeder
+from search import index
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with a synthetic institution (faculties, programs, curricula, "
+        "outcomes, assessments, mappings, students and results) for load testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--faculties", type=int, default=10, help="Number of faculties (default: 10).")
+        parser.add_argument("--programs", type=int, default=4, help="Programs per faculty (default: 4).")
+        parser.add_argument("--students", type=int, default=50000, help="Students in total (default: 50000).")
+        parser.add_argument(
+            "--courses",
+            type=int,
+            default=8,
+            help="Curricula per program and year; also the lecturers per program (default: 8).",
+        )
+        parser.add_argument(
+            "--program-outcomes", type=int, default=10, help="Program outcomes per program (default: 10)."
+        )
+        parser.add_argument(
+            "--learning-outcomes", type=int, default=5, help="Learning outcomes per curriculum (default: 5)."
+        )
+        parser.add_argument(
+            "--prefix",
+            default="S",
+            help="Prefix of the generated faculty / program codes and usernames (default: S).",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed, for a reproducible institution.")
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE, help=f"Rows per INSERT (default: {BATCH_SIZE})."
+        )
+        parser.add_argument(
+            "--skip-attainment",
+            action="store_true",
+            help="Do not compute StudentLOAttainment / StudentPOAttainment (run refresh_attainment later).",
+        )
+        parser.add_argument(
+            "--skip-search",
+            action="store_true",
+            help="Do not rebuild the search index (run rebuild_search_index later).",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("faculties", "programs", "courses", "program_outcomes", "learning_outcomes", "batch_size"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1.")
+        if options["students"] < 0:
+            raise CommandError("--students cannot be negative.")
+
+        prefix = options["prefix"]
+        if Faculty.objects.filter(code__startswith=f"{prefix}F").exists():
+            raise CommandError(
+                f"Faculties with the '{prefix}F' code prefix already exist; pick another --prefix."
+            )
+
+        started = time.monotonic()
+        seeder = InstitutionSeeder(
+            faculties=options["faculties"],
+            programs=options["programs"],
+            students=options["students"],
+            courses=options["courses"],
+            program_outcomes=options["program_outcomes"],
+            learning_outcomes=options["learning_outcomes"],
+            prefix=prefix,
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=lambda message: self.stdout.write(f"{message} ({time.monotonic() - started:.0f}s)"),
+        )
+        report = seeder.run()
+        self.stdout.write(self.style.SUCCESS(f"Created {report} in {time.monotonic() - started:.0f}s."))
+
+        # bulk_create sinyalleri atladı: curriculum.signals'ın yapacağını burada yap
+        invalidate_lecturer_curricula()
+
+        if options["skip_attainment"]:
+            self.stdout.write(self.style.WARNING("Attainment not computed; run refresh_attainment."))
+        else:
+            program_ids = list(
+                Program.objects.filter(faculty__code__startswith=f"{prefix}F").values_list("id", flat=True)
+            )
+            for program_id in program_ids:
+                refresh_program_attainment(program_id)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Refreshed attainment for {len(program_ids)} programs ({time.monotonic() - started:.0f}s)."
+                )
+            )
+
+        if options["skip_search"]:
+            self.stdout.write(self.style.WARNING("Search index not rebuilt; run rebuild_search_index."))
+        elif index.is_supported():
+            count = index.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} documents ({time.monotonic() - started:.0f}s)."))
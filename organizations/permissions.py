@@ -0,0 +1,12 @@
+from django.core.exceptions import PermissionDenied
+
+
+def check_program_permission_for_faculty_member(user, program):
+    """
+    Faculty Member sadece sorumlu olduğu faculty'deki programları
+    yönetebilsin. Admin her yere girebilir.
+    """
+    if user.is_admin:
+        return
+    if program.faculty.responsible_id != user.id:
+        raise PermissionDenied("You are not allowed to manage this program.")
@@ -0,0 +1,355 @@
+"""
+Synthetic institution for load and query-plan testing (manage.py seed_institution).
+
+Builds faculties → programs → curricula with program / learning outcomes,
+assessments, both mapping tables, enrolled students and their results.
+Every table is written with bulk_create in batches, so per-instance
+signals and Curriculum.save (enrollment sync) never run: enrollments are
+inserted straight into Curriculum.students.through from the generated
+program / grade of each student.
+
+Scores are drawn per student and course: every student has an ability,
+every course a difficulty, and an assessment score is normally distributed
+around both, clipped to [0, max_score] and rounded to half points; a few
+results are missing (absent students). The same --seed gives the same
+institution.
+"""
+import datetime
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import CustomUser
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from curriculum.models import Curriculum
+from outcomes.models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+from .models import Faculty, Program
+
+BATCH_SIZE = 5000
+
+FIRST_NAMES = (
+    "Ahmet", "Ayşe", "Mehmet", "Fatma", "Mustafa", "Zeynep", "Emre", "Elif",
+    "Can", "Deniz", "Burak", "Selin", "Murat", "Ece", "Kerem", "Derya",
+)
+LAST_NAMES = (
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Aydın", "Öztürk",
+    "Arslan", "Doğan", "Kılıç", "Aslan", "Koç", "Kurt", "Özdemir", "Polat",
+)
+SUBJECTS = (
+    "Calculus", "Physics", "Programming", "Data Structures", "Algorithms",
+    "Databases", "Statistics", "Linear Algebra", "Operating Systems",
+    "Computer Networks", "Signals and Systems", "Thermodynamics",
+    "Materials Science", "Economics", "Ethics", "Project Management",
+)
+
+# (type, weight_in_course, score shift) setleri; her ders birini alır
+ASSESSMENT_PLANS = (
+    ((Assessment.AssessmentType.MIDTERM, 40, 0), (Assessment.AssessmentType.FINAL, 60, -4)),
+    (
+        (Assessment.AssessmentType.QUIZ, 20, 5),
+        (Assessment.AssessmentType.MIDTERM, 30, 0),
+        (Assessment.AssessmentType.FINAL, 50, -4),
+    ),
+    (
+        (Assessment.AssessmentType.QUIZ, 10, 5),
+        (Assessment.AssessmentType.MIDTERM, 30, 0),
+        (Assessment.AssessmentType.PROJECT, 20, 8),
+        (Assessment.AssessmentType.FINAL, 40, -4),
+    ),
+)
+# Ortalama not ve sapma (max_score yüzdesi olarak)
+MEAN_SCORE = 64
+ABILITY_SPREAD = 11
+DIFFICULTY_SPREAD = 8
+NOISE = 12
+ABSENT_RATE = 0.03
+
+# Sınıf seviyelerine göre öğrenci payı (üst sınıflarda az biraz azalır)
+GRADE_SHARES = (0.28, 0.26, 0.24, 0.22)
+
+
+class SeedReport:
+    def __init__(self):
+        self.counts = {}
+
+    def add(self, label, count):
+        self.counts[label] = self.counts.get(label, 0) + count
+
+    def __str__(self):
+        return ", ".join(f"{count} {label}" for label, count in self.counts.items())
+
+
+def _split_weights(rng, parts):
+    """
+    `parts` positive integer weights summing to 100.
+    """
+    weights = np.floor(rng.dirichlet(np.full(parts, 2.0)) * (100 - parts)).astype(int) + 1
+    weights[np.argmax(weights)] += 100 - weights.sum()
+    return weights.tolist()
+
+
+class InstitutionSeeder:
+    def __init__(
+        self,
+        faculties=10,
+        programs=4,
+        students=50000,
+        courses=8,
+        program_outcomes=10,
+        learning_outcomes=5,
+        prefix="S",
+        seed=None,
+        batch_size=BATCH_SIZE,
+        log=None,
+    ):
+        self.faculties = faculties
+        self.programs = programs
+        self.students = students
+        self.courses = courses
+        self.program_outcomes = program_outcomes
+        self.learning_outcomes = learning_outcomes
+        self.prefix = prefix
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.report = SeedReport()
+        # Bir kez hash'lenir, tüm seed kullanıcılarında aynı (unusable) parola
+        self.password = make_password(None)
+
+    def _bulk_create(self, model, objects, label):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.report.add(label, len(created))
+        return created
+
+    def _user(self, username, role, **fields):
+        return CustomUser(
+            username=username,
+            password=self.password,
+            role=role,
+            first_name=FIRST_NAMES[self.rng.integers(len(FIRST_NAMES))],
+            last_name=LAST_NAMES[self.rng.integers(len(LAST_NAMES))],
+            **fields,
+        )
+
+    def run(self):
+        """
+        Create the whole institution and return a SeedReport.
+        Each program is committed on its own, so a long run keeps its progress.
+        """
+        prefix = self.prefix
+        with transaction.atomic():
+            members = self._bulk_create(
+                CustomUser,
+                [
+                    self._user(f"{prefix.lower()}fm{f:02d}", CustomUser.Role.FACULTY_MEMBER)
+                    for f in range(1, self.faculties + 1)
+                ],
+                "users",
+            )
+            faculties = self._bulk_create(
+                Faculty,
+                [
+                    Faculty(
+                        name=f"Faculty {f}",
+                        code=f"{prefix}F{f:02d}",
+                        description=f"Synthetic faculty {f}",
+                        responsible=member,
+                    )
+                    for f, member in enumerate(members, start=1)
+                ],
+                "faculties",
+            )
+            for faculty, member in zip(faculties, members):
+                member.faculty_member_faculty = faculty
+            CustomUser.objects.bulk_update(members, ["faculty_member_faculty"], batch_size=self.batch_size)
+
+            programs = self._bulk_create(
+                Program,
+                [
+                    Program(
+                        name=f"Program {p} of {faculty.name}",
+                        code=f"{faculty.code}P{p:02d}",
+                        faculty=faculty,
+                        description=f"Synthetic program {p}",
+                    )
+                    for faculty in faculties
+                    for p in range(1, self.programs + 1)
+                ],
+                "programs",
+            )
+
+        # Öğrenciler programlara eşit dağıtılır, kalan ilk programlara
+        per_program, extra = divmod(self.students, len(programs)) if programs else (0, 0)
+        for position, program in enumerate(programs):
+            with transaction.atomic():
+                self._seed_program(program, per_program + (1 if position < extra else 0))
+            self.log(f"{program.code}: {self.report}")
+        return self.report
+
+    def _seed_program(self, program, student_count):
+        rng = self.rng
+        years = Curriculum.Year.values
+
+        lecturers = self._bulk_create(
+            CustomUser,
+            [
+                self._user(f"{program.code.lower()}l{n:02d}", CustomUser.Role.LECTURER)
+                for n in range(1, self.courses + 1)
+            ],
+            "users",
+        )
+
+        grades = rng.choice(years, size=student_count, p=GRADE_SHARES)
+        students = []
+        for start in range(0, student_count, self.batch_size):
+            students += self._bulk_create(
+                CustomUser,
+                [
+                    self._user(
+                        f"{program.code.lower()}s{n:06d}",
+                        CustomUser.Role.STUDENT,
+                        student_faculty_id=program.faculty_id,
+                        student_program_id=program.id,
+                        student_grade=int(grades[n]),
+                    )
+                    for n in range(start, min(start + self.batch_size, student_count))
+                ],
+                "users",
+            )
+        student_ids = np.array([student.id for student in students], dtype=np.int64)
+        ability = rng.normal(0, 1, size=student_count)
+
+        program_outcomes = self._bulk_create(
+            ProgramOutcome,
+            [
+                ProgramOutcome(
+                    program=program,
+                    code=f"PO{n}",
+                    short_title=f"Program outcome {n}",
+                    description=f"Graduates of {program.name} meet outcome {n}.",
+                    order=n,
+                )
+                for n in range(1, self.program_outcomes + 1)
+            ],
+            "program outcomes",
+        )
+
+        curricula = self._bulk_create(
+            Curriculum,
+            [
+                Curriculum(
+                    program=program,
+                    code=f"{program.code}-{year}{n:02d}",
+                    name=f"{SUBJECTS[(year * self.courses + n) % len(SUBJECTS)]} {year}{n:02d}",
+                    year=year,
+                    semester=Curriculum.Semester.FALL if n % 2 else Curriculum.Semester.SPRING,
+                    ects=float(rng.choice((4, 5, 6, 7.5))),
+                    credit=int(rng.choice((2, 3, 4))),
+                    description=f"{SUBJECTS[(year * self.courses + n) % len(SUBJECTS)]} for year {year} students.",
+                    lecturer=lecturers[n - 1],
+                )
+                for year in years
+                for n in range(1, self.courses + 1)
+            ],
+            "curricula",
+        )
+
+        learning_outcomes = self._bulk_create(
+            LearningOutcome,
+            [
+                LearningOutcome(
+                    curriculum=curriculum,
+                    code=f"LO{n}",
+                    short_title=f"Learning outcome {n}",
+                    description=f"Students of {curriculum.code} can demonstrate skill {n}.",
+                    order=n,
+                )
+                for curriculum in curricula
+                for n in range(1, self.learning_outcomes + 1)
+            ],
+            "learning outcomes",
+        )
+        los_by_curriculum = {}
+        for lo in learning_outcomes:
+            los_by_curriculum.setdefault(lo.curriculum_id, []).append(lo)
+
+        # Her LO 1-3 PO'ya, ağırlık toplamı 100
+        lo_po = []
+        for lo in learning_outcomes:
+            parts = int(rng.integers(1, min(3, len(program_outcomes)) + 1))
+            targets = rng.choice(len(program_outcomes), size=parts, replace=False)
+            for target, weight in zip(targets, _split_weights(rng, parts)):
+                lo_po.append(
+                    LearningOutcomeProgramOutcome(
+                        learning_outcome=lo, program_outcome=program_outcomes[target], weight=weight
+                    )
+                )
+        self._bulk_create(LearningOutcomeProgramOutcome, lo_po, "LO → PO mappings")
+
+        plans = []
+        assessments = []
+        for curriculum in curricula:
+            plan = ASSESSMENT_PLANS[rng.integers(len(ASSESSMENT_PLANS))]
+            term_start = datetime.date(2025, 10 if curriculum.semester == Curriculum.Semester.FALL else 3, 1)
+            for step, (type_, weight, _shift) in enumerate(plan):
+                assessments.append(
+                    Assessment(
+                        curriculum=curriculum,
+                        type=type_,
+                        weight_in_course=weight,
+                        max_score=100,
+                        date=term_start + datetime.timedelta(weeks=4 * step + 3),
+                    )
+                )
+            plans.append(plan)
+        assessments = self._bulk_create(Assessment, assessments, "assessments")
+
+        # Her assessment 2-4 LO'yu ölçer, ağırlık toplamı 100
+        alo = []
+        for assessment in assessments:
+            los = los_by_curriculum.get(assessment.curriculum_id, [])
+            if not los:
+                continue
+            parts = int(rng.integers(min(2, len(los)), min(4, len(los)) + 1))
+            targets = rng.choice(len(los), size=parts, replace=False)
+            for target, weight in zip(targets, _split_weights(rng, parts)):
+                alo.append(
+                    AssessmentLearningOutcome(
+                        assessment=assessment, learning_outcome=los[target], weight_in_assessment=weight
+                    )
+                )
+        self._bulk_create(AssessmentLearningOutcome, alo, "assessment → LO mappings")
+
+        Enrollment = Curriculum.students.through
+        assessments_by_curriculum = {}
+        for assessment in assessments:
+            assessments_by_curriculum.setdefault(assessment.curriculum_id, []).append(assessment)
+
+        enrollments, results = [], []
+        for curriculum, plan in zip(curricula, plans):
+            # sync_enrollments ile aynı kural: program + student_grade == year
+            enrolled = np.flatnonzero(grades == curriculum.year)
+            enrollments += [
+                Enrollment(curriculum_id=curriculum.id, customuser_id=student_id)
+                for student_id in student_ids[enrolled].tolist()
+            ]
+            if len(enrollments) >= self.batch_size:
+                self._bulk_create(Enrollment, enrollments, "enrollments")
+                enrollments = []
+
+            difficulty = rng.normal(0, 1)
+            for assessment, (_type, _weight, shift) in zip(assessments_by_curriculum[curriculum.id], plan):
+                mean = MEAN_SCORE + shift + ABILITY_SPREAD * ability[enrolled] - DIFFICULTY_SPREAD * difficulty
+                scores = np.round(np.clip(rng.normal(mean, NOISE), 0, 100) * 2) / 2
+                present = rng.random(len(enrolled)) >= ABSENT_RATE
+                for student_id, score in zip(student_ids[enrolled][present].tolist(), scores[present].tolist()):
+                    results.append(
+                        StudentAssessmentResult(assessment_id=assessment.id, student_id=student_id, raw_score=score)
+                    )
+                if len(results) >= self.batch_size:
+                    self._bulk_create(StudentAssessmentResult, results, "results")
+                    results = []
+
+        self._bulk_create(Enrollment, enrollments, "enrollments")
+        self._bulk_create(StudentAssessmentResult, results, "results")
@@ -1,3 +1,96 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+from django.contrib.admin import helpers
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+
+from assessments.models import (
+    Assessment,
+    AssessmentLearningOutcome,
+    StudentAssessmentResult,
+    StudentPOAttainment,
+)
+from curriculum.enrollment import rebuild_enrollments
+from curriculum.models import Curriculum
+from outcomes.models import LearningOutcomeProgramOutcome
+from .models import Faculty, Program
+
+
+class SeedInstitutionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_institution",
+            faculties=2,
+            programs=2,
+            students=120,
+            courses=2,
+            seed=7,
+            skip_search=True,
+            stdout=StringIO(),
+        )
+
+    def test_structure(self):
+        self.assertEqual(Faculty.objects.count(), 2)
+        self.assertEqual(Program.objects.count(), 4)
+        self.assertEqual(Curriculum.objects.count(), 4 * 2 * len(Curriculum.Year.values))
+        self.assertTrue(StudentAssessmentResult.objects.exists())
+        self.assertTrue(StudentPOAttainment.objects.exists())
+
+    def test_enrollments_match_program_and_grade(self):
+        # Signal'lar atlandı; set-based rebuild hiçbir şey değiştirmemeli
+        self.assertEqual(rebuild_enrollments(Program.objects.values_list("id", flat=True)), (0, 0))
+
+    def test_weights_sum_to_100(self):
+        for queryset, group, weight in [
+            (Assessment.objects, "curriculum", "weight_in_course"),
+            (AssessmentLearningOutcome.objects, "assessment", "weight_in_assessment"),
+            (LearningOutcomeProgramOutcome.objects, "learning_outcome", "weight"),
+        ]:
+            totals = set(queryset.values(group).annotate(total=Sum(weight)).values_list("total", flat=True))
+            self.assertEqual(totals, {100})
+
+    def test_existing_prefix_is_refused(self):
+        with self.assertRaisesMessage(CommandError, "already exist"):
+            call_command("seed_institution", faculties=1, students=0, stdout=StringIO())
+
+
+class PromoteActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin", password=None)
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        cls.program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        cls.student = CustomUser.objects.create_user(
+            "s1",
+            password=None,
+            role=CustomUser.Role.STUDENT,
+            student_faculty=faculty,
+            student_program=cls.program,
+            student_grade=1,
+        )
+
+    def post_action(self, **extra):
+        self.client.force_login(self.admin)
+        return self.client.post(
+            reverse("admin:organizations_program_changelist"),
+            {"action": "promote_program_students", helpers.ACTION_CHECKBOX_NAME: [self.program.pk], **extra},
+        )
+
+    def test_first_post_only_shows_the_dry_run(self):
+        response = self.post_action()
+        self.assertTemplateUsed(response, "admin/organizations/promote_students_confirmation.html")
+        self.assertTrue(response.context["dry_run"].dry_run)
+        self.assertEqual(response.context["dry_run"].promoted, 1)
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.student_grade, 1)
 
-# Create your tests here.
+    def test_confirmed_post_promotes(self):
+        response = self.post_action(confirm="yes")
+        self.assertRedirects(response, reverse("admin:organizations_program_changelist"))
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.student_grade, 2)
@@ -21,3 +21,14 @@ urlpatterns = [
 	path("faculty/<int:pk>/delete/", faculty_delete, name="faculty_delete"),
 
 ]
+
+# Bir request'in en fazla kaç sorgu çalıştırabileceği (config.query_budget)
+QUERY_BUDGETS = {
+    "faculty_program_list": 7,
+    "program_create": 6,
+    "program_edit": 7,
+    "program_delete": 5,
+    "faculty_member_dashboard": 6,
+    "faculty_edit": 6,
+    "faculty_delete": 5,
+}
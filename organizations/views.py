@@ -1,4 +1,5 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.db.models import Prefetch
 from accounts.decorators import role_required
 from accounts.models import CustomUser
 from .models import Faculty, Program
@@ -12,7 +13,9 @@ def faculty_program_list(request):
    - Lists all Faculties + Programs
    - Shows a form to add a new Faculty
     """
-    faculties = Faculty.objects.prefetch_related("programs").all()
+    faculties = Faculty.objects.select_related("responsible").prefetch_related(
+        Prefetch("programs", queryset=Program.objects.select_related("coordinator"))
+    )
     faculty_form = FacultyForm()
 
     if request.method == "POST":
@@ -6,6 +6,7 @@ from .models import ProgramOutcome, LearningOutcome
 class ProgramOutcomeAdmin(admin.ModelAdmin):
     list_display = ("code", "short_title", "program", "order", "active")
     list_filter = ("program", "active")
+    list_select_related = ("program",)
     search_fields = ("code", "short_title", "description")
 
 
@@ -13,5 +14,6 @@ class ProgramOutcomeAdmin(admin.ModelAdmin):
 class LearningOutcomeAdmin(admin.ModelAdmin):
     list_display = ("code", "short_title", "curriculum", "order", "active")
     list_filter = ("curriculum", "active")
+    list_select_related = ("curriculum__program",)
     search_fields = ("code", "short_title", "description")
     exclude = ("program_outcomes",)
@@ -0,0 +1,109 @@
+"""
+Per-program versioned cache of the Program → Curriculum → LO → PO structures.
+
+Every cached structure of a program is stored under a key that contains the
+program's current version, e.g. `program_tree:7:v1729261234567`. Any change
+to a curriculum, outcome or mapping of the program bumps the version (see
+the curriculum / outcomes / assessments signals and the bulk-saving views),
+so all of its entries become unreachable at once and expire on their own.
+
+Entries are plain dicts/lists, so they work with any cache backend: local
+memory for a single dev process, file or Redis/Memcached (CACHE_URL) when
+several gunicorn workers must see the same versions.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(program_id):
+    return f"program_version:{program_id}"
+
+
+def _new_version():
+    # 1 yerine zaman: version key cache'ten düşerse eski entry'ler geri dönmesin
+    return int(time.time() * 1000)
+
+
+def program_version(program_id):
+    return cache.get_or_set(_version_key(program_id), _new_version, None)
+
+
+def bump_program_version(program_id):
+    """
+    Invalidate every cached structure of the program once the current
+    transaction commits, so a concurrent request cannot re-cache the
+    pre-commit state under the new version.
+    """
+    if program_id is None:
+        return
+
+    def bump():
+        try:
+            cache.incr(_version_key(program_id))
+        except ValueError:
+            cache.set(_version_key(program_id), _new_version(), None)
+
+    transaction.on_commit(bump)
+
+
+def cached_for_program(program_id, name, build, timeout=CACHE_TIMEOUT):
+    """
+    Return the cached `name` structure of the program, calling build() on a miss.
+    """
+    key = f"{name}:{program_id}:v{program_version(program_id)}"
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
+
+
+def _build_program_tree(program_id):
+    from .models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+
+    program_outcomes = list(
+        ProgramOutcome.objects.filter(program_id=program_id)
+        .order_by("order", "code")
+        .values("id", "code", "short_title", "description", "order", "active")
+    )
+    po_codes = {po["id"]: po["code"] for po in program_outcomes}
+
+    mappings_by_lo = {}
+    for lo_id, po_id, weight in (
+        LearningOutcomeProgramOutcome.objects.filter(program_outcome__program_id=program_id)
+        .order_by("program_outcome__order", "program_outcome__code")
+        .values_list("learning_outcome_id", "program_outcome_id", "weight")
+    ):
+        mappings_by_lo.setdefault(lo_id, []).append(
+            {"id": po_id, "code": po_codes[po_id], "weight": weight}
+        )
+
+    curricula = {}
+    for lo in (
+        LearningOutcome.objects.filter(curriculum__program_id=program_id)
+        .order_by("order", "code")
+        .values("id", "curriculum_id", "code", "short_title", "description", "order", "active")
+    ):
+        lo["program_outcomes"] = mappings_by_lo.get(lo["id"], [])
+        curricula.setdefault(lo.pop("curriculum_id"), []).append(lo)
+
+    return {"program_outcomes": program_outcomes, "curricula": curricula}
+
+
+def program_tree(program_id):
+    """
+    {"program_outcomes": [po, ...],
+     "curricula": {curriculum_id: [lo (with "program_outcomes": [{id, code, weight}]), ...]}}
+    """
+    return cached_for_program(program_id, "program_tree", lambda: _build_program_tree(program_id))
+
+
+def curriculum_learning_outcomes(curriculum):
+    """
+    Serialized LOs of a curriculum with their PO weights, ordered.
+    """
+    return program_tree(curriculum.program_id)["curricula"].get(curriculum.id, [])
@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.transactions import on_commit_once
+from curriculum.models import Curriculum
+from .cache import bump_program_version
+from .models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+
+
+@receiver(post_save, sender=ProgramOutcome)
+@receiver(post_delete, sender=ProgramOutcome)
+def program_outcome_changed(sender, instance: ProgramOutcome, **kwargs):
+    bump_program_version(instance.program_id)
+
+
+@receiver(post_save, sender=LearningOutcome)
+@receiver(post_delete, sender=LearningOutcome)
+def learning_outcome_changed(sender, instance: LearningOutcome, **kwargs):
+    curriculum_id = instance.curriculum_id
+
+    def bump():
+        # Curriculum de silindiyse kendi sinyali version'ı zaten artırdı
+        for program_id in Curriculum.objects.filter(id=curriculum_id).values_list("program_id", flat=True):
+            bump_program_version(program_id)
+
+    on_commit_once(("program_version_curriculum", curriculum_id), bump)
+
+
+@receiver(post_save, sender=LearningOutcomeProgramOutcome)
+@receiver(post_delete, sender=LearningOutcomeProgramOutcome)
+def lo_po_mapping_changed(sender, instance: LearningOutcomeProgramOutcome, **kwargs):
+    program_outcome_id = instance.program_outcome_id
+
+    def bump():
+        for program_id in ProgramOutcome.objects.filter(id=program_outcome_id).values_list("program_id", flat=True):
+            bump_program_version(program_id)
+
+    on_commit_once(("program_version_po", program_outcome_id), bump)
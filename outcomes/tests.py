@@ -1,3 +1,102 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import CustomUser
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from .models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+
+
+class LearningOutcomeMatrixTests(TestCase):
+    """
+    The LO × PO grid saves only the changed cells, with a fixed number of
+    queries whatever the grid size.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = CustomUser.objects.create_user("lect", password=None, role=CustomUser.Role.LECTURER)
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        cls.curricula = {}
+        for size in (2, 6):
+            program = Program.objects.create(name=f"Program {size}", code=f"P{size}", faculty=faculty)
+            curriculum = Curriculum.objects.create(
+                program=program, code=f"P{size}01", name="Course", year=1, lecturer=cls.lecturer
+            )
+            for i in range(size):
+                ProgramOutcome.objects.create(program=program, code=f"PO{i}", short_title="PO", order=i)
+                LearningOutcome.objects.create(curriculum=curriculum, code=f"LO{i}", short_title="LO", order=i)
+            cls.curricula[size] = curriculum
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.lecturer)
+
+    def grid(self, curriculum):
+        los = list(curriculum.learning_outcomes.order_by("order"))
+        pos = list(curriculum.program.program_outcomes.order_by("order"))
+        return los, pos
+
+    def weights(self, curriculum):
+        return {
+            (lo, po): weight
+            for lo, po, weight in LearningOutcomeProgramOutcome.objects.filter(
+                learning_outcome__curriculum=curriculum
+            ).values_list("learning_outcome__code", "program_outcome__code", "weight")
+        }
+
+    def post(self, curriculum, cells):
+        los, pos = self.grid(curriculum)
+        data = {
+            f"cell_{lo.id}_{po.id}": cells.get((lo.code, po.code), "")
+            for lo in los
+            for po in pos
+        }
+        table = LearningOutcomeProgramOutcome._meta.db_table
+        # Cache'lenmiş yetki setleri iki grid arasında fark yaratmasın
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("outcomes:learning_outcome_matrix", args=[curriculum.id]), data)
+        self.assertEqual(response.status_code, 302)
+        writes = [
+            query["sql"].split()[0]
+            for query in queries
+            if table in query["sql"] and not query["sql"].startswith("SELECT")
+        ]
+        return len(queries), sorted(writes)
+
+    def test_only_changed_cells_are_written(self):
+        curriculum = self.curricula[2]
+        self.post(curriculum, {("LO0", "PO0"): "40", ("LO0", "PO1"): "60", ("LO1", "PO0"): "100"})
+        self.assertEqual(
+            self.weights(curriculum), {("LO0", "PO0"): 40, ("LO0", "PO1"): 60, ("LO1", "PO0"): 100}
+        )
+        untouched = LearningOutcomeProgramOutcome.objects.get(
+            learning_outcome__code="LO1", learning_outcome__curriculum=curriculum
+        )
+
+        # Aynı değerler → hiç yazma yok
+        _, writes = self.post(curriculum, {("LO0", "PO0"): "40", ("LO0", "PO1"): "60", ("LO1", "PO0"): "100"})
+        self.assertEqual(writes, [])
+
+        # Bir güncelleme, bir ekleme, bir silme → birer sorgu
+        _, writes = self.post(curriculum, {("LO0", "PO0"): "50", ("LO1", "PO0"): "100", ("LO1", "PO1"): "20"})
+        self.assertEqual(writes, ["DELETE", "INSERT", "UPDATE"])
+        self.assertEqual(
+            self.weights(curriculum), {("LO0", "PO0"): 50, ("LO1", "PO0"): 100, ("LO1", "PO1"): 20}
+        )
+        self.assertTrue(LearningOutcomeProgramOutcome.objects.filter(pk=untouched.pk, weight=100).exists())
+
+    def test_query_count_does_not_depend_on_grid_size(self):
+        counts = []
+        for size, curriculum in self.curricula.items():
+            # Her hücre kümesi: tüm satırlar eklenir, sonra yarısı güncellenir, yarısı silinir
+            cells = {(f"LO{i}", f"PO{j}"): "10" for i in range(size) for j in range(size)}
+            created, _ = self.post(curriculum, cells)
+            changed = {key: ("20" if n % 2 else "") for n, key in enumerate(cells)}
+            updated, _ = self.post(curriculum, changed)
+            counts.append((created, updated))
+        self.assertEqual(counts[0], counts[1])
@@ -7,6 +7,7 @@ from .views import (
     learning_outcome_edit,
     learning_outcome_delete,
 	learning_outcome_mapping,
+    learning_outcome_matrix,
 )
 
 app_name = "outcomes"
@@ -20,4 +21,17 @@ urlpatterns = [
     path("lo/<int:pk>/edit/", learning_outcome_edit, name="learning_outcome_edit"),
     path("lo/<int:pk>/delete/", learning_outcome_delete, name="learning_outcome_delete"),
 	path("lo/<int:pk>/mapping/", learning_outcome_mapping, name="learning_outcome_mapping"),
+    path("curriculum/<int:curriculum_id>/matrix/", learning_outcome_matrix, name="learning_outcome_matrix"),
 ]
+
+# Bir request'in en fazla kaç sorgu çalıştırabileceği (config.query_budget)
+QUERY_BUDGETS = {
+    "program_outcome_manage": 9,
+    "program_outcome_edit": 7,
+    "program_outcome_delete": 7,
+    "learning_outcome_manage": 9,
+    "learning_outcome_edit": 6,
+    "learning_outcome_delete": 6,
+    "learning_outcome_mapping": 9,
+    "learning_outcome_matrix": 9,
+}
@@ -1,31 +1,23 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.core.exceptions import PermissionDenied
+from django.db import transaction
 
 from accounts.decorators import role_required
 from accounts.models import CustomUser
+from config.transactions import on_commit_once
 from organizations.models import Program
+from organizations.permissions import check_program_permission_for_faculty_member
 from curriculum.models import Curriculum
+from curriculum.permissions import check_curriculum_permission_for_lecturer
+from assessments.attainment import refresh_program_outcome_attainment
+from .cache import bump_program_version, curriculum_learning_outcomes, program_tree
 from .models import ProgramOutcome, LearningOutcome, LearningOutcomeProgramOutcome
 from .forms import ProgramOutcomeForm, LearningOutcomeForm
 
 
-def _check_program_permission(user: CustomUser, program: Program):
-    """
-    Faculty Member sadece sorumlu olduğu faculty'deki programlar için
-    PO düzenleyebilsin. Admin her yere girebilir.
-    """
-    if user.is_admin:
-        return
-    if program.faculty.responsible_id != user.id:
-        raise PermissionDenied("You are not allowed to manage this program.")
-
-
 @role_required(CustomUser.Role.FACULTY_MEMBER)
 def program_outcome_manage(request, program_id):
     program = get_object_or_404(Program, id=program_id)
-    _check_program_permission(request.user, program)
-
-    outcomes = ProgramOutcome.objects.filter(program=program).order_by("order", "code")
+    check_program_permission_for_faculty_member(request.user, program)
 
     if request.method == "POST":
         form = ProgramOutcomeForm(request.POST)
@@ -39,7 +31,7 @@ def program_outcome_manage(request, program_id):
 
     context = {
         "program": program,
-        "outcomes": outcomes,
+        "outcomes": program_tree(program.id)["program_outcomes"],
         "form": form,
     }
     return render(request, "outcomes/program_outcome_manage.html", context)
@@ -49,7 +41,7 @@ def program_outcome_manage(request, program_id):
 def program_outcome_edit(request, pk):
     po = get_object_or_404(ProgramOutcome, pk=pk)
     program = po.program
-    _check_program_permission(request.user, program)
+    check_program_permission_for_faculty_member(request.user, program)
 
     if request.method == "POST":
         form = ProgramOutcomeForm(request.POST, instance=po)
@@ -71,7 +63,7 @@ def program_outcome_edit(request, pk):
 def program_outcome_delete(request, pk):
     po = get_object_or_404(ProgramOutcome, pk=pk)
     program = po.program
-    _check_program_permission(request.user, program)
+    check_program_permission_for_faculty_member(request.user, program)
 
     if request.method == "POST":
         po.delete()
@@ -84,28 +76,13 @@ def program_outcome_delete(request, pk):
     return render(request, "outcomes/program_outcome_confirm_delete.html", context)
 
 
-def _check_curriculum_permission_for_lecturer(user: CustomUser, curriculum: Curriculum):
-    """
-    Lecturer sadece kendisine atanmış curriculum'lar için LO yönetebilsin.
-    Admin her şeye girebilir.
-    """
-    if user.is_admin:
-        return
-    if curriculum.lecturer_id != user.id:
-        raise PermissionDenied("You are not allowed to manage this curriculum.")
-
-
 @role_required(CustomUser.Role.LECTURER)
 def learning_outcome_manage(request, curriculum_id):
     curriculum = get_object_or_404(
         Curriculum.objects.select_related("program"),
         id=curriculum_id,
     )
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
-
-    los = LearningOutcome.objects.filter(
-        curriculum=curriculum
-    ).prefetch_related("program_outcomes")
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     if request.method == "POST":
         form = LearningOutcomeForm(request.POST)
@@ -119,7 +96,7 @@ def learning_outcome_manage(request, curriculum_id):
 
     context = {
         "curriculum": curriculum,
-        "los": los,
+        "los": curriculum_learning_outcomes(curriculum),
         "form": form,
     }
     return render(request, "outcomes/learning_outcome_manage.html", context)
@@ -132,7 +109,7 @@ def learning_outcome_edit(request, pk):
         pk=pk,
     )
     curriculum = lo.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     if request.method == "POST":
         form = LearningOutcomeForm(request.POST, instance=lo)
@@ -157,7 +134,7 @@ def learning_outcome_delete(request, pk):
         pk=pk,
     )
     curriculum = lo.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     if request.method == "POST":
         lo.delete()
@@ -170,6 +147,72 @@ def learning_outcome_delete(request, pk):
     return render(request, "outcomes/learning_outcome_confirm_delete.html", context)
 
 
+def _collect_lo_po_change(lo_id, po_id, mapping, raw_value, to_create, to_update, to_delete):
+    """
+    Compare one submitted LO → PO weight with the existing mapping and put it
+    into the matching diff list.
+    """
+    # Boş → mapping sil
+    if raw_value == "":
+        if mapping:
+            to_delete.append(mapping.id)
+        return
+
+    # Sayıya çevir
+    try:
+        weight = int(raw_value)
+    except ValueError:
+        return  # invalid input'u şimdilik ignore
+
+    # 0 veya altı → mapping sil
+    if weight <= 0:
+        if mapping:
+            to_delete.append(mapping.id)
+        return
+
+    # 100'den büyükse clamp
+    if weight > 100:
+        weight = 100
+
+    if mapping is None:
+        to_create.append(
+            LearningOutcomeProgramOutcome(
+                learning_outcome_id=lo_id,
+                program_outcome_id=po_id,
+                weight=weight,
+            )
+        )
+    elif mapping.weight != weight:
+        mapping.weight = weight
+        to_update.append(mapping)
+
+
+def _apply_lo_po_diff(program: Program, to_create, to_update, to_delete):
+    """
+    Apply an LO → PO mapping diff in one transaction:
+    one filtered delete, one bulk_create and one bulk_update.
+    """
+    with transaction.atomic():
+        if to_delete:
+            LearningOutcomeProgramOutcome.objects.filter(id__in=to_delete).delete()
+        if to_create:
+            LearningOutcomeProgramOutcome.objects.bulk_create(to_create)
+        if to_update:
+            LearningOutcomeProgramOutcome.objects.bulk_update(to_update, ["weight"])
+
+        # bulk işlemler sinyal tetiklemez; silinenler sinyal ile zaten yenileniyor
+        touched = sorted({m.program_outcome_id for m in to_create + to_update})
+        if touched:
+            on_commit_once(
+                ("program_outcomes", program.id, tuple(touched)),
+                lambda: refresh_program_outcome_attainment(
+                    program.id, program_outcome_ids=touched
+                ),
+            )
+        if to_create or to_update:
+            bump_program_version(program.id)
+
+
 @role_required(CustomUser.Role.LECTURER)
 def learning_outcome_mapping(request, pk):
     """
@@ -182,73 +225,117 @@ def learning_outcome_mapping(request, pk):
         pk=pk,
     )
     curriculum = lo.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
 
     program = curriculum.program
-    pos = ProgramOutcome.objects.filter(program=program).order_by("order", "code")
 
-    # Mevcut mapping'leri dictionary olarak tutalım
-    existing = {
-        m.program_outcome_id: m
-        for m in lo.lo_po_mappings.all()
+    if request.method == "POST":
+        pos = ProgramOutcome.objects.filter(program=program).order_by("order", "code")
+
+        # Mevcut mapping'leri dictionary olarak tutalım
+        existing = {
+            m.program_outcome_id: m
+            for m in lo.lo_po_mappings.all()
+        }
+
+        to_create, to_update, to_delete = [], [], []
+        for po in pos:
+            raw_value = request.POST.get(f"po_{po.id}", "").strip()
+            _collect_lo_po_change(
+                lo.id, po.id, existing.get(po.id), raw_value, to_create, to_update, to_delete
+            )
+
+        _apply_lo_po_diff(program, to_create, to_update, to_delete)
+        return redirect("outcomes:learning_outcome_manage", curriculum_id=curriculum.id)
+
+    # GET → template'e PO + mevcut weight listesi gönder (cache'li program ağacından)
+    tree = program_tree(program.id)
+    weights = {
+        po["id"]: po["weight"]
+        for cached_lo in tree["curricula"].get(curriculum.id, [])
+        if cached_lo["id"] == lo.id
+        for po in cached_lo["program_outcomes"]
     }
+    rows = [
+        {
+            "po": po,
+            "weight": weights.get(po["id"], ""),
+        }
+        for po in tree["program_outcomes"]
+    ]
+
+    context = {
+        "curriculum": curriculum,
+        "lo": lo,
+        "rows": rows,
+    }
+    return render(request, "outcomes/learning_outcome_mapping.html", context)
+
+
+@role_required(CustomUser.Role.LECTURER)
+def learning_outcome_matrix(request, curriculum_id):
+    """
+    Whole-curriculum LO × PO grid:
+    - rows: every LO of the curriculum, columns: every PO of its program
+    - all changed cells are saved in one batched transaction.
+    """
+    curriculum = get_object_or_404(
+        Curriculum.objects.select_related("program"),
+        id=curriculum_id,
+    )
+    check_curriculum_permission_for_lecturer(request.user, curriculum)
+
+    program = curriculum.program
 
     if request.method == "POST":
-        for po in pos:
-            field_name = f"po_{po.id}"
-            raw_value = request.POST.get(field_name, "").strip()
-
-            # Boş → mapping sil
-            if raw_value == "":
-                mapping = existing.get(po.id)
-                if mapping:
-                    mapping.delete()
-                continue
-
-            # Sayıya çevir
-            try:
-                weight = int(raw_value)
-            except ValueError:
-                continue  # invalid input'u şimdilik ignore
-
-            # 0 veya altı → mapping sil
-            if weight <= 0:
-                mapping = existing.get(po.id)
-                if mapping:
-                    mapping.delete()
-                continue
-
-            # 100'den büyükse clamp
-            if weight > 100:
-                weight = 100
-
-            mapping = existing.get(po.id)
-            if mapping:
-                mapping.weight = weight
-                mapping.save()
-            else:
-                LearningOutcomeProgramOutcome.objects.create(
-                    learning_outcome=lo,
-                    program_outcome=po,
-                    weight=weight,
+        po_ids = list(ProgramOutcome.objects.filter(program=program).values_list("id", flat=True))
+
+        # LO'lar ve mevcut mapping'leri tek sorguda (LEFT JOIN: mapping'i olmayan LO da gelir)
+        lo_ids = set()
+        existing = {}
+        for lo_id, mapping_id, po_id, weight in LearningOutcome.objects.filter(
+            curriculum=curriculum
+        ).values_list("id", "lo_po_mappings__id", "lo_po_mappings__program_outcome_id", "lo_po_mappings__weight"):
+            lo_ids.add(lo_id)
+            if mapping_id is not None:
+                existing[(lo_id, po_id)] = LearningOutcomeProgramOutcome(
+                    id=mapping_id, learning_outcome_id=lo_id, program_outcome_id=po_id, weight=weight
                 )
 
-        return redirect("outcomes:learning_outcome_manage", curriculum_id=curriculum.id)
+        to_create, to_update, to_delete = [], [], []
+        for lo_id in sorted(lo_ids):
+            for po_id in po_ids:
+                raw_value = request.POST.get(f"cell_{lo_id}_{po_id}", "").strip()
+                _collect_lo_po_change(
+                    lo_id,
+                    po_id,
+                    existing.get((lo_id, po_id)),
+                    raw_value,
+                    to_create,
+                    to_update,
+                    to_delete,
+                )
+
+        _apply_lo_po_diff(program, to_create, to_update, to_delete)
+        return redirect("outcomes:learning_outcome_matrix", curriculum_id=curriculum.id)
 
-    # GET → template'e PO + mevcut weight listesi gönder
+    # GET: cache'li program ağacından
+    pos = program_tree(program.id)["program_outcomes"]
     rows = []
-    for po in pos:
-        mapping = existing.get(po.id)
-        rows.append(
+    for lo in curriculum_learning_outcomes(curriculum):
+        weights = {po["id"]: po["weight"] for po in lo["program_outcomes"]}
+        cells = [
             {
                 "po": po,
-                "weight": mapping.weight if mapping else "",
+                "weight": weights.get(po["id"], ""),
             }
-        )
+            for po in pos
+        ]
+        rows.append({"lo": lo, "cells": cells})
 
     context = {
         "curriculum": curriculum,
-        "lo": lo,
+        "pos": pos,
         "rows": rows,
     }
-    return render(request, "outcomes/learning_outcome_mapping.html", context)
+    return render(request, "outcomes/learning_outcome_matrix.html", context)
@@ -0,0 +1,237 @@
+"""
+Full-text index over Curriculum, LearningOutcome and ProgramOutcome.
+
+The index is a single `search_document` table outside the ORM:
+- SQLite: an FTS5 virtual table ranked with bm25()
+- PostgreSQL: a table with a generated, GIN-indexed tsvector ranked with ts_rank()
+
+Each indexed object gets a deterministic row id (object_id * 4 + kind code),
+so updates and deletes are primary-key lookups on both backends.
+Other backends fall back to icontains queries.
+"""
+import re
+
+from django.db import connection
+
+TABLE = "search_document"
+
+# kind → (code, app_label.ModelName)
+KINDS = {
+    "curriculum": (1, "curriculum.Curriculum"),
+    "learning_outcome": (2, "outcomes.LearningOutcome"),
+    "program_outcome": (3, "outcomes.ProgramOutcome"),
+}
+KIND_BY_CODE = {code: kind for kind, (code, _label) in KINDS.items()}
+
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_supported(vendor=None):
+    return (vendor or connection.vendor) in ("sqlite", "postgresql")
+
+
+def row_id(kind, object_id):
+    return object_id * 4 + KINDS[kind][0]
+
+
+def document_for(kind, obj):
+    """
+    (title, body) indexed for an object.
+    """
+    if kind == "curriculum":
+        return f"{obj.code} {obj.name}", obj.description or ""
+    return f"{obj.code} {obj.short_title}", obj.description or ""
+
+
+def create_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+            "kind UNINDEXED, object_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE} ("
+            "id bigint PRIMARY KEY, "
+            "kind varchar(32) NOT NULL, "
+            "object_id bigint NOT NULL, "
+            "title text NOT NULL, "
+            "body text NOT NULL, "
+            "document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', title), 'A') || "
+            "setweight(to_tsvector('simple', body), 'B')) STORED)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {TABLE}_document_gin ON {TABLE} USING GIN (document)"
+        )
+
+
+def drop_index(schema_editor):
+    if is_supported(schema_editor.connection.vendor):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+def write_documents(documents, using=None):
+    """
+    documents: iterable of (kind, object_id, title, body). Inserts or replaces.
+    """
+    conn = connection if using is None else using
+    if not is_supported(conn.vendor):
+        return
+
+    rows = [
+        (row_id(kind, object_id), kind, object_id, title, body)
+        for kind, object_id, title, body in documents
+    ]
+    if not rows:
+        return
+
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            cursor.executemany(
+                f"DELETE FROM {TABLE} WHERE rowid = %s", [(row[0],) for row in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, kind, object_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (id, kind, object_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s) "
+                "ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body",
+                rows,
+            )
+
+
+def index_object(kind, obj):
+    title, body = document_for(kind, obj)
+    write_documents([(kind, obj.pk, title, body)])
+
+
+def remove_object(kind, object_id):
+    if not is_supported():
+        return
+    key = "rowid" if connection.vendor == "sqlite" else "id"
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE {key} = %s", [row_id(kind, object_id)])
+
+
+def _fts5_query(text):
+    # Kullanıcı girdisi FTS5 sözdizimi olarak yorumlanmasın: her kelime
+    # tırnak içinde, prefix eşleşmeli
+    words = WORD_RE.findall(text)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _ranked_rows(text, limit):
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            match = _fts5_query(text)
+            if not match:
+                return []
+            cursor.execute(
+                f"SELECT kind, object_id, "
+                f"snippet({TABLE}, 3, '[', ']', '…', 12), "
+                f"bm25({TABLE}, 0, 0, %s, %s) AS score "
+                f"FROM {TABLE} WHERE {TABLE} MATCH %s ORDER BY score LIMIT %s",
+                [TITLE_WEIGHT, BODY_WEIGHT, match, limit],
+            )
+            # bm25: küçük skor = daha iyi eşleşme
+            return [(kind, object_id, snippet, -score) for kind, object_id, snippet, score in cursor.fetchall()]
+
+        words = WORD_RE.findall(text)
+        if not words:
+            return []
+        cursor.execute(
+            f"SELECT kind, object_id, "
+            "ts_headline('simple', body, query, 'StartSel=[, StopSel=], MaxWords=20, MinWords=8'), "
+            "ts_rank(document, query) AS score "
+            f"FROM {TABLE}, to_tsquery('simple', %s) AS query "
+            "WHERE document @@ query ORDER BY score DESC LIMIT %s",
+            [" & ".join(f"{word}:*" for word in words), limit],
+        )
+        return cursor.fetchall()
+
+
+def _fallback_rows(text, limit):
+    from django.apps import apps
+    from django.db.models import Q
+
+    rows = []
+    for kind, (_code, label) in KINDS.items():
+        model = apps.get_model(label)
+        title_field = "name" if kind == "curriculum" else "short_title"
+        matches = model.objects.filter(
+            Q(code__icontains=text) | Q(**{f"{title_field}__icontains": text}) | Q(description__icontains=text)
+        ).values_list("id", "description")[:limit]
+        rows.extend((kind, object_id, description[:120], 0.0) for object_id, description in matches)
+    return rows[:limit]
+
+
+def search(text, limit=50):
+    """
+    Ranked hits across all indexed models:
+    [{"kind", "object", "snippet", "score"}], best first.
+    Objects are loaded with one query per kind.
+    """
+    from django.apps import apps
+
+    text = (text or "").strip()
+    if not text:
+        return []
+
+    rows = _ranked_rows(text, limit) if is_supported() else _fallback_rows(text, limit)
+
+    ids_by_kind = {}
+    for kind, object_id, _snippet, _score in rows:
+        ids_by_kind.setdefault(kind, []).append(object_id)
+
+    objects = {}
+    for kind, ids in ids_by_kind.items():
+        model = apps.get_model(KINDS[kind][1])
+        related = "program" if kind != "learning_outcome" else "curriculum__program"
+        for obj in model.objects.select_related(related).filter(id__in=ids):
+            objects[(kind, obj.id)] = obj
+
+    hits = []
+    for kind, object_id, snippet, score in rows:
+        obj = objects.get((kind, object_id))
+        if obj is None:
+            continue  # index'te kalmış ama silinmiş
+        hits.append({"kind": kind, "object": obj, "snippet": snippet, "score": score})
+    return hits
+
+
+def rebuild(batch_size=1000):
+    """
+    Re-index every object from scratch. Returns the number of documents.
+    """
+    from django.apps import apps
+
+    if not is_supported():
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+
+    count = 0
+    for kind, (_code, label) in KINDS.items():
+        model = apps.get_model(label)
+        batch = []
+        for obj in model.objects.all().iterator(chunk_size=batch_size):
+            title, body = document_for(kind, obj)
+            batch.append((kind, obj.pk, title, body))
+            if len(batch) >= batch_size:
+                write_documents(batch)
+                count += len(batch)
+                batch = []
+        write_documents(batch)
+        count += len(batch)
+    return count
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from search import index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from Curriculum, LearningOutcome and ProgramOutcome rows."
+
+    def handle(self, *args, **options):
+        if not index.is_supported():
+            self.stdout.write(self.style.WARNING("This database backend has no full-text index; nothing to do."))
+            return
+        count = index.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} documents."))
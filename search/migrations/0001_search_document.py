@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from search import index
+
+
+def create_search_document(apps, schema_editor):
+    if not index.is_supported(schema_editor.connection.vendor):
+        return
+    index.create_index(schema_editor)
+
+    documents = []
+    for kind, (_code, label) in index.KINDS.items():
+        model = apps.get_model(label)
+        for obj in model.objects.all().iterator():
+            title, body = index.document_for(kind, obj)
+            documents.append((kind, obj.pk, title, body))
+    index.write_documents(documents, using=schema_editor.connection)
+
+
+def drop_search_document(apps, schema_editor):
+    index.drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0001_initial'),
+        ('outcomes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_document, drop_search_document),
+    ]
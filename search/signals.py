@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from curriculum.models import Curriculum
+from outcomes.models import LearningOutcome, ProgramOutcome
+from . import index
+
+SENDER_KINDS = {
+    Curriculum: "curriculum",
+    LearningOutcome: "learning_outcome",
+    ProgramOutcome: "program_outcome",
+}
+
+
+@receiver(post_save, sender=Curriculum)
+@receiver(post_save, sender=LearningOutcome)
+@receiver(post_save, sender=ProgramOutcome)
+def index_document(sender, instance, raw=False, **kwargs):
+    """
+    Runs synchronously in post_save: inside the caller's transaction when
+    there is one (a rollback drops the index row too), otherwise as its own
+    autocommit statement right after the row is saved.
+    """
+    if raw:
+        return  # loaddata: rebuild_search_index sonradan çalıştırılmalı
+    index.index_object(SENDER_KINDS[sender], instance)
+
+
+@receiver(post_delete, sender=Curriculum)
+@receiver(post_delete, sender=LearningOutcome)
+@receiver(post_delete, sender=ProgramOutcome)
+def remove_document(sender, instance, **kwargs):
+    index.remove_object(SENDER_KINDS[sender], instance.pk)
@@ -0,0 +1,82 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from outcomes.models import LearningOutcome, ProgramOutcome
+from . import index
+
+
+class SearchFixture:
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(name="Engineering", code="ENG")
+        cls.program = Program.objects.create(name="Computer Engineering", code="CE", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(
+            program=cls.program,
+            code="CE101",
+            name="Introduction to Programming",
+            year=1,
+            description="Variables, loops and a first look at recursion.",
+        )
+        cls.learning_outcome = LearningOutcome.objects.create(
+            curriculum=cls.curriculum,
+            code="LO1",
+            short_title="Recursion",
+            description="Write recursive functions.",
+        )
+        cls.program_outcome = ProgramOutcome.objects.create(
+            program=cls.program,
+            code="PO1",
+            short_title="Ethics",
+            description="Professional and ethical responsibility.",
+        )
+
+    def hits(self, text):
+        return [(hit["kind"], hit["object"].pk) for hit in index.search(text)]
+
+
+@skipUnless(index.is_supported(connection.vendor), "no full-text index on this database")
+class SearchIndexTests(SearchFixture, TestCase):
+    def test_saved_objects_are_indexed(self):
+        self.assertEqual(self.hits("ethical"), [("program_outcome", self.program_outcome.pk)])
+
+    def test_update_replaces_the_document(self):
+        self.curriculum.description = "Sorting algorithms."
+        self.curriculum.save()
+        self.assertEqual(self.hits("loops"), [])
+        self.assertEqual(self.hits("sorting"), [("curriculum", self.curriculum.pk)])
+
+    def test_delete_removes_the_document(self):
+        self.program_outcome.delete()
+        self.assertEqual(self.hits("ethical"), [])
+
+    def test_title_matches_rank_first(self):
+        # LO başlığında, curriculum'da sadece açıklamada geçiyor
+        self.assertEqual(
+            self.hits("recursion"),
+            [("learning_outcome", self.learning_outcome.pk), ("curriculum", self.curriculum.pk)],
+        )
+
+    def test_prefix_match_and_query_syntax_is_escaped(self):
+        self.assertEqual(self.hits("program"), [("curriculum", self.curriculum.pk)])
+        self.assertEqual(self.hits('"ethic* ('), [("program_outcome", self.program_outcome.pk)])
+        # FTS5 operatörleri düz kelime olarak aranır, sözdizimi hatası vermez
+        self.assertEqual(self.hits("ethical NOT ("), [])
+
+    def test_rebuild_restores_a_cleared_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {index.TABLE}")
+        self.assertEqual(self.hits("ethical"), [])
+        self.assertEqual(index.rebuild(), 3)
+        self.assertEqual(self.hits("ethical"), [("program_outcome", self.program_outcome.pk)])
+
+
+class FallbackSearchTests(SearchFixture, TestCase):
+    def test_icontains_when_full_text_is_unsupported(self):
+        with mock.patch.object(index, "is_supported", return_value=False):
+            self.assertEqual(self.hits("ETHICAL"), [("program_outcome", self.program_outcome.pk)])
+            self.assertEqual(self.hits("CE101"), [("curriculum", self.curriculum.pk)])
+            self.assertEqual(self.hits("nothing like this"), [])
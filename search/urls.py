@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import search
+
+app_name = "search"
+
+urlpatterns = [
+    path("", search, name="search"),
+]
+
+# Bir request'in en fazla kaç sorgu çalıştırabileceği (config.query_budget)
+QUERY_BUDGETS = {
+    "search": 6,
+}
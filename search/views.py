@@ -0,0 +1,23 @@
+from django.shortcuts import render
+
+from accounts.decorators import role_required
+from accounts.models import CustomUser
+from . import index
+
+SEARCH_LIMIT = 50
+
+
+@role_required(CustomUser.Role.STUDENT_AFFAIRS, CustomUser.Role.FACULTY_MEMBER)
+def search(request):
+    """
+    "Which courses mention X": ranked full-text search over curriculum,
+    learning outcome and program outcome descriptions.
+    """
+    query = request.GET.get("q", "").strip()
+    hits = index.search(query, limit=SEARCH_LIMIT) if query else []
+
+    context = {
+        "query": query,
+        "hits": hits,
+    }
+    return render(request, "search/search.html", context)